@@ -9,6 +9,7 @@ from openmdao.lib.casehandlers.listcaserecorder import ListCaseRecorder
 from openmdao.lib.casehandlers.listcaseiter import ListCaseIterator
 
 from openmdao.lib.casehandlers.dumpcaserecorder import DumpCaseRecorder
+from openmdao.lib.casehandlers.asyncrecorder import AsyncCaseRecorder
 
 from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, caseiter_to_caseset
 
@@ -0,0 +1,132 @@
+
+import cPickle
+import Queue
+import sys
+import threading
+import time
+
+from openmdao.main.interfaces import implements, ICaseRecorder
+
+class AsyncCaseRecorder(object):
+    """Records Cases to another :class:`ICaseRecorder` from a background
+    thread, so that a slow recorder (a DB on a network filesystem, for
+    example) doesn't hold up the driver.  Cases wait in a queue of at most
+    `maxsize` entries (unbounded if `maxsize` is 0).  When the queue is full
+    :meth:`record` blocks until the background thread catches up.
+    
+    Each Case is pickled by :meth:`record`, so later changes to the model's
+    values (arrays are not copied when a Case is filled) don't change what
+    is recorded.  The wrapped recorder receives the unpickled copy.
+    
+    An exception raised by the wrapped recorder is re-raised by the next call
+    to :meth:`record` or :meth:`flush`; Cases queued after the failure are
+    discarded.  The wrapped recorder is only used by one thread at a time.
+    
+    Queue statistics: `depth` is the number of Cases currently waiting,
+    `max_depth` the most that have been waiting at once, `waits` the number
+    of :meth:`record` calls that blocked on a full queue and `wait_time` the
+    total time they were blocked.
+    """
+    
+    implements(ICaseRecorder)
+    
+    def __init__(self, recorder, maxsize=100):
+        self.recorder = recorder
+        self.maxsize = maxsize
+        self.max_depth = 0
+        self.waits = 0
+        self.wait_time = 0.
+        self._queue = None
+        self._thread = None
+        self._error = None
+        
+    def __getstate__(self):
+        """Flush, then return our state without the queue and thread."""
+        self.flush()
+        state = self.__dict__.copy()
+        state['_queue'] = None
+        state['_thread'] = None
+        return state
+
+    @property
+    def depth(self):
+        """Number of Cases waiting to be recorded."""
+        if self._queue is None:
+            return 0
+        return self._queue.qsize()
+
+    def record(self, case):
+        """Queue a snapshot of the given Case to be recorded, waiting if the
+        queue is full."""
+        self._check_error()
+        case = cPickle.dumps(case, -1)
+        if self._thread is None:
+            self._queue = Queue.Queue(self.maxsize)
+            self._thread = threading.Thread(target=self._drain,
+                                            args=(self._queue,))
+            self._thread.daemon = True
+            self._thread.start()
+        try:
+            self._queue.put_nowait(case)
+        except Queue.Full:
+            self.waits += 1
+            start = time.time()
+            self._queue.put(case)
+            self.wait_time += time.time() - start
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        
+    def flush(self):
+        """Wait until all queued Cases have been recorded, then flush the
+        wrapped recorder if it buffers Cases.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        self._check_error()
+        flush = getattr(self.recorder, 'flush', None)
+        if flush is not None:
+            flush()
+            
+    def close(self):
+        """Flush, stop the background thread, and close the wrapped recorder
+        if it can be closed.
+        """
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._queue = None
+                self._thread = None
+            close = getattr(self.recorder, 'close', None)
+            if close is not None:
+                close()
+
+    def get_iterator(self):
+        """Return the wrapped recorder's iterator once all queued Cases have
+        been recorded.
+        """
+        self.flush()
+        return self.recorder.get_iterator()
+
+    def _check_error(self):
+        """Re-raise any exception from the background thread."""
+        if self._error is not None:
+            exc_type, exc_value, exc_tb = self._error
+            self._error = None
+            raise exc_type, exc_value, exc_tb
+        
+    def _drain(self, queue):
+        """Record Cases from `queue` until None is received."""
+        while True:
+            case = queue.get()
+            try:
+                if case is None:
+                    return
+                if self._error is None:
+                    self.recorder.record(cPickle.loads(case))
+            except Exception:
+                self._error = sys.exc_info()
+            finally:
+                queue.task_done()
+
@@ -1,10 +1,15 @@
 
 import sys
 import sqlite3
+import time
 import uuid
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
+from cStringIO import StringIO
 from optparse import OptionParser
 
+import numpy
+from numpy.lib import format
+
 from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
 from openmdao.main.case import Case
 
@@ -23,11 +28,48 @@ def _query_split(query):
     else:
         raise ValueError("No allowable operator found in query '%s'" % query)
 
+def _pack_value(value):
+    """Return the form of `value` to be stored in the DB.  Floats, ints and
+    strings are stored directly.  Numpy arrays of numbers are stored as raw
+    data preceded by a header giving their dtype and shape (the .npy format).
+    Anything else is pickled.
+    """
+    if isinstance(value, (float,int,str)):
+        return value
+    if isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+        stream = StringIO()
+        format.write_array(stream, value)
+        return sqlite3.Binary(stream.getvalue())
+    return sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL))
+
+def _unpack_value(value):
+    """Return the value represented by `value` as read from the DB.  Stored
+    arrays are returned as views of the retrieved data rather than copies.
+    """
+    if not isinstance(value, buffer):
+        return value
+    if value[:len(format.MAGIC_PREFIX)] == format.MAGIC_PREFIX:
+        stream = StringIO(value)
+        if format.read_magic(stream) == (1, 0):
+            shape, fortran_order, dtype = format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = format.read_array_header_2_0(stream)
+        count = 1
+        for dim in shape:
+            count *= dim
+        array = numpy.frombuffer(value, dtype=dtype, count=count,
+                                 offset=stream.tell())
+        return array.reshape(shape, order='F' if fortran_order else 'C')
+    return loads(str(value))
+
 
 class DBCaseIterator(object):
     """Pulls Cases from a relational DB (sqlite). It doesn't support
     general sql queries, but it does allow for a series of boolean
     selectors, e.g., 'x<=y', that are ANDed together.
+    
+    Numpy arrays recorded by a DBCaseRecorder are returned as views of the
+    data retrieved from the DB rather than being copied.
     """
     
     implements(ICaseIterator)
@@ -89,12 +131,11 @@ class DBCaseIterator(object):
             inputs = []
             outputs = []
             for var_id, vname, case_id, sense, value in varcur:
-                if not isinstance(value, (float,int,str)):
-                    try:
-                        value = loads(str(value))
-                    except UnpicklingError as err:
-                        raise UnpicklingError("can't unpickle value '%s' for case '%s' from database: %s" %
-                                              (vname, cname, str(err)))
+                try:
+                    value = _unpack_value(value)
+                except UnpicklingError as err:
+                    raise UnpicklingError("can't unpickle value '%s' for case '%s' from database: %s" %
+                                          (vname, label, str(err)))
                 if sense=='i':
                     inputs.append((vname, value))
                 else:
@@ -107,20 +148,44 @@ class DBCaseIterator(object):
 
 class DBCaseRecorder(object):
     """Records Cases to a relational DB (sqlite). Values other than floats,
-    ints or strings are pickled and are opaque to SQL queries.
+    ints or strings are stored as BLOBs and are opaque to SQL queries.
+    Numpy arrays of numbers are stored as their raw data along with their
+    dtype and shape, so they can be read back without unpickling.  Other
+    values are pickled.
+    
+    By default each Case is committed as soon as it is recorded.  If
+    `batch_size` is greater than 1 or `commit_interval` is set, Cases are
+    buffered in memory and written in a single transaction once `batch_size`
+    Cases have accumulated or `commit_interval` seconds have passed since
+    the last commit, whichever comes first.  Buffered Cases are also written
+    by :meth:`flush`, which Drivers call when they finish running (even if
+    the run fails), and by :meth:`get_iterator` and :meth:`close`.  A file
+    DB used in buffered mode is switched to write-ahead logging (WAL), which
+    requires a local filesystem, and only syncs to disk at WAL checkpoints.
+    A power failure may then lose the last committed batches, but will not
+    corrupt the DB.  Variables are indexed by case id and by name.
     """
     
     implements(ICaseRecorder)
     
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 batch_size=1, commit_interval=None):
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self._buffer = []
+        self._last_commit = time.time()
         
         if append:
             exstr = 'if not exists'
         else:
             exstr = ''
         
+        if batch_size > 1 or commit_interval is not None:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            
         self._connection.execute("""
         create table %s cases(
          id INTEGER PRIMARY KEY,
@@ -141,6 +206,11 @@ class DBCaseRecorder(object):
          sense TEXT,
          value BLOB
          )""" % exstr)
+        
+        self._connection.execute("""
+        create index if not exists casevars_case_id on casevars(case_id)""")
+        self._connection.execute("""
+        create index if not exists casevars_name on casevars(name)""")
 
     @property
     def dbfile(self):
@@ -151,41 +221,54 @@ class DBCaseRecorder(object):
     
     @dbfile.setter
     def dbfile(self, value):
-        """Set the DB file and connect to it."""
+        """Set the DB file and connect to it. The connection may be used
+        from another thread (by an AsyncCaseRecorder), but not concurrently.
+        """
         self._dbfile = value
-        self._connection = sqlite3.connect(value)
+        self._connection = sqlite3.connect(value, check_same_thread=False)
     
     def record(self, case):
         """Record the given Case."""
-        cur = self._connection.cursor()
+        varrows = []
+        for sense, iotype in (('i', 'in'), ('o', 'out')):
+            for name,value in case.items(iotype=iotype):
+                varrows.append((name, sense, _pack_value(value)))
+                
+        self._buffer.append(((case.uuid, case.parent_uuid, case.label,
+                              case.msg or '', case.retries, self.model_id),
+                             varrows))
         
-        cur.execute("""insert into cases(id,uuid,parent,label,msg,retries,model_id,timeEnter) 
-                           values (?,?,?,?,?,?,?,DATETIME('NOW'))""", 
-                                     (None, case.uuid, case.parent_uuid, case.label,
-                                      case.msg or '', case.retries, 
-                                      self.model_id))
-        case_id = cur.lastrowid
-        # insert the inputs and outputs into the vars table.  Pickle them if they're not one of the
-        # built-in types int, float, or str.
-        
-        for name,value in case.items(iotype='in'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                v = (None, name, case_id, 'i', sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
-        for name,value in case.items(iotype='out'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'o', value)
-            else:
-                v = (None, name, case_id, 'o', sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
-        self._connection.commit()
+        if len(self._buffer) >= self.batch_size or \
+           (self.commit_interval is not None and 
+            time.time() - self._last_commit >= self.commit_interval):
+            self.flush()
+            
+    def flush(self):
+        """Write any buffered Cases to the DB in a single transaction."""
+        if self._buffer:
+            cur = self._connection.cursor()
+            vals = []
+            for caserow, varrows in self._buffer:
+                cur.execute("""insert into cases(id,uuid,parent,label,msg,retries,model_id,timeEnter) 
+                                   values (?,?,?,?,?,?,?,DATETIME('NOW'))""", 
+                            (None,)+caserow)
+                case_id = cur.lastrowid
+                vals.extend([(name, case_id, sense, value) 
+                                 for name, sense, value in varrows])
+            cur.executemany("insert into casevars(name,case_id,sense,value) values(?,?,?,?)", 
+                            vals)
+            self._connection.commit()
+            self._buffer = []
+        self._last_commit = time.time()
+    
+    def close(self):
+        """Write any buffered Cases and close the DB connection."""
+        self.flush()
+        self._connection.close()
     
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        self.flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
 
@@ -203,17 +286,20 @@ def list_db_vars(dbname):
     """
     connection = sqlite3.connect(dbname)
     varcur = connection.cursor()
-    varcur.execute("SELECT name from casevars")
-    varnames = set([v for v in varcur])
+    varcur.execute("SELECT DISTINCT name from casevars")
+    varnames = set([row[0] for row in varcur])
+    connection.close()
     return varnames
 
-def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=False):
+def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=False,
+                    chunksize=None):
     """
     Retrieve the values of specified variables from a sqlite DB containing
     Case data.
     
-    Returns a dict containing a list of values for each entry, keyed on 
-    variable name.
+    Returns a dict containing a numpy array of values for each entry, keyed 
+    on variable name. Arrays holding values other than ints and floats have
+    dtype object.
     
     Only data from cases containing ALL of the specified variables will
     be returned so that all data values with the same index will correspond
@@ -234,58 +320,86 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
     include_errors: bool (optional) [False]
         If True, include data from cases that reported an error.
         
+    chunksize: int (optional)
+        If specified, an iterator is returned instead of a dict. Each
+        iteration yields a dict of the form described above holding the
+        data for at most `chunksize` cases, so large DBs can be processed
+        without loading all of their data at once.
     """
+    names = []
+    for name in varnames:
+        if name not in names:
+            names.append(name)
     connection = sqlite3.connect(dbname)
-    vardict = dict([(name,[]) for name in varnames])
+    cur = connection.cursor()
+    if names:
+        cur.execute(*_case_var_query(names, case_sql, var_sql, include_errors))
+    
+    if chunksize is None:
+        try:
+            rows = cur.fetchall() if names else []
+        finally:
+            connection.close()
+        return _rows_to_columns(rows, names)
+    return _iter_columns(connection, cur, names, chunksize)
 
-    sql = ["SELECT id FROM cases"]
+def _case_var_query(varnames, case_sql, var_sql, include_errors):
+    """Return a tuple of (sql, args) for a single query returning one row
+    per case that contains all of the named variables. Each row holds the 
+    case id followed by the value of each variable, in `varnames` order.
+    """
     qlist = []
     if case_sql:
         qlist.append(case_sql)
     if not include_errors:
         qlist.append("msg = ''")
-            
+    cases = ["SELECT id FROM cases"]
     if qlist:
-        sql.append("WHERE %s" % ' AND '.join(qlist))
+        cases.append("WHERE %s" % ' AND '.join(qlist))
         
-    casecur = connection.cursor()
-    casecur.execute(' '.join(sql))
-    
-    sql = ["SELECT name, value from casevars WHERE case_id=%s"]
-    vars_added = False
-    for i,name in enumerate(vardict.keys()):
-        if i==0:
-            sql.append("AND (")
-        else:
-            sql.append("OR")
-        sql.append("name='%s'" % name)
-        vars_added = True
-    if vars_added: sql.append(")")
-    
+    sql = ["SELECT case_id,",
+           ', '.join(["MAX(CASE WHEN name=? THEN value END)"]*len(varnames)),
+           "FROM casevars WHERE name IN (%s)" % ','.join(['?']*len(varnames)),
+           "AND case_id IN (%s)" % ' '.join(cases)]
     if var_sql:
-        sql.append(" AND %s" % var_sql)
-    combined = ' '.join(sql)
-    
-    varcur = connection.cursor()
-    
-    for case_id in casecur:
-        casedict = {}
-        varcur.execute(combined % case_id)
-        for vname, value in varcur:
-            if not isinstance(value, (float,int,str)):
+        sql.append("AND %s" % var_sql)
+    sql.append("GROUP BY case_id HAVING COUNT(DISTINCT name)=? ORDER BY case_id")
+    return (' '.join(sql), varnames + varnames + [len(varnames)])
+
+def _iter_columns(connection, cur, varnames, chunksize):
+    """Yield dicts of value arrays for at most `chunksize` cases at a time."""
+    try:
+        while varnames:
+            rows = cur.fetchmany(chunksize)
+            if not rows:
+                break
+            yield _rows_to_columns(rows, varnames)
+    finally:
+        connection.close()
+
+def _rows_to_columns(rows, varnames):
+    """Convert rows of the form (case_id, value1, value2, ...) into a dict
+    of arrays keyed on variable name, unpacking any BLOB values.
+    """
+    vardict = {}
+    for i, name in enumerate(varnames):
+        column = numpy.empty(len(rows), dtype=object)
+        numeric = True
+        for j, row in enumerate(rows):
+            value = row[i+1]
+            if isinstance(value, buffer):
                 try:
-                    value = loads(str(value))
+                    value = _unpack_value(value)
                 except UnpicklingError as err:
                     raise UnpicklingError("can't unpickle value '%s' from database: %s" %
-                                          (vname, str(err)))
-            casedict[vname] = value
-        
-        if len(casedict) != len(vardict):
-            continue   # case doesn't contain a complete set of specified vars, so skip it to avoid data mismatches
-        
-        for name, value in casedict.items():
-            vardict[name].append(value)
-            
+                                          (name, str(err)))
+                numeric = False
+            elif numeric and not isinstance(value, (float, int, long)):
+                numeric = False
+            column[j] = value
+        if numeric:
+            column = numpy.array(column.tolist())
+        vardict[name] = column
     return vardict
 
 
@@ -300,7 +414,7 @@ def _get_lines(dbname, xnames, ynames, case_sql=None, var_sql=None):
     for i,name in enumerate(ynames):
         yvals.append(vardict[name])
         if len(xnames) == 0:
-            xvals.append(range(len(vardict[name])))
+            xvals.append(numpy.arange(len(vardict[name])))
         elif len(xnames) == 1:
             xvals.append(vardict[xnames[0]])
         else:
@@ -0,0 +1,55 @@
+"""
+DBCaseRecorder recording throughput, committing every case versus
+buffered batches.
+
+usage: python dbperf.py [ncases [nvars [batch_size]]]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from openmdao.main.case import Case
+from openmdao.lib.casehandlers.db import DBCaseRecorder
+
+
+def run_test(dbfile, cases, **kwargs):
+    """ Record `cases` to a new DB and return the elapsed time. """
+    recorder = DBCaseRecorder(dbfile, **kwargs)
+    start = time.time()
+    for case in cases:
+        recorder.record(case)
+    recorder.flush()
+    et = time.time() - start
+    recorder.close()
+    return et
+
+
+def main():
+    """ Compare unbuffered and buffered recording. """
+    ncases = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    nvars = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    inputs = [('x%d' % i, float(i)) for i in range(nvars)]
+    outputs = [('y%d' % i, float(i)) for i in range(nvars)]
+    cases = [Case(inputs=inputs, outputs=outputs) for i in range(ncases)]
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        single = run_test(os.path.join(tmpdir, 'single.db'), cases)
+        print 'commit per case:   %.2f sec, %.1f cases/sec' \
+              % (single, ncases/single)
+        batched = run_test(os.path.join(tmpdir, 'batched.db'), cases,
+                           batch_size=batch_size)
+        print 'batches of %4d:   %.2f sec, %.1f cases/sec' \
+              % (batch_size, batched, ncases/batched)
+        print 'speedup %.2f' % (single / batched)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
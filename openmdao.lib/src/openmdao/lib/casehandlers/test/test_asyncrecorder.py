@@ -0,0 +1,102 @@
+"""
+Test for AsyncCaseRecorder.
+"""
+
+import threading
+import unittest
+
+import numpy
+
+from openmdao.main.api import Case
+from openmdao.lib.casehandlers.api import AsyncCaseRecorder, DBCaseRecorder, \
+                                          ListCaseRecorder
+
+
+class SlowRecorder(ListCaseRecorder):
+    """Waits for `go` before recording, fails on a case labelled 'bad'."""
+
+    def __init__(self):
+        super(SlowRecorder, self).__init__()
+        self.go = threading.Event()
+
+    def record(self, case):
+        self.go.wait()
+        if case.label == 'bad':
+            raise RuntimeError('bad case')
+        super(SlowRecorder, self).record(case)
+
+
+class AsyncCaseRecorderTestCase(unittest.TestCase):
+
+    def make_cases(self, n):
+        return [Case(inputs=[('x', i)], outputs=[('y', i*2)], label=str(i))
+                for i in range(n)]
+
+    def test_record(self):
+        recorder = AsyncCaseRecorder(ListCaseRecorder())
+        cases = self.make_cases(10)
+        for case in cases:
+            recorder.record(case)
+        recorder.flush()
+        self.assertEqual(recorder.depth, 0)
+        self.assertEqual(recorder.recorder.cases, cases)
+        self.assertEqual([case.label for case in recorder.get_iterator()],
+                         [case.label for case in cases])
+        recorder.close()
+
+    def test_snapshot(self):
+        wrapped = SlowRecorder()
+        recorder = AsyncCaseRecorder(wrapped)
+        value = numpy.zeros(3)
+        case = Case(inputs=[('x', value)], label='snap')
+        recorder.record(case)
+        # The model may change the value before the Case is recorded.
+        value[:] = 1.
+        wrapped.go.set()
+        recorder.flush()
+        self.assertEqual(list(wrapped.cases[0]['x']), [0., 0., 0.])
+        self.assertEqual(wrapped.cases[0].uuid, case.uuid)
+
+    def test_db(self):
+        recorder = AsyncCaseRecorder(DBCaseRecorder(batch_size=3), maxsize=2)
+        for case in self.make_cases(10):
+            recorder.record(case)
+        cases = list(recorder.get_iterator())
+        self.assertEqual(len(cases), 10)
+        self.assertEqual(sorted(case['y'] for case in cases), range(0, 20, 2))
+        recorder.close()
+
+    def test_backpressure(self):
+        wrapped = SlowRecorder()
+        recorder = AsyncCaseRecorder(wrapped, maxsize=2)
+        cases = self.make_cases(5)
+        releaser = threading.Timer(0.5, wrapped.go.set)
+        releaser.start()
+        for case in cases:
+            recorder.record(case)
+        recorder.flush()
+        releaser.join()
+        self.assertEqual(len(wrapped), 5)
+        self.assertTrue(recorder.waits > 0)
+        self.assertTrue(recorder.wait_time > 0)
+        self.assertTrue(recorder.max_depth <= 2)
+
+    def test_error(self):
+        wrapped = SlowRecorder()
+        wrapped.go.set()
+        recorder = AsyncCaseRecorder(wrapped)
+        recorder.record(Case(label='bad'))
+        try:
+            recorder.flush()
+        except RuntimeError as err:
+            self.assertEqual(str(err), 'bad case')
+        else:
+            self.fail('RuntimeError expected')
+        # Recording continues after the error has been reported.
+        recorder.record(Case(label='good'))
+        recorder.flush()
+        self.assertEqual([case.label for case in wrapped.cases], ['good'])
+
+
+if __name__ == '__main__':
+    unittest.main()
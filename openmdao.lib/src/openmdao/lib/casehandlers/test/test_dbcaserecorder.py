@@ -10,11 +10,15 @@ import tempfile
 import logging
 import shutil
 import copy
+import sqlite3
+
+import numpy
 
 from openmdao.main.api import Component, Assembly, Case, set_as_top
 from openmdao.test.execcomp import ExecComp
 from openmdao.lib.casehandlers.api import DBCaseIterator, ListCaseIterator
 from openmdao.lib.casehandlers.api import DBCaseRecorder, DumpCaseRecorder, case_db_to_dict 
+from openmdao.lib.casehandlers.db import list_db_vars
 from openmdao.lib.drivers.api import SimpleCaseIterDriver, DOEdriver, CaseIteratorDriver
 from openmdao.main.uncertain_distributions import NormalDistribution
 
@@ -90,6 +94,32 @@ class DBCaseRecorderTestCase(unittest.TestCase):
             self.assertEqual(case['comp1.y'], i*2.)
             self.assertEqual(case['comp1.z'], i*1.5)
             
+    def test_array_storage(self):
+        recorder = DBCaseRecorder()
+        for i in range(5):
+            inputs = [('comp1.x', numpy.arange(i, i+4.)), 
+                      ('comp1.y', numpy.ones((3,2), dtype=numpy.int32, order='F')*i)]
+            outputs = [('comp1.z', numpy.array([None, i])), 
+                       ('comp2.z', numpy.zeros(0))]
+            recorder.record(Case(inputs=inputs, outputs=outputs, label='case%s'%i))
+            
+        # numeric arrays are stored as raw data rather than pickles
+        cur = recorder._connection.execute(
+                          "SELECT value FROM casevars WHERE name='comp1.x'")
+        self.assertTrue(str(cur.fetchone()[0]).startswith('\x93NUMPY'))
+        
+        for i,case in enumerate(recorder.get_iterator()):
+            x = case['comp1.x']
+            self.assertEqual(list(x), [i, i+1., i+2., i+3.])
+            self.assertFalse(x.flags.owndata)
+            y = case['comp1.y']
+            self.assertEqual(y.shape, (3,2))
+            self.assertEqual(y.dtype, numpy.int32)
+            self.assertTrue(numpy.all(y == i))
+            self.assertEqual(list(case['comp1.z']), [None, i])
+            self.assertEqual(case['comp2.z'].shape, (0,))
+        self.assertEqual(i, 4)
+            
     def test_query(self):
         recorder = DBCaseRecorder()
         for i in range(10):
@@ -153,6 +183,19 @@ class DBCaseRecorderTestCase(unittest.TestCase):
         # 2 with errors
         for name,lst in varinfo.items():
             self.assertEqual(len(lst), 3)
+        self.assertEqual(list(varinfo['comp1.x']), [2, 3, 4])
+        self.assertEqual(list(varinfo['comp1.y2']), [6, 9, 12])
+        
+        # same data, retrieved a chunk at a time
+        chunks = list(case_db_to_dict(dfile, varnames, chunksize=2))
+        self.assertEqual([len(c['comp1.y']) for c in chunks], [2, 1])
+        self.assertEqual(list(chunks[0]['comp1.y'])+list(chunks[1]['comp1.y']), 
+                         [4, 6, 8])
+        
+        self.assertEqual(len(case_db_to_dict(dfile, varnames, 
+                                             include_errors=True)['comp1.x']), 5)
+        self.assertEqual(list_db_vars(dfile), 
+                         set(['comp1.x', 'comp1.y', 'comp1.y2', 'comp1.z', 'comp2.z']))
             
         # now use caseiter_to_dict to grab the same data
         varinfo = caseiter_to_dict(recorder.get_iterator(), varnames)
@@ -166,6 +209,72 @@ class DBCaseRecorderTestCase(unittest.TestCase):
         except OSError:
             logging.error("problem removing directory %s" % tmpdir)
 
+    def test_buffered(self):
+        tmpdir = tempfile.mkdtemp()
+        dfile = os.path.join(tmpdir, 'junk.db')
+        recorder = DBCaseRecorder(dfile, batch_size=4)
+        reader = sqlite3.connect(dfile)
+        cur = reader.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        self.assertEqual(sorted([row[0] for row in cur]), 
+                         ['casevars_case_id', 'casevars_name'])
+        
+        for i in range(10):
+            inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+            outputs = [('comp1.z', i*1.5)]
+            recorder.record(Case(inputs=inputs, outputs=outputs, label='case%s'%i))
+            
+        # only complete batches have been written
+        cur = reader.execute("SELECT COUNT(*) FROM cases")
+        self.assertEqual(cur.fetchone()[0], 8)
+        cur = reader.execute("SELECT COUNT(*) FROM casevars")
+        self.assertEqual(cur.fetchone()[0], 24)
+        
+        recorder.flush()
+        cur = reader.execute("SELECT COUNT(*) FROM cases")
+        self.assertEqual(cur.fetchone()[0], 10)
+        cur = reader.execute("PRAGMA journal_mode")
+        self.assertEqual(cur.fetchone()[0], 'wal')
+        
+        for i,case in enumerate(recorder.get_iterator()):
+            self.assertEqual(case.label, 'case%s'%i)
+            self.assertEqual(case['comp1.z'], i*1.5)
+        self.assertEqual(i, 9)
+        
+        recorder.close()
+        reader.close()
+        try:
+            shutil.rmtree(tmpdir)
+        except OSError:
+            logging.error("problem removing directory %s" % tmpdir)
+        
+    def test_buffered_driver(self):
+        tmpdir = tempfile.mkdtemp()
+        dfile = os.path.join(tmpdir, 'junk.db')
+        self.top.driver.recorders = [DBCaseRecorder(dfile, batch_size=100)]
+        self.top.run()
+        
+        # driver flushes its recorders when it finishes
+        varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp2.z'])
+        self.assertEqual(list(varinfo['comp1.x']), range(10))
+        self.top.driver.recorders[0].close()
+        
+        # and also when it fails
+        dfile = os.path.join(tmpdir, 'junk2.db')
+        self.top.driver.recorders = [DBCaseRecorder(dfile, batch_size=100)]
+        cases = [Case(inputs=[('comp1.x', i)], outputs=['comp2.z'])
+                 for i in range(5)]
+        cases.append(Case(inputs=[('comp1.bogus', 1)]))
+        self.top.driver.iterator = ListCaseIterator(cases)
+        self.assertRaises(AttributeError, self.top.run)
+        varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp2.z'])
+        self.assertEqual(list(varinfo['comp1.x']), range(5))
+        
+        self.top.driver.recorders[0].close()
+        try:
+            shutil.rmtree(tmpdir)
+        except OSError:
+            logging.error("problem removing directory %s" % tmpdir)
+
 class NestedCaseTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -3,7 +3,7 @@
 import logging
 
 try:
-    from numpy import exp, abs, pi, array,isnan, diag, random
+    from numpy import exp, abs, pi, array,isnan, diag, random, newaxis
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 _check=['numpy']
@@ -24,6 +24,7 @@ from openmdao.main.component import Component
 from openmdao.util.decorators import stub_if_missing_deps
 
 from openmdao.lib.casehandlers.api import CaseSet
+from openmdao.lib.components.pareto_filter import _BLOCK_SIZE
 from openmdao.main.uncertain_distributions import NormalDistribution
 
 @stub_if_missing_deps(*_check)
@@ -139,26 +140,21 @@ class MultiObjExpectedImprovement(Component):
             mcei = 0
         return mcei
  
-    def _dom(self,a,b):
-        """determines if a completely dominates b
-       returns True is if does
-    """
-        comp = [c1<c2 for c1,c2 in zip(a,b)]
-        if sum(comp)==len(self.criteria):
-            return True        
-        return False
-    
     def _nobj_PI(self,mu,sigma):
+        """Monte Carlo estimate of the probability that a sample is not
+        completely dominated by a point of the Pareto frontier. All the
+        samples are tested at once, in blocks to limit memory use."""
         cov = diag(array(sigma)**2)
         rands = random.multivariate_normal(mu,cov,self.n)
-        num = 0 #number of cases that dominate the current Pareto set
+        y_star = array(self.y_star)
+        if y_star.size == 0: #nothing can dominate the samples
+            return 1.
+        num = 0 #number of samples dominated by the current Pareto set
 
-        for random_sample in rands:
-            for par_point in self.y_star:
-                #par_point = [p[2] for p in par_point.outputs]
-                if self._dom(par_point,random_sample):
-                    num = num+1
-                    break
+        block = max(1, _BLOCK_SIZE // y_star.size)
+        for start in range(0, len(rands), block):
+            samples = rands[start:start+block, newaxis, :]
+            num += (y_star < samples).all(axis=2).any(axis=1).sum()
         pi = (self.n-num)/float(self.n)
         return pi
         
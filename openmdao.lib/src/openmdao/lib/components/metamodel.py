@@ -6,12 +6,13 @@ from enthought.traits.has_traits import _clone_trait
 
 from openmdao.main.api import Component, Case, Slot
 from openmdao.lib.datatypes.api import Slot, ListStr, Event, \
-     List, Str, Dict
+     List, Str, Dict, Int
 from openmdao.main.interfaces import IComponent, ISurrogate, ICaseRecorder, \
      ICaseIterator
 from openmdao.main.uncertain_distributions import UncertainDistribution, \
                                                   NormalDistribution
 from openmdao.main.mp_support import has_interface
+from openmdao.main.numpy_fallback import array
 
 _missing = object()
 
@@ -52,11 +53,21 @@ class MetaModel(Component):
     
     recorder = Slot(ICaseRecorder,
                         desc = 'Records training cases')
+    
+    retrain_interval = Int(1, low=1, iotype='in',
+                           desc='Number of new training points after which '
+                           'the surrogate models are trained from scratch. '
+                           'In between, surrogate models that support it are '
+                           'updated with each new point without '
+                           're-optimizing their hyperparameters.')
 
     # when fired, the next execution will train the metamodel
     train_next = Event()
     #when fired, the next execution will reset all training data
     reset_training_data = Event()
+    #when fired, the next prediction will train the surrogate models from
+    #scratch regardless of retrain_interval
+    full_retrain = Event()
     
     def __init__(self, *args, **kwargs):
         super(MetaModel, self).__init__(*args, **kwargs)
@@ -65,7 +76,11 @@ class MetaModel(Component):
         self._surrogate_input_names = []
         self._training_input_history = []
         self._const_inputs = {} # dict of constant training inputs indices and their values
+        self._n_checked = 0 # number of training cases checked for constant inputs
+        self._n_trained = 0 # number of training cases the surrogates were trained with
+        self._n_fully_trained = 0 # number of training cases at the last full training
         self._train = False
+        self._full_retrain = False
         self._new_train_data = False
         self._failed_training_msgs = []
      
@@ -80,9 +95,14 @@ class MetaModel(Component):
         self._train = True
         self._new_train_data = True
     
+    def _full_retrain_fired(self):
+        self._full_retrain = True
+        self._new_train_data = True
+        
     def _reset_training_data_fired(self):
         self._training_input_history = []
         self._const_inputs = {}
+        self._n_checked = self._n_trained = 0
         self._failed_training_msgs = []
         
         # remove output history from surrogate_info
@@ -160,38 +180,7 @@ class MetaModel(Component):
         else:
             #print '%s predicting' % self.get_pathname()
             if self._new_train_data: 
-                if len(self._training_input_history) < 2:
-                    self.raise_exception("ERROR: need at least 2 training points!", 
-                                         RuntimeError)
-                    
-                # figure out if we have any constant training inputs
-                tcases = self._training_input_history
-                in_hist = tcases[0][:]
-                # start off assuming every input is constant
-                idxlist = range(len(in_hist))
-                self._const_inputs = dict(zip(idxlist, in_hist))
-                for i in idxlist:
-                    val = in_hist[i]
-                    for case in range(1, len(tcases)):
-                        if val != tcases[case][i]:
-                            del self._const_inputs[i]
-                            break
-                  
-                if len(self._const_inputs) == len(in_hist):
-                    self.raise_exception("ERROR: all training inputs are constant.")
-                elif len(self._const_inputs) > 0:
-                    # some inputs are constant, so we have to remove them from the training set
-                    training_input_history = []
-                    for inputs in self._training_input_history:
-                        training_input_history.append([val for i,val in enumerate(inputs) 
-                                                       if i not in self._const_inputs])
-                else:
-                    training_input_history = self._training_input_history
-                for name,tup in self._surrogate_info.items(): 
-                    surrogate, output_history = tup  
-                    surrogate.train(training_input_history, output_history)
-                    
-                self._new_train_data = False
+                self._train_surrogates()
                 
             inputs = []
             for i,name in enumerate(self._surrogate_input_names):
@@ -206,6 +195,93 @@ class MetaModel(Component):
                 surrogate = tup[0]
                 # copy output to boudary
                 setattr(self, name, surrogate.predict(inputs))
+
+    def predict_batch(self, X):
+        """Predict the outputs of the model for many points at once, without
+        setting any inputs or outputs. Any new training data is used to 
+        train the surrogate models first. Inputs that were constant over the
+        training data are dropped rather than checked.
+        
+        Returns a dict containing the predictions for each output, keyed on
+        output name. The predictions for each output are whatever its
+        surrogate's predict_batch method returns (e.g., a tuple of arrays of
+        means and standard deviations for KrigingSurrogate). Surrogates 
+        without a predict_batch method are called once for each point,
+        giving a list of predictions.
+        
+        X: 2D array
+            Input values, one row per point, with a column for each input 
+            in the order given by list_inputs_to_model().
+        """
+        if self._new_train_data: 
+            self._train_surrogates()
+        X = array(X)
+        if self._const_inputs:
+            X = X[:, [i for i in range(len(self._surrogate_input_names))
+                            if i not in self._const_inputs]]
+        predictions = {}
+        for name, tup in self._surrogate_info.items():
+            surrogate = tup[0]
+            if hasattr(surrogate, 'predict_batch'):
+                predictions[name] = surrogate.predict_batch(X)
+            else:
+                predictions[name] = [surrogate.predict(x) for x in X]
+        return predictions
+    
+    def _train_surrogates(self):
+        """Train the surrogate models with the training data, leaving out
+        any inputs that are constant. Surrogate models are trained from scratch
+        if `retrain_interval` new training points have been added since they
+        last were, or if the set of constant inputs has changed. Otherwise
+        surrogate models with an add_training_point method are just given the 
+        new points.
+        """
+        tcases = self._training_input_history
+        if len(tcases) < 2:
+            self.raise_exception("ERROR: need at least 2 training points!", 
+                                 RuntimeError)
+            
+        # figure out if we have any constant training inputs, checking only
+        # the cases that haven't been checked before
+        if self._n_checked == 0:
+            # start off assuming every input is constant
+            self._const_inputs = dict(enumerate(tcases[0]))
+            self._n_checked = 1
+        old_const_inputs = set(self._const_inputs)
+        for inputs in tcases[self._n_checked:]:
+            for i, val in self._const_inputs.items():
+                if val != inputs[i]:
+                    del self._const_inputs[i]
+        self._n_checked = len(tcases)
+          
+        if len(self._const_inputs) == len(tcases[0]):
+            self.raise_exception("ERROR: all training inputs are constant.")
+        elif len(self._const_inputs) > 0:
+            # some inputs are constant, so we have to remove them from the training set
+            training_input_history = []
+            for inputs in tcases:
+                training_input_history.append([val for i,val in enumerate(inputs) 
+                                               if i not in self._const_inputs])
+        else:
+            training_input_history = tcases
+            
+        full = self._full_retrain or self._n_trained == 0 or \
+               set(self._const_inputs) != old_const_inputs or \
+               len(tcases) - self._n_fully_trained >= self.retrain_interval
+        for name,tup in self._surrogate_info.items(): 
+            surrogate, output_history = tup  
+            if full or not hasattr(surrogate, 'add_training_point'):
+                surrogate.train(training_input_history, output_history)
+            else:
+                for i in range(self._n_trained, len(tcases)):
+                    surrogate.add_training_point(training_input_history[i],
+                                                 output_history[i])
+                    
+        if full:
+            self._n_fully_trained = len(tcases)
+        self._n_trained = len(tcases)
+        self._full_retrain = False
+        self._new_train_data = False
             
     def _post_run (self):
         self._train = False
@@ -241,6 +317,8 @@ class MetaModel(Component):
         new_model_traitnames = set()
         self._surrogate_input_names = []
         self._training_input_history = []
+        self._const_inputs = {}
+        self._n_checked = self._n_trained = 0
         self._surrogate_info = {}
         self._failed_training_msgs = []
         
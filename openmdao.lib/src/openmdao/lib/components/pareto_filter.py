@@ -1,13 +1,129 @@
 """ Pareto Filter -- finds non-dominated cases. """
 
+import logging
+from bisect import bisect_left, bisect_right
+
 # pylint: disable-msg=E0611,F0401
+try:
+    from numpy import array, arange, concatenate, cumsum, empty, lexsort, \
+                      minimum, newaxis, ones, zeros
+except ImportError as err:
+    logging.warn("In %s: %r" % (__file__, err))
+
 from openmdao.main.datatypes.api import Slot, List, ListStr
 from openmdao.lib.casehandlers.api import CaseSet, caseiter_to_caseset
 
 from openmdao.main.component import Component
 from openmdao.main.interfaces import ICaseIterator
 from openmdao.lib.casehandlers.listcaseiter import ListCaseIterator
+from openmdao.util.decorators import stub_if_missing_deps
+
+# Maximum number of elements in the temporary arrays of a blocked
+# dominance test.
+_BLOCK_SIZE = 2**22
+
+# Number of rows added to the non-dominated front at a time when there are
+# more than three criteria.
+_SWEEP_SIZE = 1000
+
+
+def _nondominated(y):
+    """Returns a boolean array which is True for each row of the n by m
+    array `y` that isn't dominated by any other row. Row a dominates row b if
+    a <= b for every criterion and a != b. One to three criteria are handled
+    by sorting and sweeping, more by blocked tests against the front.
+    """
+    n, m = y.shape
+    if m > 3:
+        return _nondominated_blocked(y)
+    
+    # Sort lexicographically, so a row can only be dominated by rows before
+    # it, and evaluate only the first of each group of identical rows.
+    order = lexsort(y.T[::-1])
+    ysort = y[order]
+    first = ones(n, dtype=bool)
+    first[1:] = (ysort[1:] != ysort[:-1]).any(axis=1)
+    distinct = ysort[first]
+    
+    if m == 1:
+        status = arange(len(distinct)) == 0
+    elif m == 2:
+        # Dominated if an earlier row has a smaller or equal second criterion.
+        status = ones(len(distinct), dtype=bool)
+        status[1:] = distinct[1:, 1] < minimum.accumulate(distinct[:-1, 1])
+    else:
+        status = _sweep3(distinct)
+        
+    result = empty(n, dtype=bool)
+    result[order] = status[cumsum(first) - 1]
+    return result
+
+
+def _sweep3(y):
+    """Returns non-dominated flags for lexicographically sorted, distinct
+    rows of three criteria. The non-dominated front of the last two criteria
+    of the rows seen so far is kept as a staircase, which a new row is
+    dominated by if the step to its left is no higher.
+    """
+    status = zeros(len(y), dtype=bool)
+    front1 = []  # Second criterion, ascending.
+    front2 = []  # Negated third criterion, ascending.
+    for i, (a, b, c) in enumerate(y.tolist()):
+        j = bisect_right(front1, b)
+        if j and -front2[j-1] <= c:
+            continue
+        status[i] = True
+        # Replace any steps this row dominates.
+        lo = bisect_left(front1, b)
+        hi = bisect_right(front2, -c, lo)
+        front1[lo:hi] = [b]
+        front2[lo:hi] = [-c]
+    return status
 
+
+def _dominated_by(rows, others):
+    """Returns a boolean array which is True for each of `rows` dominated by
+    any of `others`, testing blocks of rows against all others at once.
+    """
+    result = zeros(len(rows), dtype=bool)
+    if len(others):
+        block = max(1, _BLOCK_SIZE // others.size)
+        for start in range(0, len(rows), block):
+            row = rows[start:start+block, newaxis, :]
+            dominated = (others <= row).all(axis=2) & (others < row).any(axis=2)
+            result[start:start+block] = dominated.any(axis=1)
+    return result
+
+
+def _nondominated_blocked(y):
+    """Returns non-dominated flags for the rows of `y`. Rows are sorted by the
+    sum of their criteria, so a row can only be dominated by rows before it,
+    and each block of rows is tested against the front found so far.
+    """
+    n, m = y.shape
+    order = y.sum(axis=1).argsort()
+    ysort = y[order]
+    status = zeros(n, dtype=bool)
+    front = ysort[:0]
+    for start in range(0, n, _SWEEP_SIZE):
+        rows = ysort[start:start+_SWEEP_SIZE]
+        nondom = ~_dominated_by(rows, front)
+        nondom[nondom] = ~_dominated_by(rows[nondom], rows[nondom])
+        status[start:start+_SWEEP_SIZE] = nondom
+        front = concatenate((front, rows[nondom]))
+    
+    # Rounding can make the sum of a dominating row equal to that of the
+    # row it dominates, and then they may be out of order, so check the
+    # front against itself.
+    front = status.nonzero()[0]
+    status[front] = ~_dominated_by(ysort[front], ysort[front])
+    
+    result = empty(n, dtype=bool)
+    result[order] = status
+    return result
+
+
+@stub_if_missing_deps('numpy')
 class ParetoFilter(Component):
     """Takes a set of cases and filters out the subset of cases which are
     pareto optimal. Assumes that smaller values for model responses are
@@ -33,17 +149,6 @@ class ParetoFilter(Component):
     dominated_set = Slot(CaseSet, iotype="out",
                            desc="Resulting collection of dominated cases.",copy="shallow")
     
-    def _is_dominated(self, y1, y2):
-        """Tests to see if the point y1 is dominated by the point y2. 
-        True if y1 is dominated by y2, False otherwise.
-        """
-        if y1 == y2:
-            return False
-        for a,b in zip(y1, y2): 
-            if a<b: return False
-
-        return True
-    
     def execute(self):
         """Finds and removes pareto optimal points in the given case set.
         Returns a list of pareto optimal points. Smaller is better for all
@@ -57,35 +162,27 @@ class ParetoFilter(Component):
             else: 
                 case_sets.append(ci)
         
-        y_list = []
         if len(case_sets) > 1: 
             case_set = case_sets[0].union(*case_sets[1:])
         else: 
             case_set = case_sets[0]
-        criteria_count = len(self.criteria)
         
         try: 
             # need to transpose the list of outputs
-            y_list = zip(*[case_set[crit] for crit in self.criteria]) 
+            y = array([case_set[crit] for crit in self.criteria], 
+                      dtype=float).T
         except KeyError: 
             self.raise_exception('no cases provided had all of the outputs '
                  'matching the provided criteria, %s'%self.criteria, ValueError)
             
-        y_temp = list(y_list)
-        
         self.dominated_set = CaseSet()
         self.pareto_set = CaseSet() #TODO: need a way to copy casesets
 
-        for point1, case in zip(y_list, iter(case_set)):
-            dominated = False
-            for point2 in y_temp:
-                if self._is_dominated(point1, point2):
-                    self.dominated_set.record(case)
-                    y_temp.remove(point1)
-                    dominated = True
-                    break
-            if not dominated: 
+        for case, nondominated in zip(iter(case_set), _nondominated(y)):
+            if nondominated: 
                 self.pareto_set.record(case)
+            else:
+                self.dominated_set.record(case)
      
 if __name__ == "__main__": # pragma: no cover  
     
@@ -38,6 +38,16 @@ class MultiObjExpectedImprovementTests(unittest.TestCase):
         ei.execute()
         self.assertAlmostEqual(0.875,ei.PI,1)
 
+    def test_ei_nobj_empty_pareto(self):
+        ei = MultiObjExpectedImprovement()
+        ei.y_star = []
+        ei.criteria = ['y1','y2','y3']
+        ei.predicted_values = [NormalDistribution(mu=1,sigma=1),
+                                                    NormalDistribution(mu=1,sigma=1),
+                                                    NormalDistribution(mu=1,sigma=1)]
+        ei.execute()
+        self.assertEqual(1.0,ei.PI)
+
     def test_ei_calc_switch(self):
         ei = MultiObjExpectedImprovement()
         bests = CaseSet()
@@ -198,6 +198,63 @@ class MetaModelTestCase(unittest.TestCase):
             self.fail("Exception expected")
         
         
+    def test_predict_batch(self):
+        asm = self._trained_asm([1.,2.,3.,4.,5.], [1.,3.,2.,5.,4.])
+        X = [[1.5, 2.5], [3., 2.], [4.5, 1.]]
+        predictions = asm.metamodel.predict_batch(X)
+        self.assertEqual(set(predictions.keys()), set(['c', 'd']))
+        mus, sigmas = predictions['c']
+        self.assertEqual(len(mus), 3)
+        for (a, b), mu, sigma in zip(X, mus, sigmas):
+            asm.metamodel.a = a
+            asm.metamodel.b = b
+            asm.metamodel.run()
+            self.assertAlmostEqual(asm.metamodel.c.mu, mu, places=8)
+            self.assertAlmostEqual(asm.metamodel.c.sigma, sigma, places=8)
+        assert_rel_error(self, mus[1], 5., .0001)
+        
+        # constant training inputs are ignored
+        asm = self._trained_asm([1.,2.,3.,4.,5.], [2.2]*5)
+        predictions = asm.metamodel.predict_batch([[2.5, 2.2], [3.5, 7.]])
+        mus, sigmas = predictions['d']
+        asm.metamodel.a = 2.5
+        asm.metamodel.b = 2.2
+        asm.metamodel.run()
+        self.assertAlmostEqual(asm.metamodel.d.mu, mus[0], places=8)
+        
+    def test_retrain_interval(self):
+        asm = self._trained_asm([1.,2.,3.], [1.,3.,2.])
+        asm.metamodel.retrain_interval = 3
+        asm.metamodel.run()
+        surrogate = asm.metamodel._surrogate_info['c'][0]
+        thetas = surrogate.thetas
+        
+        # new points are added without retraining
+        for a, b in [(4.,5.), (5.,4.)]:
+            asm.metamodel.a = a
+            asm.metamodel.b = b
+            asm.metamodel.train_next = True
+            asm.metamodel.run()
+            asm.metamodel.run(force=True)
+            self.assertEqual(surrogate.n, int(a))
+            self.assertTrue(surrogate.thetas is thetas)
+            assert_rel_error(self, asm.metamodel.c.mu, a+b, .0001)
+            
+        # retrained after 3 new points
+        asm.metamodel.a = 6.
+        asm.metamodel.b = 1.
+        asm.metamodel.train_next = True
+        asm.metamodel.run()
+        asm.metamodel.run(force=True)
+        self.assertEqual(surrogate.n, 6)
+        self.assertFalse(surrogate.thetas is thetas)
+        
+        # or on demand
+        thetas = surrogate.thetas
+        asm.metamodel.full_retrain = True
+        asm.metamodel.run(force=True)
+        self.assertFalse(surrogate.thetas is thetas)
+        
     def test_warm_start(self): 
         metamodel = MetaModel()
         metamodel.name = 'meta'
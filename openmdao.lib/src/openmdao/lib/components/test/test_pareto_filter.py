@@ -2,6 +2,8 @@
 
 import unittest
 
+from numpy import random
+
 from openmdao.lib.components.pareto_filter import ParetoFilter
 from openmdao.lib.casehandlers.listcaseiter import ListCaseIterator
 from openmdao.main.case import Case
@@ -63,6 +65,39 @@ class ParetoFilterTests(unittest.TestCase):
         self.assertEqual((1, 2, 2, 3, 3, 3),x_dom)
         self.assertEqual((3, 2, 3, 1, 2, 3),y_dom)
         
+    def test_nd_filter(self):
+        # compare against a brute force filter, including duplicate points
+        # (which the CaseSets keep only once) and ties in individual criteria
+        random.seed(10)
+        for ncrit in (2, 3, 4):
+            pts = [tuple(random.randint(0, 6, ncrit)) for i in range(200)]
+            pts.extend(pts[:20])
+            names = ['x%d' % i for i in range(ncrit)]
+            cases = [Case(outputs=zip(names, pt)) for pt in pts]
+            
+            pf = ParetoFilter()
+            pf.case_sets = [ListCaseIterator(cases),]
+            pf.criteria = names
+            pf.execute()
+            
+            def dominated(pt):
+                for other in pts:
+                    if all([o <= p for o, p in zip(other, pt)]) and \
+                       any([o < p for o, p in zip(other, pt)]):
+                        return True
+                return False
+            
+            distinct = []
+            for pt in pts:
+                if pt not in distinct:
+                    distinct.append(pt)
+            expected = [pt for pt in distinct if not dominated(pt)]
+            actual = [tuple([case[name] for name in names]) 
+                      for case in pf.pareto_set]
+            self.assertEqual(expected, actual)
+            self.assertEqual(len(distinct)-len(expected), 
+                             len(pf.dominated_set))
+        
     def test_bad_case_set(self): 
         pf = ParetoFilter()
         x = [1,1,2,2,2,3,3,3,]
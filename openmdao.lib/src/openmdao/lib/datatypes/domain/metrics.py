@@ -8,9 +8,12 @@ under need not match its class name.
 Metrics may be used with 1D, 2D, or 3D Cartesian coordinates. They may also
 be used with polar (2D) or cylindrical (3D) coordinates. :meth:`calculate`
 should be prepared for this.
+
+The predefined metrics also support :meth:`calculate_array`, which computes
+values over whole index ranges at once.
 """
 
-from math import sqrt
+import numpy
 
 from openmdao.units.units import PhysicalQuantity
 
@@ -43,6 +46,10 @@ def register_metric(name, cls, integrate, geometry='any'):
         :meth:`dimensionalize` is called with the accumulated value.
         It should return a :class:`PhysicalQuantity` for the dimensionalized
         value.
+        If the class also has :meth:`calculate_array`, that is called
+        with `(index, geom)` instead, where `index` is a tuple of slices into
+        the zone variable arrays and `geom` contains arrays of the same
+        shape. It should return an array of values.
 
     integrate: bool
         If True, then calculated values are integrated, not averaged.
@@ -74,15 +81,15 @@ def create_scalar_metric(var_name):
     """
     cls_name = var_name.capitalize()
     exec '''
-class %(cls_name)s(object):
+class %(cls_name)s(_ArrayMetric):
     """ Computes %(var_name)s. """
 
     def __init__(self, zone, zone_name, reference_state):
-        self.%(var_name)s = zone.flow_solution.%(var_name)s.item
+        self.%(var_name)s = zone.flow_solution.%(var_name)s
 
-    def calculate(self, loc, length):
-        """ Return metric value. """
-        return self.%(var_name)s(*loc)
+    def calculate_array(self, index, length):
+        """ Return metric values over `index`. """
+        return self.%(var_name)s[index]
 
     def dimensionalize(self, value):
         """ Return dimensional `value`. """
@@ -92,7 +99,23 @@ register_metric('%(var_name)s', %(cls_name)s, False, 'any')
 ''' % {'var_name': var_name, 'cls_name': cls_name}
 
 
-class Area(object):
+def _values(arr, index):
+    """ Return values of `arr` at `index` in double precision. """
+    return numpy.asarray(arr[index], dtype=float)
+
+
+class _ArrayMetric(object):
+    """
+    Base for metrics which implement :meth:`calculate_array`.
+    :meth:`calculate` evaluates it at a single location.
+    """
+
+    def calculate(self, loc, geom):
+        """ Return metric value. """
+        return float(self.calculate_array(loc, geom))
+
+
+class Area(_ArrayMetric):
     """ Computes area of mesh surface. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -108,13 +131,13 @@ class Area(object):
             self.units = aref.get_unit_name()
             self.aref = aref.value
 
-    def calculate(self, loc, normal):
-        """ Return metric value. """
+    def calculate_array(self, index, normal):
+        """ Return metric values over `index`. """
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
-        return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
+        return numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
 
     def dimensionalize(self, value):
         """ Return dimensional `value`. """
@@ -123,7 +146,7 @@ class Area(object):
 register_metric('area', Area, True, 'surface')
 
 
-class Length(object):
+class Length(_ArrayMetric):
     """ Computes length of mesh curve. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -138,8 +161,8 @@ class Length(object):
             self.units = lref.get_unit_name()
             self.lref = lref.value
 
-    def calculate(self, loc, length):
-        """ Return metric value. """
+    def calculate_array(self, index, length):
+        """ Return metric values over `index`. """
         return length * self.lref
 
     def dimensionalize(self, value):
@@ -149,7 +172,7 @@ class Length(object):
 register_metric('length', Length, True, 'curve')
 
 
-class MassFlow(object):
+class MassFlow(_ArrayMetric):
     """ Computes mass flow across a mesh surface. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -186,23 +209,26 @@ class MassFlow(object):
             self.momref = momref.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, normal):
-        """ Return metric value. """
-        rvu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref
-        rvv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref
-        rvw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
+
+    def calculate_array(self, index, normal):
+        """ Return metric values over `index`. """
+        rvu = 0. if self.mom_c1 is None \
+               else _values(self.mom_c1, index) * self.momref
+        rvv = 0. if self.mom_c2 is None \
+               else _values(self.mom_c2, index) * self.momref
+        rvw = 0. if self.mom_c3 is None \
+               else _values(self.mom_c3, index) * self.momref
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         return rvu*sc1 + rvv*sc2 + rvw*sc3
 
     def dimensionalize(self, value):
@@ -212,7 +238,7 @@ class MassFlow(object):
 register_metric('mass_flow', MassFlow, True, 'surface')
 
 
-class CorrectedMassFlow(object):
+class CorrectedMassFlow(_ArrayMetric):
     """ Computes corrected mass flow across a mesh surface. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -222,15 +248,15 @@ class CorrectedMassFlow(object):
         # 'pressure' required until we can determine dimensionalized
         # static pressure from 'Q' variables.
         try:
-            self.density = flow.density.item
+            self.density = flow.density
             momentum = flow.momentum
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             vnames = ('density', 'momentum', 'pressure')
             raise AttributeError('For corrected_mass_flow, zone %s is missing'
                                  ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -271,29 +297,32 @@ class CorrectedMassFlow(object):
         self.tstd = tstd.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, normal):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        rvu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref
-        rvv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref
-        rvw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref
-        ps = self.pressure(*loc) * self.pref
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
+
+    def calculate_array(self, index, normal):
+        """ Return metric values over `index`. """
+        rho = _values(self.density, index) * self.rhoref
+        rvu = 0. if self.mom_c1 is None \
+               else _values(self.mom_c1, index) * self.momref
+        rvv = 0. if self.mom_c2 is None \
+               else _values(self.mom_c2, index) * self.momref
+        rvw = 0. if self.mom_c3 is None \
+               else _values(self.mom_c3, index) * self.momref
+        ps = _values(self.pressure, index) * self.pref
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = _values(self.gam, index)
         else:
             gamma = self.gamma
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         w = rvu*sc1 + rvv*sc2 + rvw*sc3
 
         u2 = (rvu*rvu + rvv*rvv + rvw*rvw) / (rho*rho)
@@ -302,9 +331,9 @@ class CorrectedMassFlow(object):
         ts = ps / (rho * self.rgas)
         tt = ts * (1. + (gamma-1.)/2. * mach2)
 
-        pt = ps * pow(1. + (gamma-1.)/2. * mach2, gamma/(gamma-1.))
+        pt = ps * (1. + (gamma-1.)/2. * mach2) ** (gamma/(gamma-1.))
 
-        return w * sqrt(tt/self.tstd) / (pt/self.pstd)
+        return w * numpy.sqrt(tt/self.tstd) / (pt/self.pstd)
 
     def dimensionalize(self, value):
         """ Dimensionalize `value`. """
@@ -313,7 +342,7 @@ class CorrectedMassFlow(object):
 register_metric('corrected_mass_flow', CorrectedMassFlow, True, 'surface')
 
 
-class StaticPressure(object):
+class StaticPressure(_ArrayMetric):
     """ Computes weighted static pressure for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -321,20 +350,20 @@ class StaticPressure(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:  # Some codes have this directly available.
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:  # Look for typical Q variables.
-                self.density = flow.density.item
+                self.density = flow.density
                 momentum = flow.momentum
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'density', 'momentum',
                           'energy_stagnation_density')
                 raise AttributeError('For pressure, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -376,26 +405,29 @@ class StaticPressure(object):
 
         if self.pressure is None:
             if cylindrical:
-                self.mom_c1 = None if momentum.z is None else momentum.z.item
-                self.mom_c2 = momentum.r.item
-                self.mom_c3 = momentum.t.item
+                self.mom_c1 = momentum.z
+                self.mom_c2 = momentum.r
+                self.mom_c3 = momentum.t
             else:
-                self.mom_c1 = momentum.x.item
-                self.mom_c2 = None if momentum.y is None else momentum.y.item
-                self.mom_c3 = None if momentum.z is None else momentum.z.item
+                self.mom_c1 = momentum.x
+                self.mom_c2 = momentum.y
+                self.mom_c3 = momentum.z
 
-    def calculate(self, loc, geom):
-        """ Return metric value. """
+    def calculate_array(self, index, geom):
+        """ Return metric values over `index`. """
         if self.pressure is not None:
-            return self.pressure(*loc) * self.pref
+            return _values(self.pressure, index) * self.pref
         else:
-            rho = self.density(*loc) * self.rhoref
-            vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-            vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-            vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
-            e0 = self.energy(*loc) * self.e0ref / rho
+            rho = _values(self.density, index) * self.rhoref
+            vu = 0. if self.mom_c1 is None \
+                  else _values(self.mom_c1, index) * self.momref / rho
+            vv = 0. if self.mom_c2 is None \
+                  else _values(self.mom_c2, index) * self.momref / rho
+            vw = 0. if self.mom_c3 is None \
+                  else _values(self.mom_c3, index) * self.momref / rho
+            e0 = _values(self.energy, index) * self.e0ref / rho
             if self.gam is not None:
-                gamma = self.gam(*loc)
+                gamma = _values(self.gam, index)
             else:
                 gamma = self.gamma
 
@@ -408,7 +440,7 @@ class StaticPressure(object):
 register_metric('pressure', StaticPressure, False)
 
 
-class TotalPressure(object):
+class TotalPressure(_ArrayMetric):
     """ Computes weighted total pressure for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -416,24 +448,24 @@ class TotalPressure(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = flow.density
             momentum = flow.momentum
         except AttributeError:
             vnames = ('density', 'momentum')
             raise AttributeError('For pressure_stagnation, zone %s is missing'
                              ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'energy_stagnation_density')
                 raise AttributeError('For pressure_stagnation, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -468,34 +500,37 @@ class TotalPressure(object):
             self.pref = pref.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, geom):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-        vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-        vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
+
+    def calculate_array(self, index, geom):
+        """ Return metric values over `index`. """
+        rho = _values(self.density, index) * self.rhoref
+        vu = 0. if self.mom_c1 is None \
+              else _values(self.mom_c1, index) * self.momref / rho
+        vv = 0. if self.mom_c2 is None \
+              else _values(self.mom_c2, index) * self.momref / rho
+        vw = 0. if self.mom_c3 is None \
+              else _values(self.mom_c3, index) * self.momref / rho
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = _values(self.gam, index)
         else:
             gamma = self.gamma
 
         u2 = vu*vu + vv*vv + vw*vw
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = _values(self.pressure, index) * self.pref
         else:
-            e0 = self.energy(*loc) * self.e0ref / rho
+            e0 = _values(self.energy, index) * self.e0ref / rho
             ps = (gamma-1.) * rho * (e0 - 0.5*u2)
         a2 = (gamma * ps) / rho
         mach2 = u2 / a2
-        return ps * pow(1. + (gamma-1.)/2. * mach2, gamma/(gamma-1.))
+        return ps * (1. + (gamma-1.)/2. * mach2) ** (gamma/(gamma-1.))
 
     def dimensionalize(self, value):
         """ Dimensionalize `value`. """
@@ -504,7 +539,7 @@ class TotalPressure(object):
 register_metric('pressure_stagnation', TotalPressure, False)
 
 
-class StaticTemperature(object):
+class StaticTemperature(_ArrayMetric):
     """ Computes weighted static temperature for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -512,23 +547,23 @@ class StaticTemperature(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = flow.density
         except AttributeError:
             raise AttributeError('For temperature, zone %s is missing'
                                  ' density.' % zone_name)
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:  # Look for typical Q variables.
                 momentum = flow.momentum
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'momentum', 'energy_stagnation_density')
                 raise AttributeError('For temperature, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -569,26 +604,29 @@ class StaticTemperature(object):
 
         if self.pressure is None:
             if cylindrical:
-                self.mom_c1 = None if momentum.z is None else momentum.z.item
-                self.mom_c2 = momentum.r.item
-                self.mom_c3 = momentum.t.item
+                self.mom_c1 = momentum.z
+                self.mom_c2 = momentum.r
+                self.mom_c3 = momentum.t
             else:
-                self.mom_c1 = momentum.x.item
-                self.mom_c2 = None if momentum.y is None else momentum.y.item
-                self.mom_c3 = None if momentum.z is None else momentum.z.item
+                self.mom_c1 = momentum.x
+                self.mom_c2 = momentum.y
+                self.mom_c3 = momentum.z
 
-    def calculate(self, loc, geom):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
+    def calculate_array(self, index, geom):
+        """ Return metric values over `index`. """
+        rho = _values(self.density, index) * self.rhoref
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = _values(self.pressure, index) * self.pref
         else:
-            vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-            vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-            vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
-            e0 = self.energy(*loc) * self.e0ref / rho
+            vu = 0. if self.mom_c1 is None \
+                  else _values(self.mom_c1, index) * self.momref / rho
+            vv = 0. if self.mom_c2 is None \
+                  else _values(self.mom_c2, index) * self.momref / rho
+            vw = 0. if self.mom_c3 is None \
+                  else _values(self.mom_c3, index) * self.momref / rho
+            e0 = _values(self.energy, index) * self.e0ref / rho
             if self.gam is not None:
-                gamma = self.gam(*loc)
+                gamma = _values(self.gam, index)
             else:
                 gamma = self.gamma
             ps = (gamma-1.) * rho * (e0 - 0.5*(vu*vu + vv*vv + vw*vw))
@@ -601,7 +639,7 @@ class StaticTemperature(object):
 register_metric('temperature', StaticTemperature, False)
 
 
-class TotalTemperature(object):
+class TotalTemperature(_ArrayMetric):
     """ Computes weighted total temperature for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -609,24 +647,24 @@ class TotalTemperature(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = flow.density
             momentum = flow.momentum
         except AttributeError:
             vnames = ('density', 'momentum')
             raise AttributeError('For temperature_stagnation, zone %s is missing'
                                  ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'energy_stagnation_density')
                 raise AttributeError('For temperature_stagnation, zone %s is'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -662,30 +700,33 @@ class TotalTemperature(object):
             self.tref = tref
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, geom):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-        vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-        vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
+
+    def calculate_array(self, index, geom):
+        """ Return metric values over `index`. """
+        rho = _values(self.density, index) * self.rhoref
+        vu = 0. if self.mom_c1 is None \
+              else _values(self.mom_c1, index) * self.momref / rho
+        vv = 0. if self.mom_c2 is None \
+              else _values(self.mom_c2, index) * self.momref / rho
+        vw = 0. if self.mom_c3 is None \
+              else _values(self.mom_c3, index) * self.momref / rho
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = _values(self.gam, index)
         else:
             gamma = self.gamma
 
         u2 = vu*vu + vv*vv + vw*vw
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = _values(self.pressure, index) * self.pref
         else:
-            e0 = self.energy(*loc) * self.e0ref / rho
+            e0 = _values(self.energy, index) * self.e0ref / rho
             ps = (gamma-1.) * rho * (e0 - 0.5*u2)
         a2 = (gamma * ps) / rho
         mach2 = u2 / a2
@@ -699,7 +740,7 @@ class TotalTemperature(object):
 register_metric('temperature_stagnation', TotalTemperature, False)
 
 
-class Volume(object):
+class Volume(_ArrayMetric):
     """ Computes volume of mesh volume. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -715,8 +756,8 @@ class Volume(object):
             self.units = volref.get_unit_name()
             self.volref = volref.value
 
-    def calculate(self, loc, volume):
-        """ Return metric value. """
+    def calculate_array(self, index, volume):
+        """ Return metric values over `index`. """
         return volume * self.volref
 
     def dimensionalize(self, value):
@@ -32,9 +32,21 @@ unformatted: bool
 logger: Logger or None
     Used to record progress.
 
+zones: list(int) or None
+    When reading, if not None, then only these zones (numbered from 1) are
+    read. Zones are named ``zone_N`` by their position in the file.
+
+memmap: bool
+    When reading, if True, then arrays are copy-on-write :class:`numpy.memmap`
+    views of the file, so data is only read as it is used.
+    Only meaningful if `binary`.
+
 Default argument values are set for a typical 3D multiblock single-precision
 Fortran unformatted file.  When writing, zones are assumed in Cartesian
 coordinates with data located at the vertices.
+
+Binary files are indexed after reading the zone dimensions, so only the
+zones and variables requested are read.
 """
 
 import numpy
@@ -49,7 +61,8 @@ from openmdao.lib.datatypes.domain.vector import Vector
 
 def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
                   planes=False, binary=True, big_endian=False,
-                  single_precision=True, unformatted=True, logger=None):
+                  single_precision=True, unformatted=True, logger=None,
+                  zones=None, variables=None, memmap=False):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file` and
     `q_file`.  Q variables are assigned to 'density', 'momentum', and
@@ -61,69 +74,56 @@ def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
 
     q_file: string
         Q data filename.
+
+    variables: list(string) or None
+        If not None, then only these Q variables are read.
     """
     logger = logger or NullLogger()
 
-    domain = read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
-                              binary, big_endian, single_precision,
-                              unformatted, logger)
+    domain, grid_shape = _read_plot3d_grid(grid_file, multiblock, dim,
+                                           blanking, planes, binary,
+                                           big_endian, single_precision,
+                                           unformatted, logger, zones, memmap)
 
     mode = 'rb' if binary else 'r'
     with open(q_file, mode) as inp:
         logger.info('reading Q file %r', q_file)
         stream = Stream(inp, binary, big_endian, single_precision, False,
                         unformatted, False)
-        if multiblock:
-            # Read number of zones.
-            nblocks = stream.read_int(full_record=True)
+        shape = _read_plot3d_header(stream, multiblock, dim, 'Q', grid_shape,
+                                    logger)
+
+        # Index zone scalars and variables.
+        if binary:
+            records = []
+            for zone_shape in shape:
+                records.append(4)
+                records.append((dim+2) * _size(zone_shape))
+            offsets = _index_plot3d(stream, records)
         else:
-            nblocks = 1
-        if nblocks != len(domain.zones):
-            raise RuntimeError('Q zones %d != Grid zones %d'
-                               % (nblocks, len(domain.zones)))
-
-        # Read zone dimensions.
-        if unformatted:
-            reclen = stream.read_recordmark()
-            expected = stream.reclen_ints(dim * nblocks)
-            if reclen != expected:
-                logger.warning('unexpected dimensions recordlength'
-                               ' %d vs. %d', reclen, expected)
-        for zone in domain.zones:
-            name = domain.zone_name(zone)
-            imax, jmax, kmax = _read_plot3d_dims(stream, dim)
-            if dim > 2:
-                logger.debug('    %s: %dx%dx%d', name, imax, jmax, kmax)
-                zone_i, zone_j, zone_k = zone.shape
-                if imax != zone_i or jmax != zone_j or kmax != zone_k:
-                    raise RuntimeError('%s: Q %dx%dx%d != Grid %dx%dx%d'
-                                       % (name, imax, jmax, kmax,
-                                          zone_i, zone_j, zone_k))
-            else:
-                logger.debug('    %s: %dx%d', name, imax, jmax)
-                zone_i, zone_j = zone.shape
-                if imax != zone_i or jmax != zone_j:
-                    raise RuntimeError('%s: Q %dx%d != Grid %dx%d'
-                                       % (name, imax, jmax, zone_i, zone_j))
-        if unformatted:
-            reclen2 = stream.read_recordmark()
-            if reclen2 != reclen:
-                logger.warning('mismatched dimensions recordlength'
-                               ' %d vs. %d', reclen2, reclen)
+            offsets = [None] * (2 * len(shape))
 
         # Read zone scalars and variables.
-        for zone in domain.zones:
-            name = domain.zone_name(zone)
+        for i, zone_shape in enumerate(shape):
+            name = 'zone_%d' % (i+1)
+            zone = getattr(domain, name, None)
+            if zone is None:
+                if not binary:  # Skip.
+                    stream.read_floats(4)
+                    stream.read_floats((dim+2) * _size(zone_shape))
+                continue
             logger.debug('reading data for %s', name)
-            _read_plot3d_qscalars(zone, stream, logger)
-            _read_plot3d_qvars(zone, stream, planes, logger)
+            _read_plot3d_qscalars(zone, stream, logger, offsets[2*i])
+            _read_plot3d_qvars(zone, stream, planes, logger, offsets[2*i+1],
+                               variables, memmap)
 
     return domain
 
 
 def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
                   blanking=False, planes=False, binary=True, big_endian=False,
-                  single_precision=True, unformatted=True, logger=None):
+                  single_precision=True, unformatted=True, logger=None,
+                  zones=None, variables=None, memmap=False):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file` and
     `f_file`.  Variables are assigned to names of the form `f_N`.
@@ -133,69 +133,53 @@ def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
 
     f_file: string
         Function data filename.
+
+    varnames: list(string) or None
+        Names to use for the variables instead of `f_N`.
+
+    variables: list(string) or None
+        If not None, then only these variables are read.
     """
     logger = logger or NullLogger()
 
-    domain = read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
-                              binary, big_endian, single_precision,
-                              unformatted, logger)
+    domain, grid_shape = _read_plot3d_grid(grid_file, multiblock, dim,
+                                           blanking, planes, binary,
+                                           big_endian, single_precision,
+                                           unformatted, logger, zones, memmap)
 
     mode = 'rb' if binary else 'r'
     with open(f_file, mode) as inp:
         logger.info('reading F file %r', f_file)
         stream = Stream(inp, binary, big_endian, single_precision, False,
                         unformatted, False)
-        if multiblock:
-            # Read number of zones.
-            nblocks = stream.read_int(full_record=True)
-        else:
-            nblocks = 1
-        if nblocks != len(domain.zones):
-            raise RuntimeError('F zones %d != Grid zones %d'
-                               % (nblocks, len(domain.zones)))
+        shape = _read_plot3d_header(stream, multiblock, dim, 'F', grid_shape,
+                                    logger)
 
-        # Read zone dimensions.
-        if unformatted:
-            reclen = stream.read_recordmark()
-            expected = stream.reclen_ints((dim+1) * nblocks)
-            if reclen != expected:
-                logger.warning('unexpected dimensions recordlength'
-                               ' %d vs. %d', reclen, expected)
-        for zone in domain.zones:
-            name = domain.zone_name(zone)
-            imax, jmax, kmax, nvars = _read_plot3d_dims(stream, dim, True)
-            if dim > 2:
-                logger.debug('    %s: %dx%dx%d %d',
-                             name, imax, jmax, kmax, nvars)
-                zone_i, zone_j, zone_k = zone.shape
-                if imax != zone_i or jmax != zone_j or kmax != zone_k:
-                    raise RuntimeError('%s: F %dx%dx%d != Grid %dx%dx%d'
-                                       % (name, imax, jmax, kmax,
-                                          zone_i, zone_j, zone_k))
-            else:
-                logger.debug('    %s: %dx%d %d', name, imax, jmax, nvars)
-                zone_i, zone_j = zone.shape
-                if imax != zone_i or jmax != zone_j:
-                    raise RuntimeError('%s: F %dx%d != Grid %dx%d'
-                                       % (name, imax, jmax, zone_i, zone_j))
-        if unformatted:
-            reclen2 = stream.read_recordmark()
-            if reclen2 != reclen:
-                logger.warning('mismatched dimensions recordlength'
-                               ' %d vs. %d', reclen2, reclen)
+        # Index zone variables.
+        if binary:
+            offsets = _index_plot3d(stream, [nvars * _size(zone_shape)
+                                             for zone_shape, nvars in shape])
+        else:
+            offsets = [None] * len(shape)
 
         # Read zone variables.
-        for zone in domain.zones:
-            name = domain.zone_name(zone)
+        for i, (zone_shape, nvars) in enumerate(shape):
+            name = 'zone_%d' % (i+1)
+            zone = getattr(domain, name, None)
+            if zone is None:
+                if not binary:  # Skip.
+                    stream.read_floats(nvars * _size(zone_shape))
+                continue
             logger.debug('reading data for %s', name)
-            _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes,
-                               logger)
+            _read_plot3d_fvars(zone, stream, nvars, varnames, planes, logger,
+                               offsets[i], variables, memmap)
     return domain
 
 
 def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
                      planes=False, binary=True, big_endian=False,
-                     single_precision=True, unformatted=True, logger=None):
+                     single_precision=True, unformatted=True, logger=None,
+                     zones=None, memmap=False):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file`.
 
@@ -203,6 +187,18 @@ def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
         Grid filename.
     """
     logger = logger or NullLogger()
+    return _read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
+                             binary, big_endian, single_precision,
+                             unformatted, logger, zones, memmap)[0]
+
+
+def _read_plot3d_grid(grid_file, multiblock, dim, blanking, planes, binary,
+                      big_endian, single_precision, unformatted, logger,
+                      zones, memmap):
+    """
+    Returns ``(domain, shape)`` from Plot3D `grid_file`, where `shape` is
+    the list of all zone dimensions in the file.
+    """
     domain = DomainObj()
 
     mode = 'rb' if binary else 'r'
@@ -213,15 +209,33 @@ def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
 
         # Read zone dimensions.
         shape = _read_plot3d_shape(stream, multiblock, dim, logger)
+        if zones is None:
+            zones = range(1, len(shape)+1)
+        else:
+            for i in zones:
+                if i < 1 or i > len(shape):
+                    raise ValueError('invalid zone %r (%d zones)'
+                                     % (i, len(shape)))
+
+        # Index zone coordinates.
+        if binary:
+            offsets = _index_plot3d(stream, [len(zone_shape) * _size(zone_shape)
+                                             for zone_shape in shape])
+        else:
+            offsets = [None] * len(shape)
 
         # Read zone coordinates.
-        for i in range(len(shape)):
-            zone = domain.add_zone('', Zone())
+        for i, zone_shape in enumerate(shape):
+            if i+1 not in zones:
+                if not binary:  # Skip.
+                    stream.read_floats(len(zone_shape) * _size(zone_shape))
+                continue
+            zone = domain.add_zone('zone_%d' % (i+1), Zone())
             name = domain.zone_name(zone)
             logger.debug('reading coordinates for %s', name)
-            _read_plot3d_coords(zone, stream, shape[i], blanking, planes,
-                                logger)
-    return domain
+            _read_plot3d_coords(zone, stream, zone_shape, blanking, planes,
+                                logger, offsets[i], memmap)
+    return (domain, shape)
 
 
 def read_plot3d_shape(grid_file, multiblock=True, dim=3, binary=True,
@@ -278,6 +292,62 @@ def _read_plot3d_shape(stream, multiblock, dim, logger):
     return shape
 
 
+def _read_plot3d_header(stream, multiblock, dim, kind, grid_shape, logger):
+    """
+    Reads zone dimensions from Q or F (`kind`) `stream` and checks them
+    against `grid_shape`. Returns the list of zone dimensions for Q files,
+    or of ``(dimensions, nvars)`` for F files.
+    """
+    f_file = kind == 'F'
+    if multiblock:
+        # Read number of zones.
+        nblocks = stream.read_int(full_record=True)
+    else:
+        nblocks = 1
+    if nblocks != len(grid_shape):
+        raise RuntimeError('%s zones %d != Grid zones %d'
+                           % (kind, nblocks, len(grid_shape)))
+
+    # Read zone dimensions.
+    if stream.unformatted:
+        reclen = stream.read_recordmark()
+        count = dim+1 if f_file else dim
+        expected = stream.reclen_ints(count * nblocks)
+        if reclen != expected:
+            logger.warning('unexpected dimensions recordlength'
+                           ' %d vs. %d', reclen, expected)
+    shape = []
+    for i, zone_shape in enumerate(grid_shape):
+        name = 'zone_%d' % (i+1)
+        dims = _read_plot3d_dims(stream, dim, f_file)
+        if f_file:
+            imax, jmax, kmax, nvars = dims
+            suffix = ' %d' % nvars
+        else:
+            imax, jmax, kmax = dims
+            suffix = ''
+        if dim > 2:
+            logger.debug('    %s: %dx%dx%d%s', name, imax, jmax, kmax, suffix)
+            zone_i, zone_j, zone_k = zone_shape
+            if imax != zone_i or jmax != zone_j or kmax != zone_k:
+                raise RuntimeError('%s: %s %dx%dx%d != Grid %dx%dx%d'
+                                   % (name, kind, imax, jmax, kmax,
+                                      zone_i, zone_j, zone_k))
+        else:
+            logger.debug('    %s: %dx%d%s', name, imax, jmax, suffix)
+            zone_i, zone_j = zone_shape
+            if imax != zone_i or jmax != zone_j:
+                raise RuntimeError('%s: %s %dx%d != Grid %dx%d'
+                                   % (name, kind, imax, jmax, zone_i, zone_j))
+        shape.append((zone_shape, nvars) if f_file else zone_shape)
+    if stream.unformatted:
+        reclen2 = stream.read_recordmark()
+        if reclen2 != reclen:
+            logger.warning('mismatched dimensions recordlength'
+                           ' %d vs. %d', reclen2, reclen)
+    return shape
+
+
 def _read_plot3d_dims(stream, dim, f_file=False):
     """
     Reads dimensions for a zone from given Plot3D stream. `dim` is the expected
@@ -311,7 +381,81 @@ def _read_plot3d_dims(stream, dim, f_file=False):
         return (imax, jmax, kmax)
 
 
-def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger):
+def _size(shape):
+    """ Returns number of items in an array of `shape`. """
+    count = 1
+    for size in shape:
+        count *= size
+    return count
+
+
+def _recordmark_size(stream):
+    """ Returns size of recordmarks in `stream`, zero if not unformatted. """
+    if not stream.unformatted:
+        return 0
+    return 8 if stream.recordmark_8 else 4
+
+
+def _index_plot3d(stream, records):
+    """
+    Returns file offsets of the data in binary `stream` for successive
+    records of floats, starting at the current position.
+    `records` is a list of the number of floats in each record.
+    """
+    mark = _recordmark_size(stream)
+    offsets = []
+    offset = stream.tell()
+    for count in records:
+        offsets.append(offset + mark)
+        offset += stream.reclen_floats(count) + 2*mark
+    return offsets
+
+
+def _check_record(stream, offset, count, name, logger):
+    """ Checks recordmarks around `count` floats at `offset`. """
+    if not stream.unformatted:
+        return
+    expected = stream.reclen_floats(count)
+    stream.seek(offset - _recordmark_size(stream))
+    reclen = stream.read_recordmark()
+    if reclen != expected:
+        logger.warning('unexpected %s recordlength'
+                       ' %d vs. %d', name, reclen, expected)
+    stream.seek(offset + expected)
+    reclen2 = stream.read_recordmark()
+    if reclen2 != reclen:
+        logger.warning('mismatched %s recordlength'
+                       ' %d vs. %d', name, reclen2, reclen)
+
+
+def _read_plot3d_array(stream, offset, shape, memmap):
+    """
+    Returns floats as an array of `shape` in Fortran order.
+    If `offset` is None, the data is read from the current position,
+    otherwise from `offset`, possibly as a :class:`numpy.memmap`.
+    """
+    if offset is None:
+        return stream.read_floats(shape, order='Fortran')
+    if memmap:
+        dtype = numpy.dtype(numpy.float32 if stream.single_precision
+                                          else numpy.float64)
+        dtype = dtype.newbyteorder('>' if stream.big_endian else '<')
+        return numpy.memmap(stream.file, dtype=dtype, mode='c',
+                            offset=offset, shape=shape, order='F')
+    stream.seek(offset)
+    return stream.read_floats(shape, order='Fortran')
+
+
+def _log_array(logger, name, arr):
+    """ Logs range of `arr`, unless that would read a memmap. """
+    if isinstance(arr, numpy.memmap):
+        logger.debug('    %s mapped at offset %d', name, arr.offset)
+    else:
+        logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+
+
+def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger,
+                        offset=None, memmap=False):
     """ Reads coordinates (& blanking) from given Plot3D stream. """
     if blanking:
         raise NotImplementedError('blanking not supported yet')
@@ -320,40 +464,24 @@ def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger):
         raise NotImplementedError('planar format not supported yet')
 
     dim = len(shape)
+    size = _size(shape)
+    if offset is not None:
+        _check_record(stream, offset, dim * size, 'coords', logger)
 
-    if stream.unformatted:
-        if dim > 2:
-            total = 3 * shape[0] * shape[1] * shape[2]
+    for i, name in enumerate(('x', 'y', 'z')[:dim]):
+        if offset is not None:
+            arr_offset = offset + stream.reclen_floats(i * size)
         else:
-            total = 2 * shape[0] * shape[1]
-        reclen = stream.read_recordmark()
-        expected = stream.reclen_floats(total)
-        if reclen != expected:
-            logger.warning('unexpected coords recordlength'
-                           ' %d vs. %d', reclen, expected)
+            arr_offset = None
+        arr = _read_plot3d_array(stream, arr_offset, shape, memmap)
+        setattr(zone.grid_coordinates, name, arr)
+        _log_array(logger, name, arr)
 
-    zone.grid_coordinates.x = stream.read_floats(shape, order='Fortran')
-    logger.debug('    x min %g, max %g',
-                 zone.grid_coordinates.x.min(), zone.grid_coordinates.x.max())
 
-    zone.grid_coordinates.y = stream.read_floats(shape, order='Fortran')
-    logger.debug('    y min %g, max %g',
-                 zone.grid_coordinates.y.min(), zone.grid_coordinates.y.max())
-
-    if dim > 2:
-        zone.grid_coordinates.z = stream.read_floats(shape, order='Fortran')
-        logger.debug('    z min %g, max %g',
-                     zone.grid_coordinates.z.min(), zone.grid_coordinates.z.max())
-
-    if stream.unformatted:
-        reclen2 = stream.read_recordmark()
-        if reclen2 != reclen:
-            logger.warning('mismatched coords recordlength %d vs. %d',
-                           reclen2, reclen)
-
-
-def _read_plot3d_qscalars(zone, stream, logger):
+def _read_plot3d_qscalars(zone, stream, logger, offset=None):
     """ Reads Mach number, alpha, Reynolds number, and time. """
+    if offset is not None:
+        stream.seek(offset - _recordmark_size(stream))
     mach, alpha, reynolds, time = stream.read_floats(4, full_record=True)
     logger.debug('    mach %g, alpha %g, reynolds %g, time %g',
                  mach, alpha, reynolds, time)
@@ -363,91 +491,75 @@ def _read_plot3d_qscalars(zone, stream, logger):
     zone.flow_solution.time = time
 
 
-def _read_plot3d_qvars(zone, stream, planes, logger):
+def _read_plot3d_qvars(zone, stream, planes, logger, offset=None,
+                       variables=None, memmap=False):
     """ Reads 'density', 'momentum' and 'energy_stagnation_density'. """
     if planes:
         raise NotImplementedError('planar format not supported yet')
 
     shape = zone.shape
-    dim = len(shape)
-
-    if stream.unformatted: 
-        if dim > 2:
-            imax, jmax, kmax = shape
-            total = 5 * imax * jmax * kmax
-        else:
-            imax, jmax = shape
-            total = 4 * imax * jmax
-        reclen = stream.read_recordmark()
-        expected = stream.reclen_floats(total)
-        if reclen != expected:
-            logger.warning('unexpected Q variables recordlength'
-                           ' %d vs. %d', reclen, expected)
-    name = 'density'
-    arr = stream.read_floats(shape, order='Fortran')
-    logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
-    zone.flow_solution.add_array(name, arr)
-
-    vec = Vector()
-
-    vec.x = stream.read_floats(shape, order='Fortran')
-    logger.debug('    momentum.x min %g, max %g', vec.x.min(), vec.x.max())
-
-    vec.y = stream.read_floats(shape, order='Fortran')
-    logger.debug('    momentum.y min %g, max %g', vec.y.min(), vec.y.max())
-
-    if dim > 2:
-        vec.z = stream.read_floats(shape, order='Fortran')
-        logger.debug('    momentum.z min %g, max %g', vec.z.min(), vec.z.max())
-
-    zone.flow_solution.add_vector('momentum', vec)
-
-    name = 'energy_stagnation_density'
-    arr = stream.read_floats(shape, order='Fortran')
-    logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
-    zone.flow_solution.add_array(name, arr)
-
-    if stream.unformatted:
-        reclen2 = stream.read_recordmark()
-        if reclen2 != reclen:
-            logger.warning('mismatched Q variables recordlength'
-                           ' %d vs. %d', reclen2, reclen)
+    layout = [('density', None), ('momentum', 'x'), ('momentum', 'y')]
+    if len(shape) > 2:
+        layout.append(('momentum', 'z'))
+    layout.append(('energy_stagnation_density', None))
+    _read_plot3d_vars(zone, stream, layout, 'Q variables', logger, offset,
+                      variables, memmap)
 
 
-def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
+def _read_plot3d_fvars(zone, stream, nvars, varnames, planes, logger,
+                       offset=None, variables=None, memmap=False):
     """ Reads 'function' variables. """
     if planes:
         raise NotImplementedError('planar format not supported yet')
 
-    shape = zone.shape
-    dim = len(shape)
-
-    if stream.unformatted: 
-        if dim > 2:
-            imax, jmax, kmax = shape
-            total = nvars * imax * jmax * kmax
-        else:
-            imax, jmax = shape
-            total = nvars * imax * jmax
-        reclen = stream.read_recordmark()
-        expected = stream.reclen_floats(total)
-        if reclen != expected:
-            logger.warning('unexpected F variables recordlength'
-                           ' %d vs. %d', reclen, expected)
+    layout = []
     for i in range(nvars):
         if varnames and i < len(varnames):
             name = varnames[i]
         else:
             name = 'f_%d' % (i+1)
-        arr = stream.read_floats(shape, order='Fortran')
-        zone.flow_solution.add_array(name, arr)
-        logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+        layout.append((name, None))
+    _read_plot3d_vars(zone, stream, layout, 'F variables', logger, offset,
+                      variables, memmap)
 
-    if stream.unformatted:
-        reclen2 = stream.read_recordmark()
-        if reclen2 != reclen:
-            logger.warning('mismatched F variables recordlength'
-                           ' %d vs. %d', reclen2, reclen)
+
+def _read_plot3d_vars(zone, stream, layout, record_name, logger, offset,
+                      variables, memmap):
+    """
+    Reads the variables of one zone. `layout` is a list of ``(name,
+    component)`` in file order, `component` is None for scalar arrays.
+    Only `variables` are read if not None.
+    """
+    shape = zone.shape
+    size = _size(shape)
+    if offset is not None:
+        _check_record(stream, offset, len(layout) * size, record_name,
+                      logger)
+
+    flow = zone.flow_solution
+    vectors = {}
+    for i, (name, component) in enumerate(layout):
+        if variables is not None and name not in variables:
+            if offset is None:  # Skip.
+                stream.read_floats(size)
+            continue
+        if offset is not None:
+            arr_offset = offset + stream.reclen_floats(i * size)
+        else:
+            arr_offset = None
+        arr = _read_plot3d_array(stream, arr_offset, shape, memmap)
+        if component is None:
+            flow.add_array(name, arr)
+            _log_array(logger, name, arr)
+        else:
+            if name not in vectors:
+                vectors[name] = Vector()
+            setattr(vectors[name], component, arr)
+            _log_array(logger, '%s.%s' % (name, component), arr)
+
+    for name, component in layout:
+        if name in vectors:
+            flow.add_vector(name, vectors.pop(name))
 
 
 def write_plot3d_q(domain, grid_file, q_file, planes=False, binary=True,
@@ -3,7 +3,9 @@ Support for calculating one or more scalar averages across one or more
 regions in a domain.
 """
 
-from math import cos, sin, sqrt
+from itertools import product
+
+import numpy
 
 from openmdao.lib.datatypes.domain.flow import CELL_CENTER
 from openmdao.lib.datatypes.domain.zone import CYLINDRICAL
@@ -226,9 +228,67 @@ def _get_dimension(region):
     return dim
 
 
+def _index_ranges(region):
+    """
+    Return ``(lo, hi, spanned)`` for the faces or edges of `region`.
+    `lo` and `hi` are the index limits ``[lo, hi)`` for each index direction
+    and `spanned` lists the index directions the faces or edges extend along.
+    """
+    lo, hi, spanned = [], [], []
+    limits = region[1:]
+    for axis in range(len(limits) // 2):
+        imin, imax = limits[2*axis], limits[2*axis+1]
+        lo.append(imin)
+        if imin == imax:
+            hi.append(imax + 1)
+        else:
+            hi.append(imax)
+            spanned.append(axis)
+    return (lo, hi, spanned)
+
+
+def _slices(lo, hi, offset):
+    """ Return index slices for range ``[lo, hi)`` shifted by `offset`. """
+    return tuple([slice(start+delta, stop+delta)
+                  for start, stop, delta in zip(lo, hi, offset)])
+
+
+def _values(arr, index):
+    """ Return values of `arr` at `index` in double precision. """
+    return numpy.asarray(arr[index], dtype=float)
+
+
+def _coordinates(zone):
+    """
+    Return ``(c1, c2, c3)`` coordinate arrays for `zone`.
+    Missing coordinates are None.
+    """
+    grid = zone.grid_coordinates
+    if zone.coordinate_system == CYLINDRICAL:
+        return (grid.z, grid.r, grid.t)
+    else:
+        return (grid.x, grid.y, grid.z)
+
+
+def _momentum(zone, zone_name):
+    """
+    Return ``(mom_c1, mom_c2, mom_c3)`` momentum arrays for `zone`.
+    Missing components are None.
+    """
+    try:
+        momentum = zone.flow_solution.momentum
+    except AttributeError:
+        raise AttributeError("For mass averaging zone %s is missing"
+                             " 'momentum'." % zone_name)
+    if zone.coordinate_system == CYLINDRICAL:
+        return (momentum.z, momentum.r, momentum.t)
+    else:
+        return (momentum.x, momentum.y, momentum.z)
+
+
 def _calc_weights(scheme, domain, regions):
     """
-    Calculate averaging weights, updating `weights` and returning total value.
+    Calculate averaging weights, returning ``(weights, weight_total)``.
     """
     weights = {}
     weight_total = 0.
@@ -238,28 +298,20 @@ def _calc_weights(scheme, domain, regions):
         if dim == 3:
             zone_weights = _volume_weights(scheme, domain, region)
         elif dim == 2:
-            if len(region) == 7:
-                zone_weights = _surface_weights_3d(scheme, domain, region)
-            else:
-                zone_weights = _surface_weights_2d(scheme, domain, region)
+            zone_weights = _surface_weights(scheme, domain, region)
         elif dim == 1:
-            if len(region) == 7:
-                zone_weights = _curve_weights_3d(scheme, domain, region)
-            elif len(region) == 5:
-                zone_weights = _curve_weights_2d(scheme, domain, region)
-            else:
-                zone_weights = _curve_weights_1d(scheme, domain, region)
+            zone_weights = _curve_weights(scheme, domain, region)
         else:
-            zone_weights = [1.]
+            zone_weights = numpy.ones(1)
 
         zone_name = region[0]
         zone = getattr(domain, zone_name)
-        zone_weights *= zone.symmetry_instances  # Adjust for symmetry.
         if zone_name in weights:
             raise RuntimeError('Zone %r used more than once' % zone_name)
         else:
             weights[zone_name] = zone_weights
-        weight_total += sum(zone_weights)
+        # Adjust for symmetry.
+        weight_total += float(zone_weights.sum()) * zone.symmetry_instances
 
     return (weights, weight_total)
 
@@ -269,244 +321,38 @@ def _volume_weights(scheme, domain, region):
     raise NotImplementedError('_volume_weights')
 
 
-def _surface_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh surface. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
-
-    if scheme == 'mass':
-        try:
-            if cylindrical:
-                mom_c1 = flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = flow.momentum.z.item
-        except AttributeError:
-            raise AttributeError("For mass averaging zone %s is missing"
-                                 " 'momentum'." % zone_name)
-    if imin == imax:
-        imax += 1
-        face_normal = _iface_normal
-        face_value = _iface_cell_value if cell_center else _iface_node_value
-    elif jmin == jmax:
-        jmax += 1
-        face_normal = _jface_normal
-        face_value = _jface_cell_value if cell_center else _jface_node_value
-    else:
-        kmax += 1
-        face_normal = _kface_normal
-        face_value = _kface_cell_value if cell_center else _kface_node_value
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
-                if scheme == 'mass':
-                    loc = (i, j, k)
-                    rvu = face_value(mom_c1, loc)
-                    rvv = face_value(mom_c2, loc)
-                    rvw = face_value(mom_c3, loc)
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
-
-
-def _surface_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh surface. """
-    zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    if scheme == 'mass':
-        try:
-            if cylindrical:
-                mom_c1 = None if flow.momentum.z is None else flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = None if flow.momentum.z is None else flow.momentum.z.item
-        except AttributeError:
-            raise AttributeError("For mass averaging zone %s is missing"
-                                 " 'momentum'." % zone_name)
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
-                if scheme == 'mass':
-                    ip1 = i + 1
-                    jp1 = j + 1
-                    if cell_center:
-                        # Cell value is value.
-# FIXME: built-in ghosts
-                        rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
-                        rvv = mom_c2(ip1, jp1)
-                        rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
-                    else:
-                        # Average across vertices.
-                        if mom_c1 is None:
-                            rvu = 0.
-                        else:
-                            rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
-                                          mom_c1(i, jp1) + mom_c1(ip1, jp1))
-                        rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
-                                      mom_c2(i, jp1) + mom_c2(ip1, jp1))
-                        if mom_c3 is None:
-                            rvw = 0.
-                        else:
-                            rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
-                                          mom_c3(i, jp1) + mom_c3(ip1, jp1))
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
-
-
-def _curve_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = grid.z.item
-
-    if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    along_i, along_j = False, False
-    if imin != imax:
-        along_i = True
-        jmax += 1
-        kmax += 1
-    elif jmin != jmax:
-        along_j = True
-        imax += 1
-        kmax += 1
-    else:
-        imax += 1
-        jmax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                if along_i:
-                    dx = x(i+1, j, k) - x(i, j, k)
-                    dy = y(i+1, j, k) - y(i, j, k)
-                    dz = z(i+1, j, k) - z(i, j, k)
-                elif along_j:
-                    dx = x(i, j+1, k) - x(i, j, k)
-                    dy = y(i, j+1, k) - y(i, j, k)
-                    dz = z(i, j+1, k) - z(i, j, k)
-                else:
-                    dx = x(i, j, k+1) - x(i, j, k)
-                    dy = y(i, j, k+1) - y(i, j, k)
-                    dz = z(i, j, k+1) - z(i, j, k)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
-
-
-def _curve_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax = region
+def _surface_weights(scheme, domain, region):
+    """ Returns weights for a mesh surface, in index order. """
+    zone_name = region[0]
     zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = None if grid.z is None else grid.z.item
+    lo, hi, spanned = _index_ranges(region)
+    normal = _face_normals(zone, lo, hi, spanned)
 
     if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    if imin != imax:
-        along_i = True
-        jmax += 1
+        momentum = _momentum(zone, zone_name)
+        cell_center = zone.flow_solution.grid_location == CELL_CENTER
+        weights = numpy.zeros([stop-start for start, stop in zip(lo, hi)])
+        for mom, sc in zip(momentum, normal):
+            if mom is not None:
+                weights += sc * _face_values(lambda index: _values(mom, index),
+                                             lo, hi, spanned, cell_center)
     else:
-        along_i = False
-        imax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                if along_i:
-                    dx = x(i+1, j) - x(i, j)
-                    dy = y(i+1, j) - y(i, j)
-                    dz = 0. if z is None else z(i+1, j) - z(i, j)
-                else:
-                    dx = x(i, j+1) - x(i, j)
-                    dy = y(i, j+1) - y(i, j)
-                    dz = 0. if z is None else z(i, j+1) - z(i, j)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+        sc1, sc2, sc3 = normal
+        weights = numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+    return weights.ravel()
 
 
-def _curve_weights_1d(scheme, domain, region):
-    """ Returns 1D (index space) weights for a mesh curve. """
-    zone_name, imin, imax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
+def _curve_weights(scheme, domain, region):
+    """ Returns weights for a mesh curve, in index order. """
+    zone = getattr(domain, region[0])
+    if zone.coordinate_system == CYLINDRICAL:
         raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = None if grid.y is None else grid.y.item
-        z = None if grid.z is None else grid.z.item
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    weights = []
-    for i in range(imin, imax):
-        dx = x(i+1) - x(i)
-        dy = 0. if y is None else y(i+1) - y(i)
-        dz = 0. if z is None else z(i+1) - z(i)
-        weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    lo, hi, spanned = _index_ranges(region)
+    return _edge_lengths(zone, lo, hi, spanned[0]).ravel()
 
 
 def _calc_metric(name, domain, region, weights, reference_state):
@@ -528,19 +374,11 @@ def _calc_metric(name, domain, region, weights, reference_state):
     elif dim == 2:
         if geometry not in ('surface', 'any'):
             raise RuntimeError('metric %r not applicable to surfaces')
-        if len(region) == 7:
-            total = _surface_3d(metric, integrate, zone, region, weights)
-        else:
-            total = _surface_2d(metric, integrate, zone, region, weights)
+        total = _surface(metric, integrate, zone, region, weights)
     elif dim == 1:
         if geometry not in ('curve', 'any'):
             raise RuntimeError('metric %r not applicable to curves')
-        if len(region) == 7:
-            total = _curve_3d(metric, integrate, zone, region, weights)
-        elif len(region) == 5:
-            total = _curve_2d(metric, integrate, zone, region, weights)
-        else:
-            total = _curve_1d(metric, integrate, zone, region, weights)
+        total = _curve(metric, integrate, zone, region, weights)
     else:
         if geometry != 'any':
             raise RuntimeError('metric %r not applicable to points')
@@ -606,316 +444,97 @@ def _volume(metric, integrate, zone, region, weights):
 '''
 
 
-def _surface_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) surface. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
+def _surface(metric, integrate, zone, region, weights):
+    """ Calculate metric on a surface. """
+    lo, hi, spanned = _index_ranges(region)
+    cell_center = zone.flow_solution.grid_location == CELL_CENTER
 
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+    if integrate:
+        normal = _face_normals(zone, lo, hi, spanned)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        normal = None
 
-    if imin == imax: 
-        face = 'i'
-        imax += 1
-        get_normal = _iface_normal
-    elif jmin == jmax:
-        face = 'j'
-        jmax += 1 
-        get_normal = _jface_normal
-    else:
-        face = 'k'
-        kmax += 1
-        get_normal = _kface_normal
+    values = _face_values(lambda index: _calculate(metric, index, normal),
+                          lo, hi, spanned, cell_center)
+    return _total(values, integrate, weights)
 
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
 
-                if integrate:
-                    normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
-    
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing surface.
-                    val = metric.calculate((i+1, j+1, k+1), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j+1, k), normal)
-                    val *= 0.5
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k), normal)
-                    val *= 0.25
+def _curve(metric, integrate, zone, region, weights):
+    """ Calculate metric on a curve. """
+    lo, hi, spanned = _index_ranges(region)
+    cell_center = zone.flow_solution.grid_location == CELL_CENTER
 
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
-
-
-def _surface_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) surface. """
-    zone_name, imin, imax, jmin, jmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+    if integrate:
+        length = _edge_lengths(zone, lo, hi, spanned[0])
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
-    
-            if cell_center:
-# FIXME: built-in ghosts
-                # Cell value is value.
-                val = metric.calculate((i+1, j+1), normal)
-            else:
-                # Average across vertices.
-                val  = metric.calculate((i, j), normal)
-                val += metric.calculate((i, j+1), normal)
-                val += metric.calculate((i+1, j+1), normal)
-                val += metric.calculate((i+1, j), normal)
-                val *= 0.25
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
+        length = None
 
+    values = _face_values(lambda index: _calculate(metric, index, length),
+                          lo, hi, spanned, cell_center)
+    return _total(values, integrate, weights)
 
-def _curve_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
-
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        kmax += 1
-        get_length = _iedge_length
-    elif jmin != jmax:
-        edge = 'j'
-        imax += 1
-        kmax += 1
-        get_length = _jedge_length
+def _total(values, integrate, weights):
+    """ Return sum of `values`, weighted if not integrating. """
+    if integrate:
+        return float(values.sum())
     else:
-        edge = 'k'
-        imax += 1
-        jmax += 1
-        get_length = _kedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    length = get_length(c1, c2, c3, (i, j, k), cylindrical)
-
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing edge.
-                    val = metric.calculate((i+1, j+1, k+1), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i, j+1, k), length)
-                    else:
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i, j, k+1), length)
-                    val *= 0.25
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                         val +=metric.calculate((i, j+1, k), length)
-                    else:
-                         val +=metric.calculate((i, j, k+1), length)
-                    val *= 0.5
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+        return float(numpy.dot(values.ravel(), weights))
 
 
-def _curve_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        get_length = _iedge_length
+def _calculate(metric, index, geom):
+    """
+    Return `metric` values over `index` slices as an array.
+    Metrics without :meth:`calculate_array` are evaluated one point
+    at a time.
+    """
+    try:
+        calculate = metric.calculate_array
+    except AttributeError:
+        pass
     else:
-        edge = 'j'
-        imax += 1
-        get_length = _jedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
+        return calculate(index, geom)
+
+    shape = [item.stop - item.start for item in index]
+    values = numpy.zeros(shape)
+    for loc in numpy.ndindex(*shape):
+        if geom is None:
+            item_geom = None
+        elif isinstance(geom, tuple):
+            item_geom = tuple([component[loc] for component in geom])
+        else:
+            item_geom = geom[loc]
+        values[loc] = metric.calculate(tuple([item.start + i for item, i
+                                              in zip(index, loc)]),
+                                       item_geom)
+    return values
 
-            if integrate:
-                length = get_length(c1, c2, c3, (i, j), cylindrical)
 
-            if cell_center:
+def _face_values(func, lo, hi, spanned, cell_center):
+    """
+    Return array of values for the faces (or edges) over index range
+    ``[lo, hi)``. For vertex data `func` values are averaged across the
+    vertices of each face, for cell data across the cells sharing it.
+    `func` is called with a tuple of index slices.
+    """
+    ndim = len(lo)
+    if cell_center:
 # FIXME: built-in ghosts
-                # Average across cells sharing edge.
-                val = metric.calculate((i+1, j+1), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-            else:
-                # Average across vertices.
-                val = metric.calculate((i, j), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
-
-
-def _curve_1d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 1D (index space) curve. """
-    zone_name, imin, imax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        fixed = 1
+        varying = [axis for axis in range(ndim) if axis not in spanned]
     else:
-        c1 = grid.x.item
-        c2 = None if grid.y is None else grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    get_length = _iedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
+        fixed = 0
+        varying = spanned
 
-        if integrate:
-            length = get_length(c1, c2, c3, (i,), cylindrical)
-
-        if cell_center:
-# FIXME: built-in ghosts
-            # Cell value is value.
-            val = metric.calculate((i+1,), length)
-        else:
-            # Average across vertices.
-            val  = metric.calculate((i,), length)
-            val += metric.calculate((i+1,), length)
-            val *= 0.5
-
-        if integrate:
-            total += val
-        else:
-            weight = weights[weight_index]
-            weight_index += 1
-            total += val * weight
-    return total
+    values = numpy.zeros([stop-start for start, stop in zip(lo, hi)])
+    for shifts in product((0, 1), repeat=len(varying)):
+        offset = [fixed] * ndim
+        for axis, shift in zip(varying, shifts):
+            offset[axis] = shift
+        values += func(_slices(lo, hi, offset))
+    if varying:
+        values *= 0.5 ** len(varying)
+    return values
 
 
 def _point(metric, zone, region):
@@ -963,268 +582,90 @@ def _point(metric, zone, region):
             return metric.calculate((imin,), None)
 
 
-def _iface_normal(c1, c2, c3, i, j, k, cylindrical):
-    """
-    Return non-dimensional vector normal to I face with magnitude equal to area.
-    """
-# FIXME: built-in ghosts
-    jp1 = j + 1
-    kp1 = k + 1
-
-    # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(i, j, kp1)
-    diag_c21 = c2(i, jp1, k) - c2(i, j, kp1)
-    diag_c31 = c3(i, jp1, k) - c3(i, j, kp1)
+# Corner offsets (upper-left, lower-right, upper-right, lower-left) and
+# orientation of the face normal, by face type.
+_FACE_CORNERS = {
+    'i': ((0, 1, 0), (0, 0, 1), (0, 1, 1), (0, 0, 0), -0.5),
+    'j': ((1, 0, 0), (0, 0, 1), (1, 0, 1), (0, 0, 0), 0.5),
+    'k': ((0, 1, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0), 0.5),
+    'ij': ((0, 1), (1, 0), (1, 1), (0, 0), 0.5),
+}
 
-    # upper-right - lower-left.
-    diag_c12 = c1(i, jp1, kp1) - c1(i, j, k)
-    diag_c22 = c2(i, jp1, kp1) - c2(i, j, k)
-    diag_c32 = c3(i, jp1, kp1) - c3(i, j, k)
 
-    if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(i, jp1, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(i, jp1, kp1)) / 2.
-    else:
-        r1 = 1.
-        r2 = 1.
-
-    sc1 = -0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = -0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = -0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
-
-    return (sc1, sc2, sc3)
-
-
-def _jface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _face_normals(zone, lo, hi, spanned):
     """
-    Return non-dimensional vector normal to J face with magnitude equal to area.
+    Return non-dimensional vectors normal to the faces over index range
+    ``[lo, hi)`` with magnitude equal to area, as ``(sc1, sc2, sc3)`` arrays.
     """
 # FIXME: built-in ghosts
-    ip1 = i + 1
-    kp1 = k + 1
-
-    # upper-left - lower-right.
-    diag_c11 = c1(ip1, j, k) - c1(i, j, kp1)
-    diag_c21 = c2(ip1, j, k) - c2(i, j, kp1)
-    diag_c31 = c3(ip1, j, k) - c3(i, j, kp1)
-
-    # upper-right - lower-left.
-    diag_c12 = c1(ip1, j, kp1) - c1(i, j, k)
-    diag_c22 = c2(ip1, j, kp1) - c2(i, j, k)
-    diag_c32 = c3(ip1, j, kp1) - c3(i, j, k)
-
-    if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(ip1, j, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(ip1, j, kp1)) / 2.
+    c1, c2, c3 = _coordinates(zone)
+    if len(lo) > 2:
+        face = 'ijk'[[axis for axis in range(3) if axis not in spanned][0]]
     else:
-        r1 = 1.
-        r2 = 1.
-
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
-
-    return (sc1, sc2, sc3)
-
-
-def _kface_normal(c1, c2, c3, i, j, k, cylindrical):
-    """
-    Return non-dimensional vector normal to K face with magnitude equal to area.
-    """
-# FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
+        face = 'ij'
+    upper_left, lower_right, upper_right, lower_left, scale = \
+        _FACE_CORNERS[face]
+    upper_left = _slices(lo, hi, upper_left)
+    lower_right = _slices(lo, hi, lower_right)
+    upper_right = _slices(lo, hi, upper_right)
+    lower_left = _slices(lo, hi, lower_left)
+
+    def diagonal(arr, start, end):
+        """ Return differences along diagonal, zero if no `arr`. """
+        if arr is None:
+            return 0.
+        return _values(arr, start) - _values(arr, end)
 
     # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(ip1, j, k)
-    diag_c21 = c2(i, jp1, k) - c2(ip1, j, k)
-    diag_c31 = c3(i, jp1, k) - c3(ip1, j, k)
+    diag_c11 = diagonal(c1, upper_left, lower_right)
+    diag_c21 = diagonal(c2, upper_left, lower_right)
+    diag_c31 = diagonal(c3, upper_left, lower_right)
 
     # upper-right - lower-left.
-    diag_c12 = c1(ip1, jp1, k) - c1(i, j, k)
-    diag_c22 = c2(ip1, jp1, k) - c2(i, j, k)
-    diag_c32 = c3(ip1, jp1, k) - c3(i, j, k)
+    diag_c12 = diagonal(c1, upper_right, lower_left)
+    diag_c22 = diagonal(c2, upper_right, lower_left)
+    diag_c32 = diagonal(c3, upper_right, lower_left)
 
-    if cylindrical:
-        r1 = (c2(i, jp1, k) + c2(ip1, j,   k)) / 2.
-        r2 = (c2(i, j,   k) + c2(ip1, jp1, k)) / 2.
+    if zone.coordinate_system == CYLINDRICAL:
+        r1 = (_values(c2, lower_right) + _values(c2, upper_left)) / 2.
+        r2 = (_values(c2, lower_left) + _values(c2, upper_right)) / 2.
     else:
         r1 = 1.
         r2 = 1.
 
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
+    sc1 = scale * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
+    sc2 = scale * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
+    sc3 = scale * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
 
     return (sc1, sc2, sc3)
 
 
-def _cell_normal(c1, c2, c3, i, j, cylindrical):
+def _edge_lengths(zone, lo, hi, axis):
     """
-    Return non-dimensional vector normal with magnitude equal to area.
-    If there is no 'z' coordinate, `c1` will be None in cylindrical
-    coordinates, otherwise `c3` will be None.
+    Return array of lengths of the edges along index direction `axis`
+    over index range ``[lo, hi)``.
     """
-# FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
-
-    # upper-left - lower-right.
-    diag_c11 = 0. if c1 is None else c1(i, jp1) - c1(ip1, j)
-    diag_c21 = c2(i, jp1) - c2(ip1, j)
-    diag_c31 = 0. if c3 is None else c3(i, jp1) - c3(ip1, j)
-
-    # upper-right - lower-left.
-    diag_c12 = 0. if c1 is None else c1(ip1, jp1) - c1(i, j)
-    diag_c22 = c2(ip1, jp1) - c2(i, j)
-    diag_c32 = 0. if c3 is None else c3(ip1, jp1) - c3(i, j)
-
-    if cylindrical:
-        r1 = (c2(i, jp1) + c2(ip1, j)) / 2.
-        r2 = (c2(i, j) + c2(ip1, jp1)) / 2.
+    c1, c2, c3 = _coordinates(zone)
+    offset = [0] * len(lo)
+    start = _slices(lo, hi, offset)
+    offset[axis] = 1
+    end = _slices(lo, hi, offset)
+
+    def delta(arr):
+        """ Return differences along edges, zero if no `arr`. """
+        if arr is None:
+            return 0.
+        return _values(arr, end) - _values(arr, start)
+
+    if zone.coordinate_system == CYLINDRICAL:
+        theta = delta(c3)
+        dx = _values(c2, end) * numpy.cos(theta) - _values(c2, start)
+        dy = _values(c2, end) * numpy.sin(theta)
+        dz = delta(c1)
     else:
-        r1 = 1.
-        r2 = 1.
+        dx = delta(c1)
+        dy = delta(c2)
+        dz = delta(c3)
 
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
-
-    return (sc1, sc2, sc3)
-
-
-def _iedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'i'. """
-    if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            theta = c3(ip1, j, k) - c3(i, j, k)
-            dx = c2(ip1, j, k) * cos(theta) - c2(i, j, k)
-            dy = c2(ip1, j, k) * sin(theta)
-            dz = c1(ip1, j, k) - c1(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            theta = c3(ip1, j) - c3(i, j)
-            dx = c2(ip1, j) * cos(theta) - c2(i, j)
-            dy = c2(ip1, j) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1, j) - c1(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            theta = c3(ip1) - c3(i)
-            dx = c2(ip1) * cos(theta) - c2(i)
-            dy = c2(ip1) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1) - c1(i)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            dx = c1(ip1, j, k) - c1(i, j, k)
-            dy = c2(ip1, j, k) - c2(i, j, k)
-            dz = c3(ip1, j, k) - c3(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            dx = c1(ip1, j) - c1(i, j)
-            dy = c2(ip1, j) - c2(i, j)
-            dz = 0. if c3 is None else c3(ip1, j) - c3(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            dx = c1(ip1) - c1(i)
-            dy = 0. if c2 is None else c2(ip1) - c2(i)
-            dz = 0. if c3 is None else c3(ip1) - c3(i)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _jedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'j'. """
-    if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            theta = c3(i, jp1, k) - c3(i, j, k)
-            dx = c2(i, jp1, k) * cos(theta) - c2(i, j, k)
-            dy = c2(i, jp1, k) * sin(theta)
-            dz = c1(i, jp1, k) - c1(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            theta = c3(i, jp1) - c3(i, j)
-            dx = c2(i, jp1) * cos(theta) - c2(i, j)
-            dy = c2(i, jp1) * sin(theta)
-            dz = 0. if c1 is None else c1(i, jp1) - c1(i, j)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            dx = c1(i, jp1, k) - c1(i, j, k)
-            dy = c2(i, jp1, k) - c2(i, j, k)
-            dz = c3(i, jp1, k) - c3(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            dx = c1(i, jp1) - c1(i, j)
-            dy = c2(i, jp1) - c2(i, j)
-            dz = 0. if c3 is None else c3(i, jp1) - c3(i, j)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _kedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'k'. """
-    i, j, k = loc
-    kp1 = k + 1
-    if cylindrical:
-        theta = c3(i, j, kp1) - c3(i, j, k)
-        dx = c2(i, j, kp1) * cos(theta) - c2(i, j, k)
-        dy = c2(i, j, kp1) * sin(theta)
-        dz = c1(i, j, kp1) - c1(i, j, k)
-    else:
-        dx = c1(i, j, kp1) - c1(i, j, k)
-        dy = c2(i, j, kp1) - c2(i, j, k)
-        dz = c3(i, j, kp1) - c3(i, j, k)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _iface_cell_value(arr, loc):
-    """ Returns I face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i, j+1, k+1))
-
-def _jface_cell_value(arr, loc):
-    """ Returns J face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j, k+1))
-
-def _kface_cell_value(arr, loc):
-    """ Returns K face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j+1, k))
-
-
-def _iface_node_value(arr, loc):
-    """ Returns I face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i, j+1, k+1) + arr(i, j, k+1) +
-                   arr(i, j+1, k) + arr(i, j, k))
-
-def _jface_node_value(arr, loc):
-    """ Returns J face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j, k+1) + arr(i, j, k+1) +
-                   arr(i+1, j, k) + arr(i, j, k))
-
-def _kface_node_value(arr, loc):
-    """ Returns K face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j+1, k) + arr(i, j+1, k) +
-                   arr(i+1, j, k) + arr(i, j, k))
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz)
 
@@ -6,6 +6,8 @@ import logging
 import os.path
 import unittest
 
+import numpy
+
 from openmdao.lib.datatypes.domain import read_plot3d_q, write_plot3d_q, \
                                           read_plot3d_f, write_plot3d_f, \
                                           read_plot3d_shape, write_plot3d_grid
@@ -196,6 +198,51 @@ class TestCase(unittest.TestCase):
         self.assertTrue((test_flow.f_3 == wedge_flow.momentum.y).all())
         self.assertTrue((test_flow.f_4 == wedge_flow.energy_stagnation_density).all())
 
+    def test_selective(self):
+        logging.debug('')
+        logging.debug('test_selective')
+
+        logger = logging.getLogger()
+        wedge = create_wedge_3d((30, 20, 10), 5., 0.5, 2., 30.)
+        wedge2 = create_wedge_3d((29, 19, 9), 5., 2.5, 4., 30.)
+        wedge.add_domain(wedge2, prefix='b_')
+        wedge2_flow = wedge2.xyzzy.flow_solution
+
+        for xyz, q, kwargs in (('be-binary.xyz', 'be-binary.q',
+                                dict(big_endian=True, unformatted=False)),
+                               ('unformatted.xyz', 'unformatted.q', {})):
+            write_plot3d_q(wedge, xyz, q, logger=logger, **kwargs)
+            full = read_plot3d_q(xyz, q, logger=logger, **kwargs)
+
+            for memmap in (False, True):
+                domain = read_plot3d_q(xyz, q, logger=logger, zones=[2],
+                                       variables=['density', 'momentum'],
+                                       memmap=memmap, **kwargs)
+                self.assertEqual([domain.zone_name(zone) for zone in domain.zones],
+                                 ['zone_2'])
+                self.assertTrue(domain.zone_2.grid_coordinates.is_equivalent(
+                                full.zone_2.grid_coordinates, logger))
+
+                test_flow = domain.zone_2.flow_solution
+                self.assertEqual(test_flow.mach, wedge2_flow.mach)
+                self.assertTrue((test_flow.density == wedge2_flow.density).all())
+                self.assertTrue((test_flow.momentum.z == wedge2_flow.momentum.z).all())
+                self.assertFalse(hasattr(test_flow, 'energy_stagnation_density'))
+                self.assertEqual(isinstance(test_flow.density, numpy.memmap),
+                                 memmap)
+
+                # Copy-on-write, file is unchanged.
+                test_flow.density[0, 0, 0] = -1.
+                del domain
+
+            domain = read_plot3d_q(xyz, q, logger=logger, **kwargs)
+            self.assertTrue(domain.is_equivalent(full, logger))
+
+        assert_raises(self, "read_plot3d_q('unformatted.xyz', 'unformatted.q',"
+                            " zones=[3])",
+                      globals(), locals(), ValueError,
+                      'invalid zone 3 (2 zones)')
+
 
 if __name__ == '__main__':
     import nose
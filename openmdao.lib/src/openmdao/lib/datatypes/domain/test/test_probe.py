@@ -10,6 +10,8 @@ import unittest
 from math import pi
 
 from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import register_metric, \
+                                                  Area, MassFlow, TotalPressure
 from openmdao.lib.datatypes.domain.test import restart, overflow
 from openmdao.lib.datatypes.domain.test.cube import create_cube
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
@@ -19,6 +21,23 @@ from openmdao.util.testutil import assert_raises, assert_rel_error
 ORIG_DIR = os.getcwd()
 
 
+def scalar_metric(cls):
+    """ Return a metric class wrapping `cls` without calculate_array(). """
+
+    class ScalarMetric(object):
+
+        def __init__(self, zone, zone_name, reference_state):
+            self.metric = cls(zone, zone_name, reference_state)
+
+        def calculate(self, loc, geom):
+            return self.metric.calculate(loc, geom)
+
+        def dimensionalize(self, value):
+            return self.metric.dimensionalize(value)
+
+    return ScalarMetric
+
+
 class TestCase(unittest.TestCase):
     """ Test :class:`Domain` mesh_probe() operations. """
 
@@ -237,6 +256,31 @@ class TestCase(unittest.TestCase):
         assert_rel_error(self, metrics[5], -149.525, 0.00001)
         assert_rel_error(self, metrics[6], -262.976, 0.00001)
 
+    def test_scalar_metric(self):
+        # Metrics without calculate_array() are evaluated one point at a time.
+        logging.debug('')
+        logging.debug('test_scalar_metric')
+
+        register_metric('scalar_area', scalar_metric(Area), True, 'surface')
+        register_metric('scalar_mass_flow', scalar_metric(MassFlow), True,
+                        'surface')
+        register_metric('scalar_pressure_stagnation',
+                        scalar_metric(TotalPressure), False)
+
+        domain = restart.read('lpc-test', logging.getLogger())
+        for regions in ([('zone_1', 2, 2, 0, -1, 0, -1),
+                         ('zone_2', 2, 2, 0, -1, 0, -1)],
+                        [('zone_1', 0, -1, 2, 2, 0, -1)],
+                        [('zone_1', 0, -1, 0, -1, 2, 2)]):
+            for name, units in (('area', 'inch**2'),
+                                ('mass_flow', 'lbm/s'),
+                                ('pressure_stagnation', 'psi')):
+                variables = [(name, units), ('scalar_'+name, units)]
+                for scheme in ('area', 'mass'):
+                    vector, scalar = mesh_probe(domain, regions, variables,
+                                                scheme)
+                    assert_rel_error(self, scalar, vector, 1e-12)
+
     def test_errors(self):
         logging.debug('')
         logging.debug('test_errors')
@@ -2,17 +2,50 @@
 variety of difference types are available for both first and second order."""
 
 import logging
+import multiprocessing
+import os
 from ordereddict import OrderedDict
 from itertools import product
 
 from openmdao.main.numpy_fallback import array
 
 from enthought.traits.api import HasTraits
-from openmdao.lib.datatypes.api import Enum, Float
-from openmdao.main.interfaces import implements, IDifferentiator
+from openmdao.lib.datatypes.api import Bool, Enum, Float, Int
+from openmdao.lib.components.external_code import ExternalCode
+from openmdao.main.api import Assembly, FileRef
+from openmdao.main.interfaces import implements, IDifferentiator, IDriver
 from openmdao.main.container import find_name
+from openmdao.main.mp_support import has_interface, is_instance
 
 
+# The FiniteDifference whose points are run by this worker process. It is
+# set by the pool initializer in each forked worker, never in the parent.
+_WORKER_FD = None
+
+def _init_pool_worker(fd):
+    """Initializes a forked worker process."""
+    
+    global _WORKER_FD
+    _WORKER_FD = fd
+
+def _run_pool_point(data_param):
+    """Runs a single point in a worker process."""
+    
+    return _WORKER_FD._run_point(data_param)
+
+
+def _split_vector(data, names, vector):
+    """Stores the constraint values from an evaluated constraint vector in
+    data under the given constraint names. Array constraints get an array
+    of values."""
+    
+    values, violated, offsets = vector
+    if len(values) == len(names):
+        data.update(zip(names, values))
+    else:
+        for i, name in enumerate(names):
+            data[name] = values[offsets[i]:offsets[i+1]]
+
 def diff_1st_central(fp, fm, eps):
     """Evaluates a first order central difference."""
     
@@ -48,6 +81,16 @@ class FiniteDifference(HasTraits):
     default_stepsize = Float(1.0e-6, iotype='in', desc='Default finite ' + \
                              'difference step size.')
     
+    sequential = Bool(True, iotype='in', desc='If True, run the ' + \
+                      'finite difference points sequentially. Otherwise ' + \
+                      'run them concurrently in forked copies of the ' + \
+                      'model, which must not contain components that ' + \
+                      'use files or drivers with recorders.')
+    
+    max_workers = Int(0, low=0, iotype='in', desc='Maximum number of ' + \
+                      'worker processes used when not sequential. Zero ' + \
+                      'means one per CPU.')
+    
     def __init__(self):
         
         # This gets set in the callback
@@ -156,12 +199,6 @@ class FiniteDifference(HasTraits):
             else:
                 stepsize[key] = self.default_stepsize
 
-        # For Forward or Backward diff, we want to save the baseline
-        # objective and constraints. These are also needed for the
-        # on-diagonal Hessian terms, so we will save them in the class
-        # later.
-        base_data = self._run_point(base_param)
-        
         # Set up problem based on Finite Difference type
         if self.form == 'central':
             deltas = [1, -1]
@@ -188,13 +225,20 @@ class FiniteDifference(HasTraits):
             self.gradient_case[param] = pcase
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
-        for key, case in self.gradient_case.iteritems():
+        # For Forward or Backward diff, we want to save the baseline
+        # objective and constraints. These are also needed for the
+        # on-diagonal Hessian terms, so we will save them in the class
+        # later.
+        pcases = [pcase for case in self.gradient_case.values()
+                        for ipcase, pcase in enumerate(case) if deltas[ipcase]]
+        data = self._run_points([base_param] + \
+                                [pcase['param'] for pcase in pcases])
+        base_data = data[0]
+        for pcase, pdata in zip(pcases, data[1:]):
+            pcase['data'] = pdata
+        for case in self.gradient_case.values():
             for ipcase, pcase in enumerate(case):
-                if deltas[ipcase]:
-                    pcase['data'] = self._run_point(pcase['param'])
-                else:
+                if not deltas[ipcase]:
                     pcase['data'] = base_data
                 
         
@@ -259,8 +303,6 @@ class FiniteDifference(HasTraits):
             # Pull initial state from driver's parameters
             for key, item in self._parent.get_parameters().iteritems():
                 base_param[key] = item.evaluate()
-                    
-            base_data = self._run_point(base_param)
             
         # Assemble input data
         # Cases : ondiag [fp, fm]
@@ -299,11 +341,10 @@ class FiniteDifference(HasTraits):
             self.hessian_offdiag_case[param1] = offdiag
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
         
         # We don't need to re-run on-diag cases if the gradients were
         # calculated with Central Difference.
+        pcases = []
         if reuse_first and self.form=='central':
             for key, case in self.hessian_ondiag_case.iteritems():
                 
@@ -314,15 +355,21 @@ class FiniteDifference(HasTraits):
                     pcase['data'] = gradient_ipcase['data'] 
         else:
             for case in self.hessian_ondiag_case.values():
-                for pcase in case:
-                    data = self._run_point(pcase['param'])
-                    pcase['data'] = data
+                pcases.extend(case)
 
         # Off-diag cases must always be run.
         for cases in self.hessian_offdiag_case.values():
             for case in cases.values():
-                for pcase in case:
-                    pcase['data'] = self._run_point(pcase['param'])
+                pcases.extend(case)
+                
+        params = [pcase['param'] for pcase in pcases]
+        if not reuse_first:
+            params.insert(0, base_param)
+        data = self._run_points(params)
+        if not reuse_first:
+            base_data = data.pop(0)
+        for pcase, pdata in zip(pcases, data):
+            pcase['data'] = pdata
 
                     
         # Calculate Hessians - On Diagonal
@@ -362,6 +409,57 @@ class FiniteDifference(HasTraits):
                         self.hessian[key1][key2][name]
                     
     
+    def _run_points(self, data_params):
+        """Runs the model at each of the given points and returns a list of
+        the results. Unless `sequential` is True, the points are divided among
+        a pool of worker processes, each running its own forked copy of the
+        model, and the model in this process is left unchanged. The pool is
+        forked for each call so the workers start from the current state of
+        the model. This requires os.fork(), so the points are always run
+        sequentially on Windows, and also within a worker process."""
+        
+        if self.sequential or len(data_params) < 2 or \
+           not hasattr(os, 'fork') or \
+           multiprocessing.current_process().daemon:
+            return [self._run_point(data_param) for data_param in data_params]
+        
+        self._check_concurrent()
+        nworkers = min(self.max_workers or multiprocessing.cpu_count(),
+                       len(data_params))
+        pool = multiprocessing.Pool(nworkers, _init_pool_worker, (self,))
+        try:
+            data = pool.map(_run_pool_point, data_params)
+        except Exception:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+        return data
+    
+    def _check_concurrent(self):
+        """Raises an exception if the model can't safely be run in forked
+        copies. All copies share the current directory and any open files,
+        so components that use files, and drivers that record Cases, are
+        not allowed."""
+        
+        drivers = [self._parent]
+        while drivers:
+            for comp in drivers.pop().iteration_set():
+                if is_instance(comp, ExternalCode) or comp.directory or \
+                   [name for name in comp.list_inputs()+comp.list_outputs()
+                                 if isinstance(comp.get(name), FileRef)]:
+                    self.raise_exception("can't run concurrently, '%s' "
+                                         "uses files" % comp.get_pathname(),
+                                         RuntimeError)
+                if has_interface(comp, IDriver) and comp.recorders:
+                    self.raise_exception("can't run concurrently, '%s' "
+                                         "records Cases" % comp.get_pathname(),
+                                         RuntimeError)
+                if is_instance(comp, Assembly):
+                    drivers.append(comp.driver)
+    
     def _run_point(self, data_param):
         """Runs the model at a single point and captures the results. Note that 
         some differences require the baseline point."""
@@ -375,26 +473,17 @@ class FiniteDifference(HasTraits):
         data = {}
 
         # Get Objectives
-        for key, item in self._parent.get_objectives().iteritems():
-            data[key] = item.evaluate(self._parent.parent)
+        data.update(zip(self.objective_names, self._parent.eval_objectives()))
 
         # Get Inequality Constraints
         if self.ineqconst_names:
-            for key, item in self._parent.get_ineq_constraints().iteritems():
-                val = item.evaluate(self._parent.parent)
-                if '>' in val[2]:
-                    data[key] = val[1]-val[0]
-                else:
-                    data[key] = val[0]-val[1]
+            vector = self._parent.eval_ineq_constraint_vector()
+            _split_vector(data, self.ineqconst_names, vector)
         
         # Get Equality Constraints
         if self.eqconst_names:
-            for key, item in self._parent.get_eq_constraints().iteritems():
-                val = item.evaluate(self._parent.parent)
-                if '>' in val[2]:
-                    data[key] = val[1]-val[0]
-                else:
-                    data[key] = val[0]-val[1]
+            vector = self._parent.eval_eq_constraint_vector()
+            _split_vector(data, self.eqconst_names, vector)
         
         return data
                     
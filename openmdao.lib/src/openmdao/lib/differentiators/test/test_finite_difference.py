@@ -159,6 +159,50 @@ class FiniteDifferenceTestCase(unittest.TestCase):
         #assert_rel_error(self, hess[0][1], 4.0, .001)
         #assert_rel_error(self, hess[1][0], 4.0, .001)
         
+    def test_concurrent(self):
+        
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+        fd = self.model.driver.differentiator
+        fd.default_stepsize = .001
+        fd.calc_gradient()
+        fd.calc_hessian(reuse_first=True)
+        expected_grad = fd.get_gradient('comp.v')
+        expected_hess = fd.get_Hessian('comp.y')
+        
+        # sequential runs leave the model at the last point
+        fd.reset_state()
+        fd.sequential = False
+        fd.max_workers = 2
+        fd.calc_gradient()
+        fd.calc_hessian(reuse_first=True)
+        for val, expected in zip(fd.get_gradient('comp.v'), expected_grad):
+            assert_rel_error(self, val, expected, .000001)
+        for val, expected in zip(fd.get_Hessian('comp.y'), expected_hess):
+            assert_rel_error(self, val, expected, .000001)
+        assert_rel_error(self, fd.get_derivative('Con1', wrt='comp.u'), 
+                         15.0, .001)
+        
+        fd.calc_hessian()
+        assert_rel_error(self, fd.get_2nd_derivative('comp.y', 
+                                                     wrt=('comp.u', 'comp.u')),
+                         18.0, .001)
+        
+        # the model in this process is not perturbed
+        self.assertEqual(self.model.comp.x, 1.0)
+        self.assertEqual(self.model.comp.u, 1.0)
+        
+        # components that use files can't be run concurrently
+        self.model.comp.directory = '.'
+        try:
+            fd.calc_gradient()
+        except RuntimeError as err:
+            self.assertEqual(str(err), "driver: differentiator: can't run "
+                             "concurrently, 'comp' uses files")
+        else:
+            self.fail('RuntimeError expected')
+        
     def test_reset_state(self):
         
         self.model.driver.form = 'central'
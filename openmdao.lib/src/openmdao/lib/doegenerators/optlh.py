@@ -22,8 +22,7 @@ from random import randint, shuffle
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, size, sum, floor, zeros
-    from numpy.linalg import norm
+    from numpy import array, size, sum, floor, zeros, newaxis, triu_indices, inf
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -85,6 +84,9 @@ class LatinHypercube(object):
         self.p = p
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
+        self._dist = None # p-th power of distance between each pair of points
+        self._phi_sum = None # sum of distance**(-q) over all pairs of points
+        self._phi_scale = None # magnitude of terms in updates to _phi_sum
     
     @property
     def shape(self):
@@ -95,34 +97,51 @@ class LatinHypercube(object):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
-            
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
-    
-            distinct_d = array(distdict.keys())
-            
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-            
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            if self._phi_sum is None:
+                n = self.doe.shape[0]
+                dist = self._distances()[triu_indices(n, 1)]
+                self._phi_sum = sum(dist**(-self.q/float(self.p)))
+                self._phi_scale = self._phi_sum
+            self.phi = self._phi_sum**(1.0/self.q)
         
         return self.phi
     
+    def _distances(self):
+        """Returns an n by n array of the p-th power of the p-norm distance
+        between each pair of points in the DOE.
+        """
+        if self._dist is None:
+            n = self.doe.shape[0]
+            dist = zeros((n, n))
+            for col in self.doe.T:
+                dist += abs(col[:, newaxis] - col)**self.p
+            self._dist = dist
+        return self._dist
+    
+    def _rows_sum(self, dist, el1, el2):
+        """Returns the sum of distance**(-q) over all pairs of points that
+        include point `el1` or point `el2`.
+        """
+        exponent = -self.q/float(self.p)
+        total = 0.
+        for row in (el1, el2):
+            d = dist[row].copy()
+            d[row] = inf  # contributes zero
+            total += sum(d**exponent)
+        return total - dist[el1, el2]**exponent  # counted twice
+    
     def perturb(self, mutation_count):
-        """ Interchanges pairs of randomly chosen elements within randomly chosen
+        """ Interchanges pairs of randomly chosen elements within randomly chosen
         columns of a doe a number of times. The result of this operation will also 
-        be a Latin hypercube.
+        be a Latin hypercube. Only the distances from the two points involved
+        in each interchange are recalculated.
         """
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        self.mmphi()
+        dist = self._distances().copy()
+        phi_sum = self._phi_sum
+        scale = self._phi_scale
         for count in range(mutation_count): 
             col = randint(0, k-1)
             
@@ -132,10 +151,28 @@ class LatinHypercube(object):
             while el1==el2: 
                 el2 = randint(0, n-1)
            
-            new_doe[el1, col] = self.doe[el2, col]
-            new_doe[el2, col] = self.doe[el1, col] 
+            if phi_sum is not None:
+                removed = self._rows_sum(dist, el1, el2)
+            new_doe[el1, col], new_doe[el2, col] = \
+                new_doe[el2, col], new_doe[el1, col]
+            for row in (el1, el2):
+                dist[row] = sum(abs(new_doe - new_doe[row])**self.p, axis=1)
+                dist[:, row] = dist[row]
+            if phi_sum is not None:
+                added = self._rows_sum(dist, el1, el2)
+                phi_sum += added - removed
+                # Rounding errors accumulate in proportion to the size of
+                # the terms updated, so recalculate from scratch before
+                # they become significant.
+                scale += added + removed
+                if not scale < 1e4*phi_sum:
+                    phi_sum = None
                
-        return LatinHypercube(new_doe, self.q, self.p)
+        lh = LatinHypercube(new_doe, self.q, self.p)
+        lh._dist = dist
+        lh._phi_sum = phi_sum
+        lh._phi_scale = scale
+        return lh
     
     def __iter__(self):
         return self._get_rows()
@@ -7,6 +7,7 @@ import unittest
 import random
 
 from numpy import array, zeros
+from numpy.linalg import norm
 
 from openmdao.main.api import Assembly, Component, Case, set_as_top
 from openmdao.lib.doegenerators.optlh import LatinHypercube, OptLatinHypercube, _mmlhs, \
@@ -24,6 +25,23 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi(self):
+        for q in (1, 2, 10):
+            for p in (1, 2):
+                lh = LatinHypercube(rand_latin_hypercube(10,3), q, p)
+                n = lh.shape[0]
+                expected = sum([norm(lh[i]-lh[j], ord=p)**(-q)
+                                for i in range(n)
+                                for j in range(i+1, n)])**(1.0/q)
+                self.assertAlmostEqual(lh.mmphi(), expected, places=10)
+                
+                # Perturbed hypercubes update phi incrementally.
+                for i in range(10):
+                    lh = lh.perturb(3)
+                    self.assertTrue(is_latin_hypercube(lh))
+                    fresh = LatinHypercube(lh.doe, q, p)
+                    self.assertAlmostEqual(lh.mmphi(), fresh.mmphi(), places=10)
+        
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_sample_points = 10
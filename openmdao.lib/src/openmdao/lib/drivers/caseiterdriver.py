@@ -3,6 +3,8 @@
 
 """
 
+import cPickle
+import hashlib
 import os.path
 import Queue
 import sys
@@ -10,7 +12,7 @@ import thread
 import threading
 import traceback
 
-from openmdao.main.datatypes.api import Bool, Enum, Int, Slot
+from openmdao.main.datatypes.api import Bool, Enum, Float, Int, Slot
 
 from openmdao.main.api import Driver
 from openmdao.main.exceptions import RunStopped, TracedError, traceback_str
@@ -26,6 +28,7 @@ from openmdao.main.hasparameters import HasParameters
 _EMPTY     = 'empty'
 _LOADING   = 'loading'
 _EXECUTING = 'executing'
+_BATCHING  = 'batching'
 
 class _ServerError(Exception):
     """ Raised when a server thread has problems. """
@@ -51,6 +54,24 @@ class CaseIterDriverBase(Driver):
     max_retries = Int(1, low=0, iotype='in',
                       desc='Maximum number of times to retry a failed case.')
 
+    batch_size = Int(1, low=1, iotype='in',
+                     desc='Number of cases sent to a server at a time during'
+                          ' concurrent evaluation.')
+
+    prefetch = Int(0, low=0, iotype='in',
+                   desc='Number of additional batches of cases queued to'
+                        ' each server during concurrent evaluation.')
+
+    keep_servers = Bool(False, iotype='in',
+                        desc='If True, keep the servers used for concurrent'
+                             ' evaluation (and their loaded models) between'
+                             ' executions. The model is only replicated again'
+                             ' if its configuration changes.')
+
+    idle_timeout = Float(0., low=0., iotype='in', units='s',
+                         desc='Time kept servers may be idle before they are'
+                              ' shut down. Zero implies no timeout.')
+
     def __init__(self, *args, **kwargs):
         super(CaseIterDriverBase, self).__init__(*args, **kwargs)
         self.extra_reqs = {}  # Extra resource requirements (unusual)
@@ -62,6 +83,7 @@ class CaseIterDriverBase(Driver):
         self._egg_file = None
         self._egg_required_distributions = None
         self._egg_orphan_modules = None
+        self._config_hash = None  # Configuration saved in the egg.
 
         self._reply_q = None  # Replies from server threads.
         self._server_lock = None  # Lock for server data.
@@ -80,6 +102,64 @@ class CaseIterDriverBase(Driver):
         self._todo = []   # Cases grabbed during server startup.
         self._rerun = []  # Cases that failed and should be retried.
         self._generation = 0  # Used to keep worker names unique.
+        self._idle_timer = None  # Shuts down kept servers.
+
+    def __getstate__(self):
+        """ Return dict representing this driver's state. """
+        state = super(CaseIterDriverBase, self).__getstate__()
+        # Kept servers and their threads can't be saved.
+        state['_reply_q'] = None
+        state['_server_lock'] = None
+        state['_servers'] = {}
+        state['_top_levels'] = {}
+        state['_server_info'] = {}
+        state['_queues'] = {}
+        state['_idle_timer'] = None
+        state['_config_hash'] = None
+        return state
+
+    def _keep_servers_changed(self, old, new):
+        """
+        Shut down kept servers when `keep_servers` is reset.
+        If a run is in progress they are shut down when it completes.
+        """
+        if not new and not self._busy():
+            self.shutdown_servers()
+
+    def pre_delete(self):
+        """ Shut down any kept servers. """
+        self.shutdown_servers()
+        super(CaseIterDriverBase, self).pre_delete()
+
+    def _stop_idle_timer(self):
+        """ Stop idle timeout (waits for a shutdown already in progress). """
+        timer = self._idle_timer
+        self._idle_timer = None
+        if timer is not None:
+            timer.cancel()
+            timer.join()
+
+    def shutdown_servers(self):
+        """
+        Shut down any servers kept for concurrent evaluation (see
+        `keep_servers`) and remove the egg file they were loaded from.
+        """
+        timer = self._idle_timer
+        self._idle_timer = None
+        if timer is not None:
+            timer.cancel()
+        if self._queues:
+            self._shutdown_servers()
+        self._reply_q = None
+        self._server_lock = None
+        self._servers = {}
+        self._top_levels = {}
+        self._server_info = {}
+        self._queues = {}
+        self._config_hash = None
+        if self._egg_file and os.path.exists(self._egg_file):
+            os.remove(self._egg_file)
+            self._egg_file = None
 
     def execute(self):
         """
@@ -117,7 +197,8 @@ class CaseIterDriverBase(Driver):
                 self._logger.info('Start concurrent evaluation.')
                 self._start()
         finally:
-            self._cleanup(remove_egg)
+            # Kept servers need the egg to detect reloads.
+            self._cleanup(remove_egg and not self.keep_servers)
 
         if self._stop:
             if self._abort_exc is None:
@@ -156,8 +237,19 @@ class CaseIterDriverBase(Driver):
 
         replicate: bool
              If True, then replicate the model and save to an egg file
-             first (for concurrent evaluation).
+             first (for concurrent evaluation).  If `keep_servers` is set,
+             replication is skipped if the model configuration hasn't
+             changed since it was last replicated.
         """
+        self._stop_idle_timer()
+        config_hash = None
+        if self.keep_servers and not self.sequential:
+            config_hash = self._get_config_hash()
+            if replicate and config_hash is not None and \
+               config_hash == self._config_hash and \
+               self._egg_file and os.path.exists(self._egg_file):
+                replicate = False
+
         self._cleanup(remove_egg=replicate)
 
         if not self.sequential:
@@ -190,6 +282,7 @@ class CaseIterDriverBase(Driver):
                 self._egg_file = egg_info[0]
                 self._egg_required_distributions = egg_info[1]
                 self._egg_orphan_modules = [name for name, path in egg_info[2]]
+                self._config_hash = config_hash
 
         self._iter = self.get_case_iterator()
         
@@ -197,6 +290,39 @@ class CaseIterDriverBase(Driver):
         """Returns a new iterator over the Case set."""
         raise NotImplementedError('get_case_iterator')
 
+    def _get_config_hash(self):
+        """
+        Returns a digest of the names, types, connections, and input values
+        of the components in our workflow (recursively), or None if some
+        value can't be pickled.
+        """
+        digest = hashlib.md5()
+        try:
+            digest.update(cPickle.dumps(sorted(self.parent.list_connections()),
+                                        cPickle.HIGHEST_PROTOCOL))
+            for name in self.workflow.get_names():
+                self._hash_container(getattr(self.parent, name), digest)
+        except Exception as exc:
+            self._logger.debug('configuration hash failed: %s', exc)
+            return None
+        return digest.hexdigest()
+
+    def _hash_container(self, container, digest):
+        """ Update `digest` with `container` configuration. """
+        cls = type(container)
+        digest.update('%s.%s' % (cls.__module__, cls.__name__))
+        if hasattr(container, 'list_inputs'):
+            for name in sorted(container.list_inputs()):
+                digest.update(name)
+                digest.update(cPickle.dumps(container.get(name),
+                                            cPickle.HIGHEST_PROTOCOL))
+        if hasattr(container, 'list_connections'):
+            digest.update(cPickle.dumps(sorted(container.list_connections()),
+                                        cPickle.HIGHEST_PROTOCOL))
+        for name in sorted(container.list_containers()):
+            digest.update(name)
+            self._hash_container(getattr(container, name), digest)
+
     def _start(self):
         """ Start evaluating cases concurrently. """
         # Need credentials in case we're using a PublicKey server.
@@ -215,11 +341,30 @@ class CaseIterDriverBase(Driver):
             msg = 'No servers supporting required resources %s' % resources
             self.raise_exception(msg, RuntimeError)
 
-        # Kick off initial wave of cases.
-        self._server_lock = threading.Lock()
-        self._reply_q = Queue.Queue()
+        self._stop_idle_timer()
+
+        # Kick off initial wave of cases, first using any kept servers.
+        if self._queues:
+            for name in sorted(self._queues.keys()):
+                if not self._more_to_go():
+                    break
+                try:
+                    self._todo.append(self._iter.next())
+                except StopIteration:
+                    if not self._rerun:
+                        self._iter = None
+                        break
+                self._logger.debug('reusing worker %r', name)
+                self._server_cases[name] = None
+                self._server_states[name] = _EMPTY
+                self._load_failures[name] = 0
+                self._in_use[name] = self._server_ready(name)
+        else:
+            self._server_lock = threading.Lock()
+            self._reply_q = Queue.Queue()
         self._generation += 1
-        n_servers = 0
+        n_servers = len(self._queues)
+        started = []
         while n_servers < max_servers:
             if not self._more_to_go():
                 break
@@ -236,6 +381,7 @@ class CaseIterDriverBase(Driver):
             n_servers += 1
             name = '%s_%d_%d' % (self.name, self._generation, n_servers)
             self._logger.debug('starting worker for %r', name)
+            started.append(name)
             self._servers[name] = None
             self._in_use[name] = True
             self._server_cases[name] = None
@@ -272,14 +418,14 @@ class CaseIterDriverBase(Driver):
         if sys.platform == 'win32':  #pragma no cover
             # Don't start server processing until all servers are started,
             # otherwise we have egg removal issues.
-            for name in self._in_use.keys():
+            for name in started:
                 name, result, exc = self._reply_q.get()
                 if self._servers[name] is None:
                     self._logger.debug('server startup failed for %r', name)
                     self._in_use[name] = False
 
             # Kick-off started servers.
-            for name in self._in_use.keys():
+            for name in started:
                 if self._in_use[name]:
                     self._in_use[name] = self._server_ready(name)
 
@@ -313,7 +459,17 @@ class CaseIterDriverBase(Driver):
             else:
                 self._in_use[name] = self._server_ready(name)
 
-        # Shut-down (started) servers.
+        if self.keep_servers:
+            if self.idle_timeout > 0 and self._queues:
+                self._idle_timer = threading.Timer(self.idle_timeout,
+                                                   self.shutdown_servers)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+        else:
+            self._shutdown_servers()
+
+    def _shutdown_servers(self):
+        """ Shut-down (started) servers. """
         self._logger.debug('Shut-down (started) servers')
         for queue in self._queues.values():
             queue.put(None)
@@ -339,14 +495,20 @@ class CaseIterDriverBase(Driver):
         Cleanup internal state, and egg file if necessary.
         Note: this happens unconditionally, so it will cause issues
               for workers which haven't shut down by now.
+              Kept servers are retained unless `keep_servers` was reset.
         """
-        self._reply_q = None
-        self._server_lock = None
-
-        self._servers = {}
-        self._top_levels = {}
-        self._server_info = {}
-        self._queues = {}
+        busy = self._busy()  # Only if the run was interrupted.
+        if self._queues and not busy and not self.keep_servers:
+            self.shutdown_servers()
+
+        if busy or not self._queues:
+            self._reply_q = None
+            self._server_lock = None
+
+            self._servers = {}
+            self._top_levels = {}
+            self._server_info = {}
+            self._queues = {}
         self._in_use = {}
         self._server_states = {}
         self._server_cases = {}
@@ -356,7 +518,7 @@ class CaseIterDriverBase(Driver):
         self._todo = []
         self._rerun = []
 
-        if self._egg_file and os.path.exists(self._egg_file):
+        if remove_egg and self._egg_file and os.path.exists(self._egg_file):
             os.remove(self._egg_file)
             self._egg_file = None
 
@@ -387,7 +549,10 @@ class CaseIterDriverBase(Driver):
         elif state == _LOADING:
             exc = self._model_status(server)
             if exc is None:
-                in_use = self._start_next_case(server, stepping)
+                if self._batching(server):
+                    in_use = self._dispatch_batches(server, loaded=True)
+                else:
+                    in_use = self._start_next_case(server, stepping)
             else:
                 self._logger.debug('    exception while loading: %r', exc)
                 if self.error_policy == 'ABORT':
@@ -433,6 +598,21 @@ class CaseIterDriverBase(Driver):
             # Set up for next case.
             in_use = self._start_processing(server, stepping, reload=True)
 
+        elif state == _BATCHING:
+            cases, excs = self._server_cases[server].pop(0)
+            # Cases not run due to an abort are in `cases` but not `excs`.
+            for case, exc in zip(cases, excs):
+                if case.msg is not None:
+                    self._logger.debug('    exception in batch: %s', case.msg)
+                    if self.error_policy == 'ABORT':
+                        if self._abort_exc is None:
+                            self._abort_exc = exc
+                        self._stop = True
+                self._record_case(case)
+
+            # Keep server's queue full.
+            in_use = self._dispatch_batches(server)
+
         # Just being defensive, should never happen.
         else:  #pragma no cover
             msg = 'unexpected state %r for server %r' % (state, server)
@@ -505,8 +685,64 @@ class CaseIterDriverBase(Driver):
                 in_use = self._run_case(case, server)
         return in_use
 
-    def _run_case(self, case, server, rerun=False):
-        """ Setup and start a case. Returns True if started. """
+    def _batching(self, server):
+        """ Return True if cases are sent to `server` in batches. """
+        return server is not None and (self.batch_size > 1 or self.prefetch)
+
+    def _next_batch(self):
+        """ Return list of up to `batch_size` cases ready to run. """
+        cases = []
+        while len(cases) < self.batch_size:
+            if self._todo:
+                case = self._todo.pop(0)
+                rerun = False
+            elif self._rerun:
+                case = self._rerun.pop(0)
+                rerun = True
+            elif self._iter is None:
+                break
+            else:
+                try:
+                    case = self._iter.next()
+                except StopIteration:
+                    self._iter = None
+                    break
+                rerun = False
+            self._prepare_case(case, rerun)
+            cases.append(case)
+        return cases
+
+    def _dispatch_batches(self, server, loaded=False):
+        """
+        Queue batches of cases to `server` until `prefetch` batches are
+        waiting behind the one being run. If `loaded`, the model was just
+        loaded, so the first case doesn't need a reload.
+        Returns True if the server has any batches outstanding.
+        """
+        pending = self._server_cases[server]
+        if pending is None:
+            pending = self._server_cases[server] = []
+        while len(pending) <= self.prefetch and self._more_to_go():
+            cases = self._next_batch()
+            if not cases:
+                break
+            excs = []
+            pending.append((cases, excs))
+            self._logger.debug('    run batch of %d', len(cases))
+            self._queues[server].put((self._remote_run_batch,
+                                      (server, cases, excs, loaded)))
+            loaded = False
+
+        if pending:
+            self._server_states[server] = _BATCHING
+            return True
+        self._logger.debug('    no more cases')
+        self._server_cases[server] = None
+        self._server_states[server] = _EMPTY
+        return False
+
+    def _prepare_case(self, case, rerun):
+        """ Reset `case` status before running it. """
         if not rerun:
             if not case.max_retries:
                 case.max_retries = self.max_retries
@@ -514,6 +750,10 @@ class CaseIterDriverBase(Driver):
         case.msg = None
         case.parent_uuid = self._case_id
 
+    def _run_case(self, case, server, rerun=False):
+        """ Setup and start a case. Returns True if started. """
+        self._prepare_case(case, rerun)
+
         try:
             for event in self.get_events(): 
                 try: 
@@ -606,6 +846,9 @@ class CaseIterDriverBase(Driver):
     def _remote_load_model(self, server):
         """ Load model into remote server. """
         egg_file = self._server_info[server].get('egg_file', None)
+        if egg_file is self._egg_file and not self.reload_model and \
+           self._top_levels.get(server) is not None:
+            return  # Kept server already has this model loaded.
         if egg_file is None or egg_file is not self._egg_file:
             # Only transfer if changed.
             try:
@@ -668,6 +911,42 @@ class CaseIterDriverBase(Driver):
                                self._server_info[server]['pid'],
                                self._server_info[server]['host'], exc)
 
+    def _remote_run_batch(self, request):
+        """
+        Run a batch of cases back-to-back in remote server, using a single
+        call to the server. Each case run is replaced by the server's copy,
+        holding its outputs, and its exception (or None) is appended to the
+        batch's list.
+        """
+        server, cases, excs, loaded = request
+        try:
+            results = self._servers[server].run_cases(
+                          self._egg_file, cases, self.get_events(),
+                          self.reload_model, loaded,
+                          self.error_policy == 'ABORT')
+        except Exception as exc:
+            self._logger.error('Caught exception from server %r, PID %d on %s: %r',
+                               self._server_info[server]['name'],
+                               self._server_info[server]['pid'],
+                               self._server_info[server]['host'], exc)
+            exc = TracedError(exc, traceback.format_exc())
+            for case in cases:
+                case.msg = str(exc)
+                excs.append(exc)
+                if self.error_policy == 'ABORT':
+                    break
+            return
+
+        for i, (case, error) in enumerate(results):
+            cases[i] = case
+            if error is not None:
+                exc = TracedError(RuntimeError(case.msg), error)
+            else:
+                exc = None
+                if case.msg is not None:
+                    case.msg = '%s: %s' % (self.get_pathname(), case.msg)
+            excs.append(exc)
+
     def _model_status(self, server):
         """ Return execute status from model. """
         return self._exceptions[server]
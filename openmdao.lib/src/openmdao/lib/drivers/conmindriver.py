@@ -395,12 +395,9 @@ class CONMINdriver(DriverUsesDerivatives):
             self.cnmn1.obj = self.eval_objective()
 
             # update constraint value array
-            for i, v in enumerate(self.get_ineq_constraints().values()):
-                val = v.evaluate(self.parent)
-                if '>' in val[2]:
-                    self.constraint_vals[i] = val[1]-val[0]
-                else:
-                    self.constraint_vals[i] = val[0]-val[1]
+            if self.cnmn1.ncon > 0:
+                values = self.eval_ineq_constraint_vector()[0]
+                self.constraint_vals[:self.cnmn1.ncon] = values
                 
             #self._logger.debug('constraints = %s'%self.constraint_vals)
                 
@@ -12,21 +12,60 @@ except ImportError:
 except NotImplementedError:
     multiprocessing.cpu_count = lambda: 1
     
-from pyevolve import G1DList, GAllele, GenomeBase, Scaling
+from pyevolve import G1DList, GAllele, GenomeBase, Scaling, GPopulation
 from pyevolve import GSimpleGA, Selectors, Initializators, Mutators, Consts
 
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.datatypes.api import Python, Enum, Float, Int, Bool, Slot
 
 from openmdao.main.api import Driver 
+from openmdao.main.case import Case
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasevents import HasEvents
 from openmdao.util.decorators import add_delegate
 from openmdao.util.typegroups import real_types, int_types, iterable_types
+from openmdao.lib.casehandlers.listcaserecorder import ListCaseRecorder
+from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 
 array_test = re.compile("(\[[0-9]+\])+$")
 
+
+class _Population(GPopulation.GPopulation):
+    """A GPopulation which lets a :class:`Genetic` driver evaluate all of its
+    members at once, before they are evaluated one by one."""
+
+    def evaluate(self, **args):
+        for func in self.oneSelfGenome.evaluator.funcList:
+            driver = getattr(func, 'im_self', None)
+            if isinstance(driver, Genetic):
+                driver._evaluate_population(self)
+        GPopulation.GPopulation.evaluate(self, **args)
+
+
+class _PopulationEvaluator(CaseIterDriverBase):
+    """Concurrently runs a :class:`Genetic` driver's workflow for a list of
+    cases."""
+
+    def __init__(self, *args, **kwargs):
+        super(_PopulationEvaluator, self).__init__(*args, **kwargs)
+        self.cases = []
+
+    def get_case_iterator(self):
+        """Returns a new iterator over the Case set."""
+        return iter(self.cases)
+
+
+def _genome_key(genome):
+    """Returns the fitness cache key for `genome`, or None if its genes
+    aren't hashable."""
+    key = tuple(genome)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 @add_delegate(HasParameters, HasObjective,HasEvents)
 class Genetic(Driver):
     """Genetic algorithm for the OpenMDAO framework, based on the Pyevolve
@@ -78,8 +117,16 @@ class Genetic(Driver):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
     
+    sequential = Bool(True, iotype="in",
+                      desc="If True, evaluate population members one at a "
+                           "time. Otherwise the members of each generation "
+                           "are evaluated concurrently, using servers "
+                           "obtained from the ResourceAllocationManager.")
+    
     def __init__(self, doc=None):
         super(Genetic, self).__init__(doc)
+        self._fitness = {}  # Objective values keyed by chromosome.
+        self._population_evaluator = None
     
     def _make_alleles(self): 
         """ Returns a GAllelle.Galleles instance with alleles corresponding to 
@@ -125,7 +172,7 @@ class Genetic(Driver):
         
         genome = G1DList.G1DList(len(alleles))
         genome.setParams(allele=alleles)
-        genome.evaluator.set(self._run_model)
+        genome.evaluator.set(self._evaluate)
         
         genome.mutator.set(Mutators.G1DListMutatorAllele)
         genome.initializator.set(Initializators.G1DListInitializatorAllele)
@@ -135,6 +182,20 @@ class Genetic(Driver):
         # Genetic Algorithm Instance
         #print self.seed
         
+        # GSimpleGA creates its populations via this module attribute, so
+        # _Population is installed there only while this run evolves.
+        original = GSimpleGA.GPopulation
+        GSimpleGA.GPopulation = _Population
+        try:
+            self._evolve(genome)
+        finally:
+            GSimpleGA.GPopulation = original
+            if self._population_evaluator is not None:
+                self._population_evaluator.shutdown_servers()
+                self._population_evaluator = None
+        
+    def _evolve(self, genome):
+        """Configure and run the genetic algorithm."""
         #configuring the options
         ga = GSimpleGA.GSimpleGA(genome, interactiveMode = False, 
                                  seed=self.seed)
@@ -153,6 +214,18 @@ class Genetic(Driver):
         #setting the selector for the algorithm
         ga.selector.set(self._selection_mapping[self.selection_method])
         
+        self._fitness = {}
+        if not self.sequential:
+            evaluator = _PopulationEvaluator()
+            evaluator.name = '%s_population' % self.name
+            evaluator.parent = self.parent
+            evaluator.workflow = self.workflow.__class__(evaluator)
+            evaluator.workflow.add(self.workflow.get_names())
+            evaluator.sequential = False
+            evaluator.keep_servers = True  # Reuse between generations.
+            evaluator.reload_model = False
+            self._population_evaluator = evaluator
+        
         #GO
         ga.evolve(freq_stats=0)
 
@@ -161,6 +234,55 @@ class Genetic(Driver):
         #run it once to get the model into the optimal state
         self._run_model(self.best_individual) 
         
+    def _evaluate(self, chromosome):
+        """Pyevolve evaluator. Chromosomes which have already been
+        evaluated (duplicates, or elites carried over from the last
+        generation) aren't run again."""
+        key = _genome_key(chromosome)
+        try:
+            return self._fitness[key]
+        except KeyError:
+            fitness = self._run_model(chromosome)
+            if key is not None:
+                self._fitness[key] = fitness
+            return fitness
+        
+    def _evaluate_population(self, population):
+        """If not sequential, evaluate the members of `population` which
+        aren't in the fitness cache concurrently and add them to the
+        cache."""
+        evaluator = self._population_evaluator
+        if evaluator is None:
+            return
+        
+        objective = self.get_objectives().values()[0].text
+        keys = {}
+        pending = set()
+        cases = []
+        for genome in population:
+            key = _genome_key(genome)
+            if key is None or key in self._fitness or key in pending:
+                continue
+            pending.add(key)
+            label = str(len(cases))
+            keys[label] = key
+            case = self.set_parameters([val for val in genome], 
+                                       Case(outputs=[objective], label=label,
+                                            parent_uuid=self._case_id))
+            for varname in self.get_events(): 
+                case.add_input(varname, True)
+            cases.append(case)
+        if not cases:
+            return
+        
+        results = ListCaseRecorder()
+        evaluator.cases = cases
+        evaluator.recorders = [results]
+        evaluator.execute()
+        for case in results.cases:
+            if case.msg is None:
+                self._fitness[keys[case.label]] = case[objective]
+        
     def _run_model(self, chromosome):
         self.set_parameters([val for val in chromosome])
         self.run_iteration()
@@ -138,13 +138,9 @@ def user_function(info, x, obj, dobj, ddobj, g, dg, n2, n3, n4, imode, driver):
             obj = driver.eval_objective()
         
         # evaluate constraint functions
-        if info == 2:
-            for i, v in enumerate(driver.get_ineq_constraints().values()):
-                val = v.evaluate(driver.parent)
-                if '>' in val[2]:
-                    g[i] = val[0]-val[1]
-                else:
-                    g[i] = val[1]-val[0]
+        if info == 2 and driver.contrl.ntce > 0:
+            # NEWSUMT wants constraints to be positive when satisfied
+            g[:driver.contrl.ntce] = -driver.eval_ineq_constraint_vector()[0]
 
     elif info == 3 :
         # evaluate the first and second order derivatives
@@ -196,6 +196,53 @@ class TestCase(unittest.TestCase):
         self.run_cases(sequential=False, forced_errors=True, retry=False)
         self.run_cases(sequential=False, forced_errors=True, retry=True)
 
+    def test_batching(self):
+        logging.debug('')
+        logging.debug('test_batching')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.batch_size = 3
+        self.model.driver.prefetch = 1
+        self.run_cases(sequential=False)
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=False)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+        self.model.driver.reload_model = False
+        self.generate_cases()
+        self.run_cases(sequential=False)
+
+    def test_keep_servers(self):
+        logging.debug('')
+        logging.debug('test_keep_servers')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.keep_servers = True
+        self.model.driver.reload_model = False
+        self.run_cases(sequential=False)
+        servers = self.model.driver._servers.copy()
+        egg_file = self.model.driver._egg_file
+        self.assertTrue(servers)
+        self.assertTrue(os.path.exists(egg_file))
+
+        # Same configuration, servers and egg are reused.
+        self.generate_cases()
+        self.run_cases(sequential=False)
+        self.assertTrue(self.model.driver._egg_file is egg_file)
+        for name, server in self.model.driver._servers.items():
+            if name in servers:
+                self.assertTrue(server is servers[name])
+
+        # Changed configuration, model is replicated again.
+        self.model.driven.y = [2., 2., 2., 2.]
+        self.generate_cases()
+        self.run_cases(sequential=False)
+        self.assertFalse(self.model.driver._egg_file is egg_file)
+        self.assertFalse(os.path.exists(egg_file))
+
+        egg_file = self.model.driver._egg_file
+        self.model.driver.shutdown_servers()
+        self.assertEqual(self.model.driver._servers, {})
+        self.assertFalse(os.path.exists(egg_file))
+
     def test_unencrypted(self):
         logging.debug('')
         logging.debug('test_unencrypted')
@@ -4,6 +4,7 @@ Test the genetic optimizer driver
 
 
 import logging
+import os
 import pkg_resources
 import sys
 import unittest
@@ -121,6 +122,55 @@ class TestCase(unittest.TestCase):
         self.assertEqual(y, 0)
         self.assertEqual(z, 0)
 
+    def test_fitness_cache(self):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        self.top.driver.mutation_rate = .02
+        self.top.driver.generations = 5
+        self.top.driver.elitism = True
+
+        self.top.run()
+
+        # Each distinct chromosome is run at most once, plus the final run
+        # of the best.
+        ndistinct = len(self.top.driver._fitness)
+        self.assertTrue(self.top.comp.exec_count <= ndistinct+1)
+        self.assertTrue(ndistinct < self.top.driver.population_size*6)
+
+    def test_optimizeSphere_concurrent(self):
+        # Need to be in this directory or there are issues with egg loading.
+        orig_dir = os.getcwd()
+        os.chdir(pkg_resources.resource_filename('openmdao.lib.drivers', 'test'))
+        try:
+            self.top.add('comp', SphereFunction())
+            self.top.driver.workflow.add('comp')
+            self.top.driver.add_objective("comp.total")
+
+            self.top.driver.add_parameter('comp.x')
+            self.top.driver.add_parameter('comp.y')
+            self.top.driver.add_parameter('comp.z')
+
+            self.top.driver.mutation_rate = .02
+            self.top.driver.population_size = 10
+            self.top.driver.generations = 1
+            self.top.driver.sequential = False
+
+            self.top.run()
+        finally:
+            os.chdir(orig_dir)
+
+        # Only the final run of the best individual is local.
+        self.assertTrue(self.top.comp.exec_count <= 1)
+        best = self.top.driver.best_individual
+        self.assertEqual(best.score, self.top.comp.total)
+        self.assertEqual(self.top.driver._population_evaluator, None)
+
     def test_optimizeSpherearray_nolowhigh(self):
         self.top.add('comp', SphereFunctionArray())
         self.top.driver.workflow.add('comp')
@@ -1,13 +1,14 @@
 """ Surrogate model based on Kriging. """
 
-from math import log, e, sqrt
 import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, zeros, dot, ones, arange, eye, abs, vstack, exp, diag
+    from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, diag, \
+                      log, sqrt, prod, atleast_2d, newaxis, maximum, triu_indices, \
+                      array_equal, append
     from numpy.linalg import det, linalg, lstsq
-    from scipy.linalg import cho_factor, cho_solve
+    from scipy.linalg import cho_factor, cho_solve, solve_triangular
     from scipy.optimize import fmin
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
@@ -49,55 +50,45 @@ class KrigingSurrogate(object):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = self._predict(new_x)
+        return NormalDistribution(f[0], RMSE[0])
+
+    def predict_batch(self,X):
+        """Calculates the predicted values of the response for each row of
+        inputs in `X`. Returns a tuple of arrays of the means and RMSEs of
+        the predictions.
+        """
+        return self._predict(X)
+
+    def _predict(self,X):
+        """Returns arrays of the means and RMSEs of the predictions for each
+        row of inputs in `X`, calculated for all of the points at once.
+        """
         if self.m == None: #untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
+        new_x = atleast_2d(array(X, dtype=float))
+        
+        # weighted squared distances from each new point to each training
+        # point, expanded so that no (points x n x m) temporary is needed
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i]-new_x)**2.)
-        r = exp(-r)
-            
-        one = ones(self.n)
+        XX = self._X
+        dist = dot(new_x**2, thetas)[:, newaxis] + \
+               dot(XX**2, thetas)[newaxis, :] - 2.*dot(new_x*thetas, XX.T)
+        r = exp(-maximum(dist, 0.)) # one row per new point
+        
         if self.R_fact is not None: 
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-            
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-            
+            Rinv_r = cho_solve(self.R_fact, r.T)
         else: 
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
+            Rinv_r = lstsq(self.R.T, r.T)[0]
             
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-      
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
+        f = self.mu + dot(r, self._Rinv_Y)
+        term1 = (r.T*Rinv_r).sum(axis=0)
+        term2 = (1.0 - dot(r, self._Rinv_one))**2./self._one_Rinv_one
         MSE = self.sig2*(1.0-term1+term2)
-        RMSE = sqrt(abs(MSE))
-        
-        return NormalDistribution(f, RMSE)
-        
+        return f, sqrt(abs(MSE))
 
     def train(self,X,Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -113,44 +104,121 @@ class KrigingSurrogate(object):
         self.Y = Y
         self.m = len(X[0])
         self.n = len(X)
+        
+        self._X = array(X, dtype=float)
+        self._Y = array(Y, dtype=float)
+        self._pair_dists = None
+        
+        best = {}
         thetas = zeros(self.m)
         def _calcll(thetas):
             self.thetas = thetas
             self._calculate_log_likelihood()
+            if not best or self.log_likelihood > best['log_likelihood']:
+                best.update(self._get_fit())
             return -self.log_likelihood
         #if self.thetas == None:
-        self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        if array_equal(thetas, best['thetas']):
+            # the optimum has already been evaluated, so don't factor R again
+            self.__dict__.update(best)
+        else:
+            self.thetas = thetas
+            self._calculate_log_likelihood()
+            
+    def add_training_point(self,x,y):
+        """Add a single training point to the trained model without 
+        re-optimizing thetas. Rather than factoring the new correlation 
+        matrix, the Cholesky factor of the old one is extended by a row for
+        the new point, unless that would make it ill-conditioned.
+        """
+        if self.m == None: #untrained surrogate
+            raise RuntimeError("KrigingSurrogate has not been trained, so no "
+                               "training point can be added")
+        x = array(x, dtype=float)
+        r = (1-self.nugget)*exp(-dot((self._X-x)**2, 10.**self.thetas))
+        n = self.n
+        
+        self._X = vstack([self._X, x])
+        self._Y = append(self._Y, y)
+        self.X, self.Y = self._X, self._Y
+        self.n = n+1
+        self._pair_dists = None
+        
+        R = eye(n+1)
+        R[:n,:n] = self.R
+        R[n,:n] = R[:n,n] = r
+        self.R = R
+        
+        if self.R_fact is not None:
+            c, lower = self.R_fact
+            # R = L L^T with L lower triangular, or U^T U with U upper 
+            # triangular. The factor of the bordered R has an extra row 
+            # (column of U) l = L^-1 r and diagonal sqrt(1 - l.l)
+            l = solve_triangular(c, r, trans=0 if lower else 1, lower=lower)
+            l_diag = 1.0 - dot(l, l)
+            if l_diag > 0:
+                c_new = zeros((n+1, n+1))
+                c_new[:n,:n] = c
+                if lower:
+                    c_new[n,:n] = l
+                else:
+                    c_new[:n,n] = l
+                c_new[n,n] = sqrt(l_diag)
+                self.R_fact = (c_new, lower)
+                self._solve()
+                return
+            
         self._calculate_log_likelihood()
+            
+    def _get_fit(self):
+        """Return a dict of the attributes set by _calculate_log_likelihood."""
+        return dict([(name, getattr(self, name)) for name in 
+                     ('thetas', 'R', 'R_fact', 'mu', 'sig2', 'log_likelihood',
+                      '_Rinv_Y', '_Rinv_one', '_one_Rinv_one')])
         
     def _calculate_log_likelihood(self):
         #if self.m == None:
         #    Give error message
-        R = zeros((self.n, self.n))
-        X,Y = array(self.X), array(self.Y)
+        if self._pair_dists is None:
+            # squared distances between each pair of training points don't
+            # depend on thetas, so they're calculated once for all likelihood
+            # evaluations
+            self._pairs = triu_indices(self.n, 1)
+            self._pair_dists = (self._X[self._pairs[0]]-self._X[self._pairs[1]])**2
         thetas = 10.**self.thetas
-        for i in range(self.n):
-            for j in arange(i+1,self.n):
-                R[i,j] = (1-self.nugget)*e**(-sum(thetas*(X[i]-X[j])**2.)) #weighted distance formula
+        R = zeros((self.n, self.n))
+        R[self._pairs] = (1-self.nugget)*exp(-dot(self._pair_dists, thetas)) #weighted distance formula
         R = R + R.T + eye(self.n)
         self.R = R
-        one = ones(self.n)
         try:
             self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            self.mu = dot(one,cho[0])/dot(one,cho[1])
-            self.sig2 = dot(Y-dot(one,self.mu),cho_solve(self.R_fact,(Y-dot(one,self.mu))))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
         except (linalg.LinAlgError,ValueError):
-            #------LSTSQ---------
             self.R_fact = None #reset this to none, so we know not to use cholesky
             #self.R = self.R+diag([10e-6]*self.n) #improve conditioning[Booker et al., 1999]
-            rhs = vstack([Y, one]).T
-            lsq = lstsq(self.R.T,rhs)[0].T
-            self.mu = dot(one,lsq[0])/dot(one,lsq[1])
-            self.sig2 = dot(Y-dot(one,self.mu),lstsq(self.R,Y-dot(one,self.mu))[0])/self.n
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
-            #print self.log_likelihood
\ No newline at end of file
+        self._solve()
+        
+    def _solve(self):
+        """Calculate mu, sig2 and the log likelihood using R and its Cholesky
+        factor, or least squares if R couldn't be factored.
+        """
+        Y = self._Y
+        one = ones(self.n)
+        rhs = vstack([Y, one]).T
+        if self.R_fact is not None:
+            sol = cho_solve(self.R_fact, rhs).T
+            # the determinant of R is the squared product of the diagonal of
+            # its Cholesky factor
+            det_R = prod(diag(self.R_fact[0]))**2
+        else:
+            #------LSTSQ---------
+            sol = lstsq(self.R.T,rhs)[0].T
+            det_R = det(self.R)
+            
+        self._Rinv_one = sol[1]
+        self._one_Rinv_one = dot(one,sol[1])
+        self.mu = dot(one,sol[0])/self._one_Rinv_one
+        self._Rinv_Y = sol[0] - self.mu*sol[1] # R^-1 (Y - mu)
+        self.sig2 = dot(Y-self.mu,self._Rinv_Y)/self.n
+        #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det_R+1.e-16))-sum(thetas)
+        self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det_R+1.e-16))
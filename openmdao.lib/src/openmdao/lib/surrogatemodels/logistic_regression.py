@@ -111,6 +111,15 @@ class LogisticRegression(HasTraits):
         
         return self.z*sigmoid(np.dot(self.betas,np.array(new_x)))+self.w
 
+    def predict_batch(self,X):
+        """Calculates the predicted values of the response for each row of
+        inputs in `X`. Returns an array of the predictions.
+        """
+        X = np.atleast_2d(X)
+        if self.degenerate: return np.ones(len(X))*self.degenerate
+        
+        return self.z*sigmoid(np.dot(X,self.betas))+self.w
+
     
     
     
@@ -3,7 +3,7 @@
 import unittest
 import random
 
-from numpy import array,round,linspace,sin,cos,pi
+from numpy import array,round,linspace,sin,cos,pi,array_equal
 import numpy.random as numpy_random
 
 from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
@@ -72,6 +72,52 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(14.513550,pred.sigma,places=2)
         self.assertAlmostEqual(18.759264,pred.mu,places=2)
         
+    def test_2d_kriging_batch(self):
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([(case[1]-case[0]**2/4.)**2 for case in x])
+        krig1 = KrigingSurrogate(x,y)
+        
+        new_x = array([[-2.,0.],[5.,5.],[0.,12.]])
+        mus, sigmas = krig1.predict_batch(new_x)
+        self.assertEqual(mus.shape, (3,))
+        self.assertEqual(sigmas.shape, (3,))
+        for point, mu, sigma in zip(new_x, mus, sigmas):
+            pred = krig1.predict(point)
+            self.assertAlmostEqual(pred.mu, mu, places=8)
+            self.assertAlmostEqual(pred.sigma, sigma, places=8)
+        self.assertAlmostEqual(y[0], mus[0], places=5)
+        
+        # a single point always gives a single prediction
+        pred = krig1.predict([[-2.,0.]])
+        self.assertTrue(isinstance(pred, NormalDistribution))
+        self.assertAlmostEqual(pred.mu, mus[0], places=8)
+        
+    def test_add_training_point(self):
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([(case[1]-case[0]**2/4.)**2 for case in x])
+        krig1 = KrigingSurrogate(x[:8],y[:8])
+        thetas = krig1.thetas
+        for case, val in zip(x[8:], y[8:]):
+            krig1.add_training_point(case, val)
+        self.assertEqual(krig1.n, 11)
+        self.assertTrue(array_equal(krig1.thetas, thetas))
+        self.assertAlmostEqual(y[9], krig1.predict(x[9]).mu, places=5)
+        
+        # same as fitting all of the points with the same thetas
+        krig2 = KrigingSurrogate(x[:8],y[:8])
+        krig2.X = krig2._X = x
+        krig2.Y = krig2._Y = y
+        krig2.n = 11
+        krig2._pair_dists = None
+        krig2._calculate_log_likelihood()
+        self.assertAlmostEqual(krig1.log_likelihood, krig2.log_likelihood, places=8)
+        pred1 = krig1.predict([5.,5.])
+        pred2 = krig2.predict([5.,5.])
+        self.assertAlmostEqual(pred1.mu, pred2.mu, places=8)
+        self.assertAlmostEqual(pred1.sigma, pred2.sigma, places=8)
+        
     def test_get_uncertain_value(self): 
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
@@ -39,6 +39,14 @@ class LogisticRegressionTest(unittest.TestCase):
         
         self.assertTrue(residual<1e-5)
         
+    def test_predict_batch(self):
+        lr = LogisticRegression(self.X_train, self.Y_train, alpha=.1)
+        
+        predictions = lr.predict_batch(self.X_train)
+        self.assertEqual(predictions.shape, (len(self.X_train),))
+        for x, pred in zip(self.X_train, predictions):
+            self.assertAlmostEqual(lr.predict(x), pred, places=10)
+        
     def test_uncertain_value(self): 
         lr = LogisticRegression()
         
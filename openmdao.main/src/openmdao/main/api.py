@@ -19,7 +19,7 @@ from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
 from openmdao.main.assembly import Assembly, dump_iteration_tree
 from openmdao.main.driver import Driver
 from openmdao.main.workflow import Workflow
-from openmdao.main.dataflow import Dataflow
+from openmdao.main.dataflow import Dataflow, ParallelDataflow
 from openmdao.main.seqentialflow import SequentialWorkflow
 from openmdao.main.variable import Variable
 
@@ -5,12 +5,13 @@
 __all__ = ['Assembly']
 
 import cStringIO
+import threading
 
 # pylint: disable-msg=E0611,F0401
 from enthought.traits.api import Missing
 
 from openmdao.main.interfaces import implements, IDriver
-from openmdao.main.container import find_trait_and_value
+from openmdao.main.container import Container, find_trait_and_value, _copydict
 from openmdao.main.component import Component
 from openmdao.main.variable import Variable
 from openmdao.main.datatypes.slot import Slot
@@ -21,6 +22,10 @@ from openmdao.main.mp_support import is_instance
 
 _iodict = { 'out': 'output', 'in': 'input' }
 
+# Serializes invalidation, which may be requested by Components running
+# concurrently in a ParallelDataflow.
+_invalidation_lock = threading.RLock()
+
 
 class PassthroughTrait(Variable):
     """A trait that can use another trait for validation, but otherwise is
@@ -66,9 +71,22 @@ class Assembly (Component):
     def __init__(self, doc=None, directory=''):
         super(Assembly, self).__init__(doc=doc, directory=directory)
         
+        # compiled input transfers keyed by destination component name
+        self._transfer_plans = {}
+        
         # default Driver executes its workflow once
         self.add('driver', Driver())
         
+    def __getstate__(self):
+        """Return dict representing this container's state."""
+        state = super(Assembly, self).__getstate__()
+        state.pop('_transfer_plans', None)
+        return state
+
+    def __setstate__(self, state):
+        super(Assembly, self).__setstate__(state)
+        self._transfer_plans = {}
+        
     def add(self, name, obj):
         """Call the base class *add*.  Then,
         if obj is a Component, add it to the component graph.
@@ -222,6 +240,7 @@ class Assembly (Component):
                                      (srcpath, destpath, str(err)), RuntimeError)
                     
         super(Assembly, self).connect(srcpath, destpath)
+        self._transfer_plans = {}
         
         # if it's an internal connection, could change dependencies, so we have
         # to call config_changed to notify our driver
@@ -257,6 +276,7 @@ class Assembly (Component):
         or removed, etc.
         """
         super(Assembly, self).config_changed(update_parent)
+        self._transfer_plans = {}
         # driver must tell workflow that config has changed because
         # dependencies may have changed
         if self.driver is not None:
@@ -329,13 +349,13 @@ class Assembly (Component):
         """
         parent = self.parent
         vset = set(varnames)
-        if compname[0] == '@':
-            destcomp = self
-        else:
-            destcomp = getattr(self, compname)
-        for srccompname,srcs,dests in self._depgraph.in_map(compname, vset):
+        for srccompname, srccomp, xfers in self._get_transfer_plan(compname):
+            matches = [xfers[name] for name in vset if name in xfers]
+            if not matches:
+                continue
             if srccompname == '@bin':   # boundary inputs
-                invalid_srcs = [s for s in srcs if not self._valid_dict[s]]
+                invalid_srcs = [m[0] for m in matches 
+                                     if not self._valid_dict[m[0]]]
                 if len(invalid_srcs) > 0:
                     if parent:
                         parent.update_inputs(self.name, invalid_srcs)
@@ -343,32 +363,18 @@ class Assembly (Component):
                     for name in invalid_srcs:
                         self._valid_dict[name] = True
                 srccompname = ''
-                srccomp = self
-                srcs = self._cvt_input_srcs(srcs)
-            else:
-                srccomp = getattr(self, srccompname)
-                if not srccomp.is_valid():
-                    srccomp.update_outputs(srcs)
+            elif not srccomp.is_valid():
+                srccomp.update_outputs([m[0] for m in matches])
             
-            # TODO: add multiget/multiset stuff here...
-            for src,dest in zip(srcs, dests):
+            for src, getname, srcname, getsrc, dest, setdest in matches:
                 try:
-                    srcval = srccomp.get_wrapped_attr(src)
+                    srcval = getsrc()
                 except Exception, err:
                     self.raise_exception(
                         "error retrieving value for %s from '%s': %s" %
-                        (src,srccompname,str(err)), type(err))
+                        (getname, srccompname, str(err)), type(err))
                 try:
-                    if srccomp is self:
-                        srcname = src
-                    else:
-                        srcname = '.'.join([srccompname, src])
-                    if destcomp is self:
-                        setattr(destcomp, dest, srcval)
-                    else:
-                        #destcomp.set(dest, srcval, src='parent.'+srcname)
-                        # don't need to do source checking here unless we've messed up our bookkeeping
-                        destcomp.set(dest, srcval, force=True)
+                    setdest(srcval)
                 except Exception, exc:
                     if compname[0] == '@':
                         dname = dest
@@ -377,6 +383,49 @@ class Assembly (Component):
                     msg = "cannot set '%s' from '%s': %s" % (dname, srcname, exc)
                     self.raise_exception(msg, type(exc))
             
+    def _get_transfer_plan(self, compname):
+        """Return the compiled list of input transfers into the named
+        component.  Each entry is a tuple of the form 
+        (srccompname, srccomp, transfers), where transfers maps each
+        connected destination variable name to a tuple of the form
+        (src, getname, srcname, getter, dest, setter). The getter returns the
+        (possibly wrapped) source value, and the setter validates and
+        sets it on the destination.  Plans are discarded whenever our
+        configuration or connections change.
+        """
+        try:
+            return self._transfer_plans[compname]
+        except KeyError:
+            pass
+        
+        if compname[0] == '@':
+            destcomp = self
+        else:
+            destcomp = getattr(self, compname)
+            
+        plan = []
+        for srccompname, link in self._depgraph.in_links(compname):
+            xfers = {}
+            for dest, src in link._dests.items():
+                if srccompname == '@bin':
+                    srccomp = self
+                    getname = srcname = self._cvt_input_srcs([src])[0]
+                else:
+                    srccomp = getattr(self, srccompname)
+                    getname = src
+                    if srccomp is self:
+                        srcname = src
+                    else:
+                        srcname = '.'.join([srccompname, src])
+                xfers[dest] = (src, getname, srcname, 
+                               _make_getter(srccomp, getname), dest,
+                               _make_setter(destcomp, dest, destcomp is self))
+            if xfers:
+                plan.append((srccompname, srccomp, xfers))
+            
+        self._transfer_plans[compname] = plan
+        return plan
+            
     def update_outputs(self, outnames):
         """Execute any necessary internal or predecessor components in order
         to make the specified output variables valid.
@@ -421,9 +470,11 @@ class Assembly (Component):
         """Invalidate all variables that depend on the outputs provided
         by the child that has been invalidated.
         """
-        bouts = self._depgraph.invalidate_deps(self, [childname], [outs], force)
-        if bouts and self.parent:
-            self.parent.child_invalidated(self.name, bouts, force)
+        with _invalidation_lock:
+            bouts = self._depgraph.invalidate_deps(self, [childname], [outs],
+                                                   force)
+            if bouts and self.parent:
+                self.parent.child_invalidated(self.name, bouts, force)
         return bouts
                     
     def invalidate_deps(self, varnames=None, force=False):
@@ -525,6 +576,49 @@ class Assembly (Component):
     
 
 
+# overrides of these disable the compiled fast paths below
+_GET_WRAPPED = Container.get_wrapped_attr.im_func
+_SET = Container.set.im_func
+
+def _make_getter(comp, name):
+    """Return a function that behaves like comp.get_wrapped_attr(name),
+    with the trait lookups done up front when possible.
+    """
+    if '.' in name or not isinstance(comp, Container) or \
+       type(comp).get_wrapped_attr.im_func is not _GET_WRAPPED:
+        return lambda: comp.get_wrapped_attr(name)
+    trait = comp.get_trait(name)
+    if trait is None:
+        return lambda: comp.get_wrapped_attr(name)
+    ttype = trait.trait_type
+    getwrapper = ttype.get_val_wrapper
+    copy = _copydict[ttype.copy] if ttype.copy else None
+    if getwrapper is None:
+        if copy is None:
+            return lambda: getattr(comp, name)
+        return lambda: copy(getattr(comp, name))
+    if copy is None:
+        return lambda: getwrapper(getattr(comp, name))
+    return lambda: getwrapper(copy(getattr(comp, name)))
+
+def _make_setter(comp, name, boundary):
+    """Return a function that sets the named destination variable of comp
+    the same way Assembly.update_inputs always has, skipping the path and
+    iotype lookups for simple local inputs.
+    """
+    if boundary:
+        return lambda val: setattr(comp, name, val)
+    if '.' not in name and isinstance(comp, Container) and \
+       type(comp).set.im_func is _SET:
+        try:
+            iotype = comp.get_iotype(name)
+        except Exception:
+            iotype = None
+        if iotype == 'in':
+            return lambda val: comp._set_input(name, val)
+    # don't need to do source checking here unless we've messed up our bookkeeping
+    return lambda val: comp.set(name, val, force=True)
+
 def dump_iteration_tree(obj):
     """Returns a text version of the iteration tree
     of an OpenMDAO object or hierarchy.  The tree
@@ -1,10 +1,11 @@
 
 from uuid import uuid1
+import ast
 import re
 import traceback
 from StringIO import StringIO
 
-from openmdao.main.expreval import ExprEvaluator
+from openmdao.main.expreval import ExprEvaluator, INDEX
 from openmdao.main.exceptions import TracedError
 
 class _Missing(object):
@@ -14,6 +15,37 @@ class _Missing(object):
 _namecheck_rgx = re.compile(
     '([_a-zA-Z][_a-zA-Z0-9]*)+(\.[_a-zA-Z][_a-zA-Z0-9]*)*')
 
+def _indexed_item(text):
+    """If `text` is a dotted name followed only by subscripts containing
+    literals, e.g., 'comp.x[3][1]', return the equivalent (name, index)
+    tuple accepted by Container.set_many and Container.get_many.
+    Otherwise return None.
+    """
+    try:
+        node = ast.parse(text, mode='eval').body
+    except SyntaxError:
+        return None
+    index = []
+    while isinstance(node, ast.Subscript):
+        if not isinstance(node.slice, ast.Index):
+            return None
+        try:
+            idx = ast.literal_eval(node.slice.value)
+        except ValueError:
+            return None
+        index[0:0] = [(INDEX, idx)]
+        node = node.value
+    if not index:
+        return None
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ('.'.join(parts[::-1]), index)
+
 class Case(object):
     """Contains all information necessary to specify an input *case*, i.e., a
     list of names for all inputs to the case and their values. The case names
@@ -193,7 +225,22 @@ class Case(object):
         to the specified scope.
         """
         scope._case_id = self.uuid
-        if self._exprs:
+        set_many = getattr(scope, 'set_many', None)
+        if set_many is not None:
+            # one call, and one round trip if scope is remote. Expressions
+            # that can't be sent as a (name, index) are set individually.
+            items = []
+            exprs = []
+            for name, value in self._inputs.items():
+                item = self._transfer_item(name)
+                if item is None:
+                    exprs.append((name, value))
+                else:
+                    items.append((item, value))
+            set_many(items)
+            for name, value in exprs:
+                self._exprs[name].set(value, scope)
+        elif self._exprs:
             for name,value in self._inputs.items():
                 expr = self._exprs.get(name)
                 if expr:
@@ -204,38 +251,51 @@ class Case(object):
             for name,value in self._inputs.items():
                 scope.set(name, value)
 
+    def _transfer_item(self, name):
+        """Return the name or (name, index) tuple to use for `name` with
+        Container.set_many or Container.get_many, or None if `name` is an
+        expression that must be evaluated here.
+        """
+        if self._exprs is None or name not in self._exprs:
+            return name
+        return _indexed_item(name)
+
     def update_outputs(self, scope, msg=None):
         """Update the value of all outputs in this Case, using the given scope.
         """
         self.msg = msg
         last_excpt = None
         if self._outputs is not None:
-            if self._exprs:
-                for name in self._outputs.keys():
-                    expr = self._exprs.get(name)
-                    try:
-                        if expr:
-                            self._outputs[name] = expr.evaluate(scope)
-                        else:
-                            self._outputs[name] = scope.get(name)
-                    except Exception as err:
-                        last_excpt = TracedError(err, traceback.format_exc())
-                        self._outputs[name] = _Missing
-                        if self.msg is None:
-                            self.msg = str(err)
-                        else:
-                            self.msg = self.msg + " %s" % err
-            else:
-                for name in self._outputs.keys():
-                    try:
+            names = self._outputs.keys()
+            get_many = getattr(scope, 'get_many', None)
+            if get_many is not None:
+                # one call, and one round trip if scope is remote. Expressions
+                # that can't be sent as a (name, index) are evaluated here.
+                items = [(name, self._transfer_item(name)) for name in names]
+                batch = [(name, item) for name, item in items
+                                      if item is not None]
+                try:
+                    values = get_many([item for name, item in batch])
+                except Exception:
+                    pass  # get them one at a time to report each failure
+                else:
+                    for (name, item), value in zip(batch, values):
+                        self._outputs[name] = value
+                    names = [name for name, item in items if item is None]
+            for name in names:
+                expr = self._exprs.get(name) if self._exprs else None
+                try:
+                    if expr:
+                        self._outputs[name] = expr.evaluate(scope)
+                    else:
                         self._outputs[name] = scope.get(name)
-                    except Exception as err:
-                        last_excpt = TracedError(err, traceback.format_exc())
-                        self._outputs[name] = _Missing
-                        if self.msg is None:
-                            self.msg = str(err)
-                        else:
-                            self.msg = self.msg + " %s" % err
+                except Exception as err:
+                    last_excpt = TracedError(err, traceback.format_exc())
+                    self._outputs[name] = _Missing
+                    if self.msg is None:
+                        self.msg = str(err)
+                    else:
+                        self.msg = self.msg + " %s" % err
         if last_excpt:
             raise last_excpt
             
@@ -39,7 +39,7 @@ from openmdao.main.filevar import FileRef
 from openmdao.main.datatypes.slot import Slot
 
 from openmdao.main.mp_support import ObjectManager, OpenMDAO_Proxy, is_instance, has_interface, CLASSES_TO_PROXY
-from openmdao.main.rbac import rbac
+from openmdao.main.rbac import rbac, remote_access
 
 from openmdao.util.log import Logger, logger, LOG_DEBUG
 from openmdao.util import eggloader, eggsaver, eggobserver
@@ -875,24 +875,7 @@ class Container(HasTraits):
                 if not force:
                     self._check_source(path, src)
                 if index is None:
-                    # bypass input source checking
-                    chk = self._input_check
-                    self._input_check = self._input_nocheck
-                    try:
-                        setattr(self, path, value)
-                    finally:
-                        self._input_check = chk
-                    # Note: This was done to make foo.bar = 3 behave the
-                    # same as foo.set('bar', 3).
-                    # Without this, the output of the comp was
-                    # always invalidated when you call set_parameters.
-                    # This meant that component was always executed
-                    # even when the inputs were unchanged.
-                    # _call_execute is set in the on-trait-changed
-                    # callback, so it's a good test for whether the
-                    # value changed.
-                    if hasattr(self, "_call_execute") and self._call_execute:
-                        self._input_updated(path)
+                    self._set_input(path, value)
                 else:  # array index specified
                     self._index_set(path, value, index)
             elif index:  # array index specified for output
@@ -900,6 +883,96 @@ class Container(HasTraits):
             else: # output
                 setattr(self, path, value)
 
+    def _transfer_item(self, item):
+        """Returns (path, index) for an item passed to :meth:`set_many` or
+        :meth:`get_many`. Only a simple dotted name or a (name, index) tuple
+        is accepted, since these methods may be called remotely and must not
+        evaluate arbitrary expressions. An index may only contain plain
+        hashable values, INDEX entries, or SLICE entries.
+        """
+        if isinstance(item, basestring):
+            path, index = item, None
+        elif isinstance(item, tuple) and len(item) == 2:
+            path, index = item
+        else:
+            self.raise_exception("'%s' is not a name or a (name, index) tuple"
+                                 % (item,), ValueError)
+        if isinstance(path, basestring):
+            match = _namecheck_rgx.match(path)
+        else:
+            match = None
+        if match is None or match.group() != path:
+            self.raise_exception("'%s' is not a valid variable name" % (path,),
+                                 ValueError)
+        if index is not None:
+            if not isinstance(index, list):
+                self.raise_exception("index for '%s' must be a list" % path,
+                                     ValueError)
+            for idx in index:
+                if isinstance(idx, tuple) and \
+                   (len(idx) == 0 or idx[0] not in (INDEX, SLICE)):
+                    self.raise_exception("invalid index: %s" % (idx,),
+                                         ValueError)
+        return path, index
+
+    @rbac(('owner', 'user'))
+    def set_many(self, items):
+        """Set the values of several Variables in a single call, which
+        takes just one round trip when called through a proxy.
+        
+        items: iterator of (path, value) tuples
+            A path is either a simple dotted name or a (name, index)
+            tuple, where index has the same form as in :meth:`set`.
+            Expressions are not allowed; callers must translate them
+            into get/set calls themselves.
+        """
+        items = [(self._transfer_item(path), value) for path, value in items]
+        for (path, index), value in items:
+            self.set(path, value, index)
+        
+    @rbac(('owner', 'user'))
+    def get_many(self, paths):
+        """Return a list of the values of several Variables, fetched in a
+        single call, which takes just one round trip when called through
+        a proxy.
+        
+        paths: iterator of str or (name, index) tuples
+            Each path has the same form as in :meth:`set_many`.
+            
+        A remote caller must use :meth:`get` for a :class:`FileRef`, since 
+        only that returns a proxy to it.
+        """
+        values = []
+        for path, index in [self._transfer_item(path) for path in paths]:
+            value = self.get(path, index)
+            if isinstance(value, FileRef) and remote_access():
+                self.raise_exception("'%s' is a FileRef and must be "
+                                     "retrieved with get()" % path, TypeError)
+            values.append(value)
+        return values
+
+    def _set_input(self, name, value):
+        """Set the input with the given local name, bypassing input source
+        checking.  Dependents are invalidated if the value actually changed.
+        """
+        chk = self._input_check
+        self._input_check = self._input_nocheck
+        try:
+            setattr(self, name, value)
+        finally:
+            self._input_check = chk
+        # Note: This was done to make foo.bar = 3 behave the
+        # same as foo.set('bar', 3).
+        # Without this, the output of the comp was
+        # always invalidated when you call set_parameters.
+        # This meant that component was always executed
+        # even when the inputs were unchanged.
+        # _call_execute is set in the on-trait-changed
+        # callback, so it's a good test for whether the
+        # value changed.
+        if hasattr(self, "_call_execute") and self._call_execute:
+            self._input_updated(name)
+
     def _process_index_entry(self, obj, idx):
         """Return a new object based on a starting object and some operation
         indicated by idx that can be either an index into a container, an 
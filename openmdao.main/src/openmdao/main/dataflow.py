@@ -1,12 +1,18 @@
 
+import Queue
+import sys
+import threading
+
 import networkx as nx
 from networkx.algorithms.components import strongly_connected_components
 
 from openmdao.main.seqentialflow import SequentialWorkflow
 from openmdao.main.interfaces import IDriver
+from openmdao.main.exceptions import RunStopped
 from openmdao.main.mp_support import has_interface
+from openmdao.main.rbac import get_credentials, set_credentials
 
-__all__ = ['Dataflow']
+__all__ = ['Dataflow', 'ParallelDataflow']
 
 class Dataflow(SequentialWorkflow):
     """
@@ -124,3 +130,131 @@ class Dataflow(SequentialWorkflow):
         
         self._collapsed_graph = collapsed_graph.subgraph(cnames-removes)
         return self._collapsed_graph
+
+
+class ParallelDataflow(Dataflow):
+    """
+    A Dataflow that runs Components having no dependencies between them
+    concurrently.  The collapsed dependency graph is partitioned into levels,
+    where every node in a level depends only on nodes in earlier levels.
+    Levels are run in order, and the members of each level are run on a pool
+    of worker threads, so wall time approaches the length of the critical
+    path of the workflow.
+
+    Input transfers are done by the calling thread before a level is
+    started.  Invalidation requested by a running Component, for instance
+    when `force_execute` is set or from within a sub-Assembly, is
+    serialized by the Assembly.  Components run in the same level must not
+    share mutable state.
+
+    The current directory is process-wide, and a Component that sets
+    `directory` changes it for every thread while it runs.  File-based
+    Components such as ExternalCode therefore cannot safely run in the same
+    level as any other Component; put them in a separate workflow or make
+    them depend on each other.
+    """
+
+    def __init__(self, parent=None, scope=None, members=None,
+                 max_workers=None):
+        """ Create an empty flow.
+
+        max_workers: int (optional)
+            Maximum number of Components run at the same time. If None, all
+            members of a level are run at once.
+        """
+        self.max_workers = max_workers
+        self._levels = None
+        super(ParallelDataflow, self).__init__(parent, scope, members)
+
+    def config_changed(self):
+        """Notifies the Workflow that its configuration (dependencies, etc.)
+        has changed.
+        """
+        super(ParallelDataflow, self).config_changed()
+        self._levels = None
+
+    def _get_levels(self):
+        """Return a list of lists of component names, where the components
+        in each list depend only on components in previous lists.
+        """
+        if self._levels is None:
+            graph = self._get_collapsed_graph()
+            depth = {}
+            levels = []
+            for name in self._get_topsort():
+                preds = graph.predecessors(name)
+                if preds:
+                    lev = max([depth[p] for p in preds]) + 1
+                else:
+                    lev = 0
+                depth[name] = lev
+                if lev == len(levels):
+                    levels.append([])
+                levels[lev].append(name)
+            self._levels = levels
+        return self._levels
+
+    def run(self, ffd_order=0, case_id=''):
+        """ Run the Components in this Workflow, running the members of
+        each dependency level concurrently.
+        """
+        self._stop = False
+        scope = self.scope
+        for level in self._get_levels():
+            comps = [getattr(scope, name) for name in level]
+            if len(comps) == 1:
+                comps[0].run(ffd_order=ffd_order, case_id=case_id)
+            else:
+                self._run_level(comps, ffd_order, case_id)
+            if self._stop:
+                raise RunStopped('Stop requested')
+
+    def _run_level(self, comps, ffd_order, case_id):
+        """Run a group of mutually independent Components concurrently.
+        The first exception raised by any of them is re-raised after all
+        of them have finished.
+        """
+        # Pull invalid inputs on this thread, so the workers' _pre_execute()
+        # finds no inputs to update. Any invalidation they do is serialized
+        # by Assembly.child_invalidated().
+        for comp in comps:
+            comp._pre_execute()
+
+        credentials = get_credentials()
+        request_q = Queue.Queue()
+        for comp in comps:
+            request_q.put(comp)
+
+        nworkers = len(comps)
+        if self.max_workers:
+            nworkers = min(nworkers, self.max_workers)
+
+        errors = []
+        workers = []
+        for i in range(nworkers):
+            worker = threading.Thread(target=self._service_loop,
+                                      args=(request_q, credentials, errors,
+                                            ffd_order, case_id))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+
+        if errors:
+            exc_info = errors[0]
+            raise exc_info[0], exc_info[1], exc_info[2]
+
+    def _service_loop(self, request_q, credentials, errors, ffd_order,
+                      case_id):
+        """ Each worker thread executes this until `request_q` is empty. """
+        set_credentials(credentials)
+        while not errors:
+            try:
+                comp = request_q.get_nowait()
+            except Queue.Empty:
+                break
+            try:
+                comp.run(ffd_order=ffd_order, case_id=case_id)
+            except Exception:
+                errors.append(sys.exc_info())
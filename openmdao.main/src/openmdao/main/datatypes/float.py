@@ -12,6 +12,7 @@ from sys import float_info
 from enthought.traits.api import Range
 from enthought.traits.api import Float as TraitFloat
 from openmdao.units import PhysicalQuantity
+from openmdao.units.units import get_conversion_tuple
 
 from openmdao.main.variable import Variable
 from openmdao.main.attrwrapper import AttrWrapper
@@ -172,12 +173,6 @@ class Float(Variable):
         if isinstance(value, UncertainDistribution):
             value = value.getvalue()
             
-        # FIXME: The try blocks testing whether the unit is bogus or undefined
-        # are generally redundant because that test is done at creation. HOWEVER
-        # you might have a case where it wasn't tested because it's technically
-        # not a float. NPSS wrapper may be such a case. A test needs to be 
-        # constructed to test these lines.
-
         # Note: benchmarking showed that this check does speed things up -- KTM
         if src_units == dst_units:
             try:
@@ -186,23 +181,14 @@ class Float(Variable):
                 self.error(obj, name, value)
 
         try:
-            pq = PhysicalQuantity(value, src_units)
-        except NameError:
-            raise NameError("while setting value of %s: undefined unit '%s'" %
-                             (src_units, name))
-        
-        try:
-            pq.convert_to_unit(dst_units)
-        except NameError:
-            raise NameError("undefined unit '%s' for variable '%s'" %
-                             (dst_units, name))
+            factor, offset = get_conversion_tuple(src_units, dst_units)
         except TypeError:
             msg = "%s: units '%s' are incompatible " % (name, src_units) + \
                    "with assigning units of '%s'" % (dst_units)
             raise TypeError(msg)
         
+        value = (value + offset) * factor
         try:
-            return self._validator.validate(obj, name, pq.value)
+            return self._validator.validate(obj, name, value)
         except Exception:
-            self.error(obj, name, pq.value)
-
+            self.error(obj, name, value)
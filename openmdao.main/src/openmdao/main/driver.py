@@ -3,6 +3,8 @@
 #public symbols
 __all__ = ["Driver"]
 
+import sys
+
 from networkx.algorithms.shortest_paths.generic import shortest_path
 from enthought.traits.api import List
 
@@ -235,6 +237,31 @@ class Driver(Component):
         """Called after each iteration."""
         self._continue = False  # by default, stop after one iteration
 
+    @rbac('*', 'owner')
+    def run(self, force=False, ffd_order=0, case_id=''):
+        """Run this Driver, then flush any recorders that buffer their Cases.
+        Recorders are flushed even if the run fails, so the Cases recorded
+        before the failure are kept.
+        """
+        try:
+            super(Driver, self).run(force, ffd_order, case_id)
+        except Exception:
+            exc_type, exc_value, exc_tb = sys.exc_info()
+            try:
+                self._flush_recorders()
+            except Exception as exc:
+                self._logger.error('Flushing recorders failed: %r', exc)
+            raise exc_type, exc_value, exc_tb
+        self._flush_recorders()
+
+    def _flush_recorders(self):
+        """Flush any recorders that buffer (or asynchronously record) their
+        Cases."""
+        for recorder in self.recorders:
+            flush = getattr(recorder, 'flush', None)
+            if flush is not None:
+                flush()
+
     def config_changed(self, update_parent=True):
         """Call this whenever the configuration of this Component changes,
         for example, children are added or removed or dependencies may have
@@ -9,6 +9,8 @@ import ast
 import copy
 import __builtin__
 
+from ordereddict import OrderedDict
+
 from openmdao.main.interfaces import IDriver
 
 # this dict will act as the local scope when we eval our expressions
@@ -31,6 +33,17 @@ else:
 
 _Missing = object()
 
+# Process-wide cache of compiled expression code, shared by all ExprEvaluators:
+# text -> (probe_names, {signature: entry}). The translation of an expression
+# depends on its scope only through scope.contains() of the names in
+# probe_names, so signature is the tuple of those results and entry is
+# (code, assignment_code, var_names, allow_set).
+_code_cache = {}
+_MAX_CODE_CACHE = 1000
+
+# Max number of scopes each ExprEvaluator keeps compiled code for.
+_MAX_SCOPES = 8
+
 
 # some constants used in the get/set downstream protocol
 INDEX = 0
@@ -106,7 +119,9 @@ class ExprTransformer(ast.NodeTransformer):
         if scope:
             parts = name.split('.',1)
             names = ['scope']
-            if scope.contains(parts[0]):
+            contained = scope.contains(parts[0])
+            self.expreval._probes[parts[0]] = contained
+            if contained:
                 self.expreval.var_names.add(name)
                 if len(parts) == 1: # short name, so just do a simple attr lookup on scope
                     names.append(name)
@@ -256,6 +271,8 @@ class ExprEvaluator(object):
     
     def __init__(self, text, scope=None):
         self._scope = None
+        self._scope_code = OrderedDict()
+        self._probes = {}
         self.scope = scope
         self._allow_set = False
         self.text = text
@@ -269,6 +286,7 @@ class ExprEvaluator(object):
     @text.setter
     def text(self, value):
         self._parse_needed = True
+        self._scope_code = OrderedDict()
         self._text = value
 
     @property
@@ -296,7 +314,7 @@ class ExprEvaluator(object):
         performed to see if the variable(s) in the expression actually
         exist.
         """
-        if self._parse_needed:
+        if self._parse_needed and not self._load_code():
             self._pre_parse()
         return self._allow_set
 
@@ -308,6 +326,7 @@ class ExprEvaluator(object):
         state['_code'] = None  # <type 'code'> won't pickle either.
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
+        state['_scope_code'] = None  # weakref keys and code values
         return state
 
     def __setstate__(self, state):
@@ -315,6 +334,7 @@ class ExprEvaluator(object):
         self.__dict__.update(state)
         if self._scope is not None:
             self._scope = weakref.ref(self._scope)
+        self._scope_code = OrderedDict()
         self._parse_needed = True  # force a reparse
 
     def _is_local(self, name):
@@ -352,6 +372,7 @@ class ExprEvaluator(object):
     def _parse(self):
         self._allow_set = True
         self.var_names = set()
+        self._probes = {}
         new_ast = ExprTransformer(self).visit(self._pre_parse())
         
         # compile the transformed AST
@@ -366,9 +387,59 @@ class ExprEvaluator(object):
             assign_ast = ExprTransformer(self).visit(root)
             ast.fix_missing_locations(assign_ast)
             self._assignment_code = compile(assign_ast,'<string>','exec')
+        else:
+            self._assignment_code = None
             
         self._parse_needed = False
+        self._save_code()
         return new_ast
+
+    def _save_code(self):
+        """Store our compiled code in the process-wide code cache and in
+        our cache for the current scope.
+        """
+        entry = (self._code, self._assignment_code,
+                 frozenset(self.var_names), self._allow_set)
+        names = tuple(sorted(self._probes))
+        signature = tuple([self._probes[name] for name in names])
+        if len(_code_cache) >= _MAX_CODE_CACHE:
+            _code_cache.clear()
+        _code_cache.setdefault(self.text, (names, {}))[1][signature] = entry
+        
+        if self._scope is not None:
+            self._add_scope_code(entry)
+
+    def _add_scope_code(self, entry):
+        """Make `entry` the most recently used code for the current scope,
+        dropping the least recently used scope if we have too many.
+        """
+        self._scope_code[self._scope] = entry
+        if len(self._scope_code) > _MAX_SCOPES:
+            self._scope_code.popitem(last=False)
+
+    def _load_code(self):
+        """Use previously compiled code for our text and scope if
+        available, either from our own per-scope cache or from the
+        process-wide code cache.  Returns True if compiled code was found.
+        """
+        scope = self.scope
+        if scope is None:
+            return False
+        entry = self._scope_code.pop(self._scope, None)
+        if entry is None:
+            try:
+                names, entries = _code_cache[self.text]
+            except KeyError:
+                return False
+            signature = tuple([scope.contains(name) for name in names])
+            entry = entries.get(signature)
+            if entry is None:
+                return False
+        self._add_scope_code(entry)
+        self._code, self._assignment_code, var_names, self._allow_set = entry
+        self.var_names = set(var_names)
+        self._parse_needed = False
+        return True
                 
     def _get_updated_scope(self, scope):
         oldscope = self.scope
@@ -386,7 +457,7 @@ class ExprEvaluator(object):
         global _expr_dict
         scope = self._get_updated_scope(scope)
         try:
-            if self._parse_needed:
+            if self._parse_needed and not self._load_code():
                 self._parse()
             return eval(self._code, _expr_dict, locals())
         except Exception, err:
@@ -403,7 +474,7 @@ class ExprEvaluator(object):
             # of the form  'somevar = _local_setter', so we set _local_setter here
             # and the exec call will pull it out of the locals dict
             _local_setter = val 
-            if self._parse_needed:
+            if self._parse_needed and not self._load_code():
                 self._parse()
             exec(self._assignment_code, _expr_dict, locals())
         else: # self._allow_set is False
@@ -432,7 +503,7 @@ class ExprEvaluator(object):
         *scope.parent* and based on the names of Variables referenced in our 
         expression string. 
         """
-        if self._parse_needed:
+        if self._parse_needed and not self._load_code():
             self._parse()
         return self.var_names
 
@@ -440,7 +511,7 @@ class ExprEvaluator(object):
         """Return a set of source or dest Component names based on the 
         pathnames of Variables referenced in our expression string. 
         """
-        if self._parse_needed:
+        if self._parse_needed and not self._load_code():
             self._parse()
         nameset = set()
         for name in self.var_names:
@@ -470,7 +541,7 @@ class ExprEvaluator(object):
         """
         scope = self.scope
         if scope: # and scope.parent:
-            if self._parse_needed:
+            if self._parse_needed and not self._load_code():
                 self._parse()
             #if not all(scope.parent.get_valid(self.var_names)):
             if not all(scope.get_valid(self.var_names)):
@@ -481,7 +552,7 @@ class ExprEvaluator(object):
         """Return True if all variables referenced by our expression can
         be resolved.
         """
-        if self._parse_needed:
+        if self._parse_needed and not self._load_code():
             self._parse()
         if len(self.var_names) > 0:
             scope = self.scope
@@ -4,9 +4,17 @@
 """
 
 # pylint: disable-msg=E0611,F0401
+import logging
 import operator
+import sys
 import ordereddict
 
+try:
+    from numpy import broadcast_arrays, concatenate, cumsum, repeat, \
+                      where, zeros
+except ImportError as err:
+    logging.warn("In %s: %r" % (__file__, err))
+
 from openmdao.main.expreval import ExprEvaluator
 
 _ops = {
@@ -17,6 +25,29 @@ _ops = {
     '=': operator.eq,
     }
 
+# Kinds of comparison used to find violations in a vector of constraint
+# values, where a positive value always points towards violation.
+_STRICT = 0
+_NONSTRICT = 1
+_EQUAL = 2
+
+_kinds = {
+    '>': _STRICT,
+    '<': _STRICT,
+    '>=': _NONSTRICT,
+    '<=': _NONSTRICT,
+    '=': _EQUAL,
+    }
+
+def _is_violated(comparator, lhs, rhs):
+    """Returns True unless the comparison holds for every entry of lhs and
+    rhs, which may be scalars or arrays.
+    """
+    satisfied = _ops[comparator](lhs, rhs)
+    if hasattr(satisfied, 'all'):
+        satisfied = satisfied.all()
+    return not satisfied
+
 def _check_expr(expr):
     """ force checking for existence of vars referenced in expression """
     if not expr.check_resolve():
@@ -50,9 +81,17 @@ class Constraint(object):
     def evaluate(self, scope):
         """Returns a tuple of the form (lhs, rhs, comparator, is_violated)."""
         
-        lhs = (self.lhs.evaluate(scope) + self.adder)*self.scaler
-        rhs = (self.rhs.evaluate(scope) + self.adder)*self.scaler
-        return (lhs, rhs, self.comparator, not _ops[self.comparator](lhs, rhs))
+        return self._evaluated(self.lhs.evaluate(scope),
+                               self.rhs.evaluate(scope))
+
+    def _evaluated(self, lhs, rhs):
+        """Returns the evaluate() tuple given unscaled values of both
+        sides.
+        """
+        lhs = (lhs + self.adder)*self.scaler
+        rhs = (rhs + self.adder)*self.scaler
+        return (lhs, rhs, self.comparator,
+                _is_violated(self.comparator, lhs, rhs))
         
     def get_referenced_compnames(self):
         return self.lhs.get_referenced_compnames().union(self.rhs.get_referenced_compnames())
@@ -94,6 +133,7 @@ class _HasConstraintsBase(object):
     def __init__(self, parent, allowed_types=None):
         self._parent = parent
         self._constraints = ordereddict.OrderedDict()
+        self._vector_expr = None
     
     def remove_constraint(self, key):
         """Removes the constraint with the given string."""
@@ -102,10 +142,76 @@ class _HasConstraintsBase(object):
         except KeyError:
             msg = "Constraint '%s' was not found. Remove failed." % key
             self._parent.raise_exception(msg, AttributeError)
+        self._vector_expr = None
             
     def clear_constraints(self):
         """Removes all constraints."""
         self._constraints = ordereddict.OrderedDict()
+        self._vector_expr = None
+
+    def _add(self, key, constraint):
+        """Stores a new constraint under the given key."""
+        self._constraints[key] = constraint
+        self._vector_expr = None
+
+    def _eval_all(self, scope=None):
+        """Evaluates all of our constraints with a single compiled expression
+        and returns a list of (lhs, rhs, comparator, is_violated) tuples.
+        """
+        scope = _get_scope(self, scope)
+        constraints = self._constraints.values()
+        if not constraints:
+            return []
+        if self._vector_expr is None:
+            sides = []
+            for cnst in constraints:
+                sides.append('(%s)' % cnst.lhs.text)
+                sides.append('(%s)' % cnst.rhs.text)
+            self._vector_expr = ExprEvaluator('(%s,)' % ','.join(sides), scope)
+        try:
+            vals = self._vector_expr.evaluate(scope)
+        except Exception:
+            # evaluate one at a time to report the constraint that failed
+            exc_info = sys.exc_info()
+            for cnst in constraints:
+                cnst.evaluate(scope)
+            raise exc_info[0], exc_info[1], exc_info[2]
+        return [cnst._evaluated(vals[2*i], vals[2*i+1])
+                for i, cnst in enumerate(constraints)]
+
+    def _eval_vector(self, scope=None):
+        """Evaluates all of our constraints in one pass and returns a
+        tuple of arrays of the form (values, violated, offsets). Array
+        valued constraints are flattened into values, which is lhs-rhs for
+        '<', '<=' and '=' and rhs-lhs for '>' and '>=', so a positive value
+        always points towards violation. violated holds the violation flag
+        of each entry of values, and the entries of constraint i are 
+        values[offsets[i]:offsets[i+1]].
+        """
+        results = self._eval_all(scope)
+        if not results:
+            return (zeros(0), zeros(0, bool), zeros(1, int))
+        
+        lhs = []
+        rhs = []
+        signs = []
+        kinds = []
+        sizes = []
+        for left, right, comparator, violated in results:
+            left, right = broadcast_arrays(left, right)
+            lhs.append(left.ravel())
+            rhs.append(right.ravel())
+            signs.append(-1. if '>' in comparator else 1.)
+            kinds.append(_kinds[comparator])
+            sizes.append(left.size)
+        values = (concatenate(lhs) - concatenate(rhs))*repeat(signs, sizes)
+        kinds = repeat(kinds, sizes)
+        offsets = concatenate(([0], cumsum(sizes)))
+        
+        violated = where(kinds == _STRICT, values >= 0.,
+                         where(kinds == _NONSTRICT, values > 0.,
+                               values != 0.))
+        return (values, violated, offsets)
         
     def list_constraints(self):
         """Return a list of strings containing constraint expressions."""
@@ -214,9 +320,9 @@ class HasEqConstraints(_HasConstraintsBase):
             
         constraint = Constraint(lhs, '=', rhs, scaler, adder, scope=_get_scope(self,scope))
         if name is None:
-            self._constraints[ident] = constraint
+            self._add(ident, constraint)
         else:
-            self._constraints[name] = constraint
+            self._add(name, constraint)
 
     def get_eq_constraints(self):
         """Returns an ordered dict of constraint objects."""
@@ -226,7 +332,16 @@ class HasEqConstraints(_HasConstraintsBase):
         """Returns a list of tuples of the 
         form (lhs, rhs, comparator, is_violated).
         """
-        return [c.evaluate(_get_scope(self,scope)) for c in self._constraints.values()]
+        return self._eval_all(scope)
+
+    def eval_eq_constraint_vector(self, scope=None):
+        """Evaluates all equality constraints in one pass and returns a
+        tuple of arrays of the form (values, violated, offsets), where
+        values holds lhs-rhs for each (flattened) constraint entry,
+        violated holds the corresponding violation flags, and the entries
+        of constraint i are values[offsets[i]:offsets[i+1]].
+        """
+        return self._eval_vector(scope)
     
     def allows_constraint_types(self, types):
         """Returns True if types is ['eq']."""
@@ -294,9 +409,9 @@ class HasIneqConstraints(_HasConstraintsBase):
             
         constraint = Constraint(lhs, rel, rhs, scaler, adder, scope=_get_scope(self,scope))
         if name is None:
-            self._constraints[ident] = constraint
+            self._add(ident, constraint)
         else:
-            self._constraints[name] = constraint
+            self._add(name, constraint)
         
     def get_ineq_constraints(self):
         """Returns an ordered dict of inequality constraint objects."""
@@ -304,7 +419,18 @@ class HasIneqConstraints(_HasConstraintsBase):
 
     def eval_ineq_constraints(self, scope=None): 
         """Returns a list of constraint values"""
-        return [c.evaluate(_get_scope(self,scope)) for c in self._constraints.values()]
+        return self._eval_all(scope)
+
+    def eval_ineq_constraint_vector(self, scope=None):
+        """Evaluates all inequality constraints in one pass and returns a
+        tuple of arrays of the form (values, violated, offsets), where
+        values holds lhs-rhs for '<' and '<=' and rhs-lhs for '>' and '>='
+        for each (flattened) constraint entry, so a positive value means
+        the constraint is violated. violated holds the corresponding
+        violation flags, and the entries of constraint i are
+        values[offsets[i]:offsets[i+1]].
+        """
+        return self._eval_vector(scope)
     
     def allows_constraint_types(self, typ):
         """Returns True if types is ['ineq']."""
@@ -411,6 +537,18 @@ class HasConstraints(object):
         """
         return self._ineq.eval_ineq_constraints(scope)
     
+    def eval_eq_constraint_vector(self, scope=None):
+        """Returns a tuple of arrays of the form (values, violated, offsets)
+        from evaluation of all equality constraints in one pass.
+        """
+        return self._eq.eval_eq_constraint_vector(scope)
+    
+    def eval_ineq_constraint_vector(self, scope=None):
+        """Returns a tuple of arrays of the form (values, violated, offsets)
+        from evaluation of all inequality constraints in one pass.
+        """
+        return self._ineq.eval_ineq_constraint_vector(scope)
+    
     def list_constraints(self):
         """Return a list of strings containing constraint expressions."""
         lst = self._ineq.list_constraints()
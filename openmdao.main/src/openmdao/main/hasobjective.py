@@ -1,4 +1,5 @@
 
+import sys
 import weakref
 import ordereddict
 
@@ -18,6 +19,7 @@ class HasObjectives(object):
         self._objectives = ordereddict.OrderedDict()
         self._max_objectives = max_objectives
         self._parent = parent
+        self._vector_expr = None
 
     def add_objectives(self, obj_iter, scope=None):
         """Takes an iterator of objective strings and creates
@@ -66,6 +68,7 @@ class HasObjectives(object):
             self._objectives[expr] = expreval
         else:
             self._objectives[name] = expreval
+        self._vector_expr = None
             
     def remove_objective(self, expr):
         """Removes the specified objective expression. Spaces within
@@ -78,6 +81,8 @@ class HasObjectives(object):
             self._parent.raise_exception("Trying to remove objective '%s' "
                                          "that is not in this driver." % expr,
                                          AttributeError)
+        self._vector_expr = None
+        
     def get_objectives(self):
         """Returns an OrderedDict of objective expressions."""
         return self._objectives
@@ -85,10 +90,27 @@ class HasObjectives(object):
     def clear_objectives(self):
         """Removes all objectives."""
         self._objectives = ordereddict.OrderedDict()
+        self._vector_expr = None
         
     def eval_objectives(self):
         """Returns a list of values of the evaluated objectives."""
-        return [obj.evaluate(self._get_scope()) for obj in self._objectives.values()]
+        scope = self._get_scope()
+        objectives = self._objectives.values()
+        if len(objectives) < 2:
+            return [obj.evaluate(scope) for obj in objectives]
+        
+        # evaluate all objectives with a single compiled expression
+        if self._vector_expr is None:
+            texts = ['(%s)' % obj.text for obj in objectives]
+            self._vector_expr = ExprEvaluator('(%s,)' % ','.join(texts), scope)
+        try:
+            return list(self._vector_expr.evaluate(scope))
+        except Exception:
+            # evaluate one at a time to report the objective that failed
+            exc_info = sys.exc_info()
+            for obj in objectives:
+                obj.evaluate(scope)
+            raise exc_info[0], exc_info[1], exc_info[2]
 
     def get_expr_depends(self):
         """Returns a list of tuples of the form (comp_name, parent_name)
@@ -1,7 +1,14 @@
+import re
 import ordereddict
 import weakref
 
+try:
+    from numpy import ndarray
+except ImportError:
+    ndarray = ()  # nothing is an instance of an empty tuple of types
+
 from openmdao.main.expreval import ExprEvaluator
+from openmdao.main.container import Container
 from openmdao.util.typegroups import real_types, int_types
 from openmdao.util.decorators import add_delegate
 
@@ -280,6 +287,104 @@ class ParameterGroup(object):
             result.update(param.get_referenced_varpaths())
         return result
 
+# matches parameter targets of the form comp.var or comp.var[index]
+_simple_target = re.compile(r'^([A-Za-z_]\w*)\.([A-Za-z_]\w*)(?:\[(\d+)\])?$')
+
+
+class _ParamSetters(object):
+    """Sets the values of a list of parameters into the model, bypassing
+    the generic :meth:`ExprEvaluator.set` for targets that are simple inputs,
+    ``comp.var``, or entries in a 1D input array, ``comp.var[i]``. Entries 
+    of the same array are set with a single numpy assignment (a slice
+    assignment if the entries are contiguous), and the array's component
+    is notified of the change once. All other targets are set by their
+    Parameter.
+    """
+    
+    def __init__(self, params, scope):
+        self.scope = scope
+        self.comps = {}
+        self.generic = []  # [(position, param)]
+        self.scalars = []  # [(position, param, comp, name)]
+        arrays = ordereddict.OrderedDict()  # (cname, name) -> [(i, param, idx)]
+        
+        for i, param in enumerate(params):
+            if isinstance(param, ParameterGroup):
+                targets = param._params
+            else:
+                targets = [param]
+            for target in targets:
+                match = _simple_target.match(target.target.replace(' ', ''))
+                comp = None
+                if match and scope is not None:
+                    cname, name, idx = match.groups()
+                    comp = getattr(scope, cname, None)
+                if not isinstance(comp, Container) or \
+                   self._get_iotype(comp, name) != 'in':
+                    self.generic.append((i, target))
+                elif idx is None:
+                    self.comps[cname] = comp
+                    self.scalars.append((i, target, comp, name))
+                elif isinstance(getattr(comp, name), ndarray) and \
+                     getattr(comp, name).ndim == 1:
+                    self.comps[cname] = comp
+                    arrays.setdefault((cname, name), []).append((i, target,
+                                                                 int(idx)))
+                else:
+                    self.generic.append((i, target))
+                    
+        self.arrays = []  # [(positions, params, comp, name, index)]
+        for (cname, name), entries in arrays.items():
+            entries.sort(key=lambda entry: entry[2])
+            indices = [entry[2] for entry in entries]
+            if indices == range(indices[0], indices[-1]+1):
+                index = slice(indices[0], indices[-1]+1)
+            else:
+                index = indices
+            self.arrays.append(([entry[0] for entry in entries],
+                                [entry[1] for entry in entries],
+                                self.comps[cname], name, index))
+                                
+    @staticmethod
+    def _get_iotype(comp, name):
+        try:
+            return comp.get_iotype(name)
+        except Exception:
+            return None
+        
+    def is_current(self, scope):
+        """Returns True if the components we set into are still the ones
+        found in `scope`.
+        """
+        if scope is not self.scope:
+            return False
+        for cname, comp in self.comps.items():
+            if getattr(scope, cname, None) is not comp:
+                return False
+        return True
+    
+    def set(self, values):
+        """Sets the given values, which are in parameter order."""
+        for i, param in self.generic:
+            param.set(values[i], self.scope)
+            
+        for i, param, comp, name in self.scalars:
+            comp._check_source(name, None)
+            comp._set_input(name, param._transform(values[i]))
+            
+        for positions, params, comp, name, index in self.arrays:
+            comp._check_source(name, None)
+            vals = [param._transform(values[i]) 
+                    for i, param in zip(positions, params)]
+            arr = getattr(comp, name)
+            if (arr[index] != vals).any():
+                arr[index] = vals
+                # as in Container._index_set(), setting array entries
+                # doesn't trigger _input_trait_modified, so do it here
+                comp._call_execute = True
+                comp._input_updated(name)
+
+
 class HasParameters(object): 
     """This class provides an implementation of the IHasParameters interface."""
 
@@ -290,6 +395,7 @@ class HasParameters(object):
         self._parameters = ordereddict.OrderedDict()
         self._parent = parent
         self._allowed_types = ['continuous']
+        self._setters = None
 
     def _override_param(self, param, low=None, high=None, 
                         scaler=None, adder=None, start=None,
@@ -354,6 +460,7 @@ class HasParameters(object):
         referenced. If they are not specified in the metadata and not provided
         as arguments, a ValueError is raised.
         """
+        self._setters = None
         if isinstance(target,Parameter): 
             self._parameters[target.name] = self._override_param(target, low, high, 
                                                                  scaler, adder, start,
@@ -419,6 +526,8 @@ class HasParameters(object):
             self._parent.raise_exception("Trying to remove parameter '%s' "
                                          "that is not in this driver." % (name,),
                                          AttributeError)
+        self._setters = None
+        
     def list_param_targets(self):
         """Returns a list of parameter targets. Note that this
         list may contain more entries than the list of Parameter and
@@ -432,6 +541,7 @@ class HasParameters(object):
     def clear_parameters(self):
         """Removes all parameters."""
         self._parameters = ordereddict.OrderedDict()
+        self._setters = None
         
     def get_parameters(self):
         """Returns an ordered dict of parameter objects."""
@@ -463,8 +573,12 @@ class HasParameters(object):
                              (len(values),len(self._parameters)))
 
         if case is None:
-            for val, param in zip(values, self._parameters.values()):
-                param.set(val, self._get_scope(scope))
+            scope = self._get_scope(scope)
+            setters = self._setters
+            if setters is None or not setters.is_current(scope):
+                setters = _ParamSetters(self._parameters.values(), scope)
+                self._setters = setters
+            setters.set(values)
         else:
             for val, parameter in zip(values, self._parameters.values()):
                 for target in parameter.targets:
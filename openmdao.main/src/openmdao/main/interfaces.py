@@ -402,7 +402,9 @@ class IUncertainVariable(Interface):
         """Generates a random number from an uncertain distribution."""
 
 class ICaseRecorder(Interface):
-    """A recorder of Cases."""
+    """A recorder of Cases. Recorders that buffer Cases may also provide a
+    flush() method, which Drivers call when they finish running.
+    """
     
     def record(case):
         """Record the given Case."""
@@ -488,6 +490,18 @@ class ISurrogate(Interface):
         Returns the predicted output value.
         """
 
+    def predict_batch(X):
+        """Predicts values from the surrogate model for many points at once.
+        This method is optional.
+        
+        X: 2D array
+            The input values, one row per point.
+            
+        Returns an array of the predicted output values, one per point. 
+        Surrogates whose predictions are NormalDistributions return a tuple 
+        of arrays of the means and standard deviations instead.
+        """
+
     def train(X, Y): 
         """Trains the surrogate model, based on the given training data set.
         
@@ -497,6 +511,17 @@ class ISurrogate(Interface):
             Training case output history for this surrogate's output,
             which corresponds to the training case input history given by X.
         """
+
+    def add_training_point(x, y):
+        """Updates the trained surrogate model with one more training point,
+        without repeating the work of a full training (e.g., optimization of
+        hyperparameters). This method is optional.
+        
+        x: list
+            Input values of the new training point.
+        y: 
+            Output value of the new training point.
+        """
     
 class IHasParameters(Interface):
     
@@ -598,6 +623,14 @@ class IHasEqConstraints(Interface):
         eval_ineq_constraints function used for inequality constraints.
         """
 
+    def eval_eq_constraint_vector():
+        """Evaluates all of the constraint expressions in one pass and
+        returns a tuple of arrays of the form (values, violated, offsets),
+        where values holds lhs-rhs for each entry of each constraint,
+        violated holds the corresponding violation flags, and the entries of
+        constraint i are values[offsets[i]:offsets[i+1]].
+        """
+
     
 class IHasIneqConstraints(Interface):
     """An Interface for objects containing inequality constraints."""
@@ -621,6 +654,15 @@ class IHasIneqConstraints(Interface):
         form (lhs, rhs, relation, is_violated).
         """
 
+    def eval_ineq_constraint_vector():
+        """Evaluates all of the constraint expressions in one pass and
+        returns a tuple of arrays of the form (values, violated, offsets),
+        where values holds lhs-rhs (or rhs-lhs for '>' and '>=') for each
+        entry of each constraint, so positive values are violated, violated
+        holds the corresponding violation flags, and the entries of
+        constraint i are values[offsets[i]:offsets[i+1]].
+        """
+
 class IHasConstraints(IHasEqConstraints, IHasIneqConstraints):
     """An Interface for objects containing both equality and inequality constraints."""
     
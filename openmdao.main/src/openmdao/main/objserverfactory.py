@@ -14,6 +14,7 @@ import signal
 import socket
 import sys
 import time
+import traceback
 
 from multiprocessing import current_process
 
@@ -480,6 +481,70 @@ class ObjServer(object):
         self.tlo = Container.load_from_eggfile(egg_filename)
         return self.tlo
 
+    @rbac('owner')
+    def run_cases(self, egg_filename, cases, events=None, reload_model=False,
+                  loaded=True, stop_on_error=False):
+        """
+        Run `cases` back-to-back against the model loaded from
+        `egg_filename` and return a list of ``(case, error)`` for each case
+        run, where `case` holds the case's outputs and error message. `error`
+        is None, or the traceback of an exception raised while loading or
+        running the model. This lets a driver run a batch of cases with a
+        single call.
+
+        egg_filename: string
+            Filename of egg the model is loaded from.
+
+        cases: list(:class:`Case`)
+            Cases to run.
+
+        events: list(string)
+            Names of events to set before running each case.
+
+        reload_model: bool
+            If True, reload the model before each case.
+
+        loaded: bool
+            If True, the model has just been loaded, so the first case
+            doesn't need a reload.
+
+        stop_on_error: bool
+            If True, stop after the first case that fails.
+        """
+        results = []
+        for case in cases:
+            error = None
+            try:
+                if self.tlo is None or (reload_model and not loaded):
+                    self.load_model(egg_filename)
+            except Exception as exc:
+                case.msg = str(exc)
+                error = traceback.format_exc()
+            else:
+                try:
+                    for event in events or []:
+                        self.tlo.set(event, True)
+                    case.apply_inputs(self.tlo)
+                except Exception as exc:
+                    case.msg = 'Exception setting case inputs: %s' % exc
+                else:
+                    try:
+                        self.tlo.run()
+                    except Exception as exc:
+                        case.msg = str(exc)
+                        error = traceback.format_exc()
+                    else:
+                        try:
+                            case.update_outputs(self.tlo)
+                        except Exception as exc:
+                            case.msg = 'Exception getting case outputs: %s' \
+                                       % exc
+            loaded = False
+            results.append((case, error))
+            if case.msg is not None and stop_on_error:
+                break
+        return results
+
     @rbac('owner')
     def pack_zipfile(self, patterns, filename):
         """
@@ -425,6 +425,20 @@ class AssemblyTestCase(unittest.TestCase):
         self.asm.run()
         self.assertEqual(comp2.r, 9.0)
         
+    def test_reconnect_new_source(self):
+        # compiled transfers must follow a change of source
+        comp2 = self.asm.comp2
+        self.asm.connect('comp1.rout', 'comp2.r')
+        self.asm.comp1.r = 2.0
+        self.asm.comp3.r = 4.0
+        self.asm.run()
+        self.assertEqual(comp2.r, 3.0)
+        
+        self.asm.disconnect('comp1.rout', 'comp2.r')
+        self.asm.connect('comp3.rout', 'comp2.r')
+        self.asm.run()
+        self.assertEqual(comp2.r, 6.0)
+        
     def test_input_passthrough_to_2_inputs(self):
         asm = set_as_top(Assembly())
         asm.add('nested', Assembly())
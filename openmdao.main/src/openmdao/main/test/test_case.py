@@ -56,6 +56,21 @@ class CaseTestCase(unittest.TestCase):
         self.assertFalse('comp1.z' in self.case)
         self.assertTrue('comp2.c+comp2.d' in self.case)
         
+    def test_expr_inputs(self):
+        case = Case(inputs=[('comp1.a_lst[1]', 9), ('comp1.a', 3)],
+                    outputs=['comp1.a_lst[1]*2', 'comp1.bogus'])
+        case.apply_inputs(self.top)
+        self.assertEqual(self.top.comp1.a_lst, [4,9,6])
+        self.assertEqual(self.top.comp1.a, 3)
+        try:
+            case.update_outputs(self.top)
+        except Exception:
+            pass
+        else:
+            self.fail('Exception expected')
+        # outputs that can be found are still updated
+        self.assertEqual(case['comp1.a_lst[1]*2'], 18)
+
     def test_len(self):
         self.assertEqual(len(self.case), 6)
 
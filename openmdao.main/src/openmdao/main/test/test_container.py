@@ -10,6 +10,7 @@ import copy
 from enthought.traits.api import HasTraits
 
 import openmdao.util.eggsaver as constants
+from openmdao.main.component import Component
 from openmdao.main.container import Container, get_default_name, \
                                     deep_hasattr, get_default_name, find_name, \
                                     find_trait_and_value, _get_entry_group, \
@@ -220,6 +221,46 @@ class ContainerTestCase(unittest.TestCase):
         num = self.root.get('c2.c22.c221.number')
         self.assertEqual(num, 3.14)
 
+    def test_set_get_many(self):
+        self.root.c1.add('lst', List([1,2,3], iotype='in'))
+        self.root.set_many([('c2.c22.c221.number', 2.5),
+                            ('c1.lst', [1,7,3])])
+        self.assertEqual(self.root.c2.c22.c221.number, 2.5)
+        self.assertEqual(self.root.c1.lst, [1,7,3])
+        self.assertEqual(self.root.get_many(['c2.c22.c221.number',
+                                             ('c1.lst', [(0, 1)])]),
+                         [2.5, 7])
+
+        # indexed set notifies the Component of the input change
+        comp = Component()
+        comp.add('lst', List([1,2,3], iotype='in'))
+        comp.set_many([(('lst', [1]), 9)])
+        self.assertEqual(comp.lst, [1,9,3])
+        self.assertEqual(comp.get_many([('lst', [(0, 1)])]), [9])
+
+        # expressions are never evaluated
+        for path in ["c1.lst[1]+1", "__import__('os').getcwd()",
+                     ('c1.lst', [(2, [], [])])]:
+            try:
+                self.root.get_many([path])
+            except ValueError:
+                pass
+            else:
+                self.fail('ValueError expected for %s' % (path,))
+        try:
+            self.root.set_many([("c1.lst[1]", 9)])
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError expected')
+        try:
+            self.root.get_many(['c2.c22.c221.number', 'c1.bogus'])
+        except AttributeError as err:
+            self.assertEqual(str(err),
+                             "c1: 'Container' object has no attribute 'bogus'")
+        else:
+            self.fail('AttributeError expected')
+
     def test_add_trait_w_subtrait(self):
         obj = Container()
         obj.add('lst', List([1,2,3], iotype='in'))
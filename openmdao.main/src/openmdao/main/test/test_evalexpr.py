@@ -508,6 +508,43 @@ class ExprEvalTestCase(unittest.TestCase):
         self.assertEqual(11.1, self.top.comp.y)
         self.assertEqual(self._ast_to_text(ex._parse()), "scope.get('comp.y')")
         
+    def test_code_cache(self):
+        self.top.comp.x = 99.5
+        self.top.a.f = 2.5
+
+        ex = ExprEvaluator('comp.x', self.top)
+        self.assertEqual(99.5, ex.evaluate())
+        code = ex._code
+
+        # alternating scopes reuses the code compiled for each scope
+        try:
+            ex.evaluate(self.top.a)
+        except AttributeError:
+            pass
+        else:
+            self.fail("AttributeError expected")
+        self.assertEqual(99.5, ex.evaluate(self.top))
+        self.assertTrue(ex._code is code)
+
+        # same text in an equivalent scope shares the compiled code
+        ex2 = ExprEvaluator('comp.x', self.top)
+        self.assertEqual(99.5, ex2.evaluate())
+        self.assertTrue(ex2._code is code)
+        self.assertEqual(ex2.get_referenced_varpaths(), set(['comp.x']))
+
+        # but not in a scope where the name resolves differently
+        ex3 = ExprEvaluator('f', self.top.a)
+        self.assertEqual(2.5, ex3.evaluate())
+        ex4 = ExprEvaluator('f', self.top)
+        self.assertFalse(ex4._load_code())
+
+        # changing the text discards the per-scope code
+        ex.text = 'comp.y'
+        ex.scope = self.top.a
+        ex.set(1.5, self.top)
+        self.assertEqual(1.5, self.top.comp.y)
+        self.assertFalse(ex._code is code)
+
     def test_no_scope(self):
         ex = ExprEvaluator('abs(-3)+int(2.3)+math.floor(5.4)')
         self.assertEqual(ex.evaluate(), 10.0)
@@ -2,11 +2,21 @@
 
 import unittest
 
-from openmdao.main.api import Assembly, Driver, set_as_top
+from numpy import array
+
+from openmdao.main.api import Assembly, Component, Driver, set_as_top
+from openmdao.main.datatypes.array import Array
 from openmdao.util.decorators import add_delegate
 from openmdao.main.hasconstraints import HasConstraints, HasEqConstraints, HasIneqConstraints, Constraint
 from openmdao.test.execcomp import ExecComp
 
+class ArrayComp(Component):
+    x = Array(array([1., 3., 5.]), iotype='in')
+    y = Array(array([2., 2., 2.]), iotype='out')
+    
+    def execute(self):
+        pass
+
 @add_delegate(HasConstraints)
 class MyDriver(Driver):
     pass
@@ -277,6 +287,62 @@ class HasConstraintsTestCase(unittest.TestCase):
         self._check_eq_eval_constraints(MyDriver())
         self._check_ineq_eval_constraints(MyDriver())
 
+    def test_eval_constraint_vector(self):
+        self.asm.add('comp2', ArrayComp())
+        drv = self.asm.add('driver', MyDriver())
+        self.asm.comp1.a = 4
+        self.asm.comp1.b = 5
+        self.asm.comp1.c = 9
+        self.asm.comp1.d = 9
+        drv.add_constraint('comp1.a < comp1.b')
+        drv.add_constraint('comp1.a > comp1.b', scaler=2.0)
+        drv.add_constraint('comp2.x <= comp2.y')
+        drv.add_constraint('comp1.c = comp1.d')
+        
+        values, violated, offsets = drv.eval_ineq_constraint_vector()
+        self.assertEqual(list(values), [-1., 2., -1., 1., 3.])
+        self.assertEqual(list(violated), [False, True, False, True, True])
+        self.assertEqual(list(offsets), [0, 1, 2, 5])
+        
+        vals = drv.eval_ineq_constraints()
+        self.assertEqual([val[3] for val in vals], [False, True, True])
+        
+        values, violated, offsets = drv.eval_eq_constraint_vector()
+        self.assertEqual(list(values), [0.])
+        self.assertEqual(list(violated), [False])
+        
+        # vector is rebuilt when constraints change
+        drv.remove_constraint('comp2.x <= comp2.y')
+        values, violated, offsets = drv.eval_ineq_constraint_vector()
+        self.assertEqual(list(values), [-1., 2.])
+        
+        drv.clear_constraints()
+        values, violated, offsets = drv.eval_ineq_constraint_vector()
+        self.assertEqual(len(values), 0)
+        self.assertEqual(list(offsets), [0])
+
+    def test_eval_constraint_vector_empty_array(self):
+        # an empty array constraint must not shift the signs of the others
+        self.asm.add('comp2', ArrayComp())
+        self.asm.comp2.add('e', Array(array([]), iotype='in'))
+        self.asm.comp2.x = array([1., 5.])
+        drv = self.asm.add('driver', MyDriver())
+        drv.add_constraint('comp2.x < 3.')
+        drv.add_constraint('comp2.e > 0.')
+        
+        values, violated, offsets = drv.eval_ineq_constraint_vector()
+        self.assertEqual(list(values), [-2., 2.])
+        self.assertEqual(list(violated), [False, True])
+        self.assertEqual(list(offsets), [0, 2, 2])
+        
+        drv.add_constraint('comp1.a > comp1.b')
+        self.asm.comp1.a = 4
+        self.asm.comp1.b = 5
+        values, violated, offsets = drv.eval_ineq_constraint_vector()
+        self.assertEqual(list(values), [-2., 2., 1.])
+        self.assertEqual(list(violated), [False, True, True])
+        self.assertEqual(list(offsets), [0, 2, 2, 3])
+
     def test_eval_eq_constraint(self):
         self._check_eq_eval_constraints(MyEqDriver())
 
@@ -1,8 +1,10 @@
 # pylint: disable-msg=C0111,C0103
 import unittest
 
+from numpy import array, zeros
+
 from openmdao.main.api import Assembly, Component, Driver, set_as_top
-from openmdao.lib.datatypes.api import Int, Event, Float, List, Enum, Str
+from openmdao.lib.datatypes.api import Int, Event, Float, List, Enum, Str, Array
 from openmdao.util.decorators import add_delegate
 from openmdao.main.hasparameters import HasParameters, Parameter, ParameterGroup
 from openmdao.test.execcomp import ExecComp
@@ -16,6 +18,14 @@ class Dummy(Component):
     enum_i = Enum(values=(1,5,8), iotype='in')
     enum_f = Enum(values=(1.1,5.5,8.8), iotype='in')
     
+class ArrayComp(Component):
+    x = Array(zeros(6), iotype='in')
+    y = Float(0.0, iotype='in')
+    z = Float(0.0, iotype='out')
+    
+    def execute(self):
+        self.z = sum(self.x) + self.y
+    
 @add_delegate(HasParameters)
 class MyDriver(Driver):
     def start_iteration(self):
@@ -122,6 +132,47 @@ class HasParametersTestCase(unittest.TestCase):
         #except ValueError as err:
             #self.assertEqual(str(err), "parameter value (-1.0) is outside of allowed range [0.0 to 1e+99]")
             
+    def test_set_array_params(self):
+        self.top.add('acomp', ArrayComp())
+        self.top.driver.workflow.add('acomp')
+        driver = self.top.driver
+        for i in (2, 1, 0, 5):
+            driver.add_parameter('acomp.x[%d]' % i, -100., 100.)
+        driver.add_parameter('acomp.y', -100., 100., scaler=2., adder=1.)
+        driver.add_parameter('comp.x', -100., 100.)
+        
+        driver.set_parameters([3., 2., 1., 6., 4., 7.])
+        self.assertEqual(list(self.top.acomp.x), [1., 2., 3., 0., 0., 6.])
+        self.assertEqual(self.top.acomp.y, 10.)
+        self.assertEqual(self.top.comp.x, 7.)
+        self.top.run()
+        self.assertEqual(self.top.acomp.z, 22.)
+        
+        # changed entries invalidate the component's outputs
+        driver.set_parameters([3., 2., 1., 5., 4., 7.])
+        self.assertEqual(self.top.acomp.get_valid(['z']), [False])
+        self.top.run()
+        self.assertEqual(self.top.acomp.z, 21.)
+        
+        # setting the same values leaves the outputs valid
+        driver.set_parameters([3., 2., 1., 5., 4., 7.])
+        self.assertEqual(self.top.acomp.get_valid(['z']), [True])
+        
+        # a replaced component gets the values
+        self.top.add('acomp', ArrayComp())
+        driver.set_parameters([3., 2., 1., 5., 4., 7.])
+        self.assertEqual(list(self.top.acomp.x), [1., 2., 3., 0., 0., 5.])
+        
+        # connected targets can't be set
+        self.top.connect('comp.c', 'acomp.y')
+        try:
+            driver.set_parameters([3., 2., 1., 5., 4., 7.])
+        except RuntimeError as err:
+            self.assertEqual(str(err), "acomp: 'y' is connected to source "
+                             "'parent.comp.c' and cannot be set by source 'None'")
+        else:
+            self.fail("RuntimeError expected")
+        
     def test_set_broadcast_params(self): 
         self.top.driver.add_parameter(('comp.x','comp.y'), low=0.,high=1e99)
         self.top.driver.set_parameters([22.,])
@@ -12,6 +12,7 @@ import time
 import unittest
 import nose
 
+from openmdao.main.case import Case
 from openmdao.main.component import SimulationRoot
 from openmdao.main.objserverfactory import ObjServerFactory, ObjServer, \
                                            start_server
@@ -222,6 +223,18 @@ class TestCase(unittest.TestCase):
             obj = server.load_model(egg_info[0])
             obj.run()
 
+            # Run a batch of cases.
+            results = server.run_cases(egg_info[0],
+                                       [Case(), Case(inputs=[('no_such', 1)]),
+                                        Case()], stop_on_error=True)
+            self.assertEqual(len(results), 2)
+            case, error = results[0]
+            self.assertEqual(error, None)
+            self.assertEqual(case.msg, None)
+            case, error = results[1]
+            self.assertEqual(error, None)
+            self.assertTrue(case.msg.startswith('Exception setting case inputs:'))
+
             assert_raises(self, "server.load_model('no-such-egg')",
                           globals(), locals(), ValueError,
                           "'no-such-egg' not found.")
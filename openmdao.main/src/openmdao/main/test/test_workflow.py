@@ -2,11 +2,12 @@
 Test run/step/stop aspects of a simple workflow.
 """
 
+import time
 import unittest
 
-from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.api import Assembly, Component, ParallelDataflow, set_as_top
 from openmdao.main.exceptions import RunStopped
-from openmdao.lib.datatypes.api import Int, Bool
+from openmdao.lib.datatypes.api import Float, Int, Bool
 
 # pylint: disable-msg=E1101,E1103
 # "Instance of <class> has no <attr> member"
@@ -54,6 +55,37 @@ class Model(Assembly):
         self.run()
 
 
+class Sleeper(Component):
+    """ Component which sleeps for `delay` seconds, then copies x to y. """
+
+    x = Float(0., iotype='in')
+    delay = Float(0., iotype='in')
+    y = Float(0., iotype='out')
+
+    def execute(self):
+        time.sleep(self.delay)
+        self.y = self.x + 1.
+
+
+class FanOut(Assembly):
+    """ One source feeding several independent branches and a sink. """
+
+    def __init__(self, nbranches, delay):
+        super(FanOut, self).__init__()
+        self.driver.workflow = ParallelDataflow()
+        self.add('source', Sleeper())
+        self.add('sink', Sleeper())
+        names = ['source', 'sink']
+        for i in range(nbranches):
+            name = 'branch%d' % i
+            self.add(name, Sleeper())
+            getattr(self, name).delay = delay
+            self.connect('source.y', name+'.x')
+            names.append(name)
+        self.connect('branch0.y', 'sink.x')
+        self.driver.workflow.add(names)
+
+
 class TestCase(unittest.TestCase):
     """ Test run/step/stop aspects of a simple workflow. """
 
@@ -182,6 +214,61 @@ class TestCase(unittest.TestCase):
             self.fail('Expected StopIteration')
 
 
+class ParallelTestCase(unittest.TestCase):
+    """ Test concurrent execution of a ParallelDataflow. """
+
+    def test_levels(self):
+        model = set_as_top(FanOut(4, 0.))
+        levels = model.driver.workflow._get_levels()
+        self.assertEqual(levels[0], ['source'])
+        self.assertEqual(sorted(levels[1]),
+                         ['branch0', 'branch1', 'branch2', 'branch3'])
+        self.assertEqual(levels[2], ['sink'])
+
+    def test_fanout(self):
+        nbranches = 8
+        delay = 0.5
+        model = set_as_top(FanOut(nbranches, delay))
+        model.source.x = 1.
+        start = time.time()
+        model.run()
+        elapsed = time.time() - start
+        self.assertTrue(elapsed < nbranches*delay/2.)
+        self.assertEqual(model.sink.y, 4.)
+        for i in range(nbranches):
+            self.assertEqual(getattr(model, 'branch%d' % i).y, 3.)
+
+        # Nothing is invalid, so nothing should run.
+        model.run()
+        self.assertEqual(model.branch1.exec_count, 1)
+
+        # Validity must propagate through the branches.
+        model.source.x = 2.
+        self.assertEqual(model.branch1.is_valid(), False)
+        model.run()
+        self.assertEqual(model.branch1.exec_count, 2)
+        self.assertEqual(model.branch1.y, 4.)
+        self.assertEqual(model.sink.y, 5.)
+
+    def test_max_workers(self):
+        model = set_as_top(FanOut(4, 0.2))
+        model.driver.workflow.max_workers = 2
+        start = time.time()
+        model.run()
+        self.assertTrue(time.time() - start >= 0.4)
+        self.assertEqual(model.sink.y, 3.)
+
+    def test_error(self):
+        model = set_as_top(FanOut(4, 0.))
+        model.branch2.delay = -1.  # time.sleep() raises IOError
+        try:
+            model.run()
+        except IOError:
+            pass
+        else:
+            self.fail('Expected IOError')
+
+
 if __name__ == '__main__':
     import nose
     import sys
@@ -731,6 +731,24 @@ class test__PhysicalUnit(unittest.TestCase):
 
 
 class test__moduleFunctions(unittest.TestCase):        
+    def test_get_conversion_tuple(self):
+        self.assertEqual(units.get_conversion_tuple('m', 'cm'), (100.0, 0.0))
+        factor, offset = units.get_conversion_tuple('degC', 'degF')
+        self.assertAlmostEqual((100.0 + offset) * factor, 212.0)
+        # cached tuples are reused
+        self.assertTrue(units.get_conversion_tuple('degC', 'degF') is
+                        units.get_conversion_tuple('degC', 'degF'))
+        try:
+            units.get_conversion_tuple('m', 'degF')
+        except TypeError,err: 
+            self.assertEqual(str(err), "Incompatible units")
+        else:
+            self.fail("Expecting TypeError")
+
+    def test_convert_units(self):
+        self.assertAlmostEqual(units.convert_units(12.0, 'inch', 'ft'), 1.0)
+        self.assertAlmostEqual(units.convert_units(0.0, 'degC', 'degK'), 273.15)
+
     def test_add_unit(self):
         try:
             units.add_unit('ft','20*m')
@@ -641,6 +641,7 @@ def import_library(libfilepointer):
     global _unit_lib 
     global _unit_cache
     _unit_cache = {}
+    _conversion_cache.clear()
     _unit_lib = ConfigParser.ConfigParser()
     _unit_lib.optionxform = do_nothing
     _unit_lib.readfp(libfilepointer)
@@ -735,13 +736,32 @@ def import_library(libfilepointer):
 
     return _unit_lib
 
+# (factor, offset) conversion tuples keyed by (units, convunits)
+_conversion_cache = {}
+_MAX_CONVERSIONS = 1000
+
+def get_conversion_tuple(units, convunits):
+    """Return a tuple (factor, offset) such that (value + offset) * factor
+    converts a value in units to convunits. Tuples are cached, so the unit
+    strings are only parsed the first time a given pair is seen.
+    """
+    key = (units, convunits)
+    try:
+        return _conversion_cache[key]
+    except KeyError:
+        pass
+    conv = _find_unit(units).conversion_tuple_to(_find_unit(convunits))
+    if len(_conversion_cache) >= _MAX_CONVERSIONS:
+        _conversion_cache.clear()
+    _conversion_cache[key] = conv
+    return conv
+
 def convert_units(value, units, convunits):
     """Return the given value (given in units) converted 
     to convunits.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
+    factor, offset = get_conversion_tuple(units, convunits)
+    return (value + offset) * factor
     
 
 try:
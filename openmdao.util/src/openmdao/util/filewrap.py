@@ -4,6 +4,8 @@ A collection of utilities for file wrapping.
 Note: This is a work in progress.
 """
 
+import mmap
+import os.path
 import re
 import logging
 
@@ -15,7 +17,9 @@ from openmdao.util.decorators import stub_if_missing_deps
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import append, array, zeros
+    from numpy import append, array, zeros, arange, concatenate, \
+                      flatnonzero, frombuffer, fromstring, searchsorted, \
+                      uint8, unique
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -30,6 +34,43 @@ def _getformat(val):
     else:
         return "%.16g"
 
+def _format_value(val):
+    # Returns the text for a value substituted into a template field.
+    
+    if isinstance(val, _Slot):
+        return val.marker('field')
+    elif isinstance(val, float):
+        return _getformat(val) % val
+    else:
+        return str(val)
+
+
+class _Slot(object):
+    """Placeholder for a value in a compiled template. It is substituted
+    into the template as a marker, which records how the value is to be
+    formatted (as a field or via ``str()``)."""
+    
+    def __init__(self, ident, name, index):
+        self.ident = ident
+        self.name = name
+        self.index = index
+        
+    def marker(self, mode):
+        """Returns marker text for `mode`, 'field' or 'str'."""
+        digits = ''.join([_SLOT_DIGITS[int(c)] for c in str(self.ident)])
+        return '\x00%s%s\x00' % (digits, _SLOT_MODES[mode])
+    
+    def __str__(self):
+        return self.marker('str')
+
+# Markers are built only from control characters, so a field inside a
+# marker is never split by the delimiters. Delimiters that include any of
+# these characters are rejected while slots are in use.
+_SLOT_DIGITS = [chr(16+i) for i in range(10)]
+_SLOT_MODES = {'field': '\x01', 'str': '\x02'}
+_SLOT_ALPHABET = '\x00\x01\x02' + ''.join(_SLOT_DIGITS)
+_SLOT_MARKER = re.compile('\x00([\x10-\x19]+)([\x01\x02])\x00')
+
 
 class _SubHelper(object):
     """Replaces file text at the correct word location in a line. This
@@ -68,10 +109,7 @@ class _SubHelper(object):
         self.current_location += 1
         
         if self.current_location == self.replace_location:
-            if isinstance(self.newtext, float):
-                return _getformat(self.newtext) % self.newtext
-            else:
-                return str(self.newtext)
+            return _format_value(self.newtext)
         else:
             return text.group()
         
@@ -86,11 +124,7 @@ class _SubHelper(object):
         if self.current_location >= self.start_location and \
            self.current_location <= self.end_location and \
            self.counter < end:
-            if isinstance(self.newtext[self.counter], float):
-                val = self.newtext[self.counter]
-                newval = _getformat(val) % val
-            else:
-                newval = str(self.newtext[self.counter])
+            newval = _format_value(self.newtext[self.counter])
             self.counter += 1
             return newval
         else:
@@ -175,10 +209,75 @@ def _parse_line(delimiters=' \t'):
     return data
 
 
+# Grammars from _parse_line, keyed by delimiters and pyparsing whitespace.
+_LINE_PARSERS = {}
+
+def _line_parser(delimiters=' \t'):
+    """Returns a (cached) grammar from ``_parse_line(delimiters)``."""
+    
+    key = (delimiters, ParserElement.DEFAULT_WHITE_CHARS)
+    parser = _LINE_PARSERS.get(key)
+    if parser is None:
+        parser = _parse_line(delimiters)
+        _LINE_PARSERS[key] = parser
+    return parser
+
+
+# A float or int as tokenized by _parse_line.
+_NUMBER = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eED][+-]?\d+)?'
+_INTEGER = re.compile(r'[+-]?\d+$')
+
+# (line matcher, field splitter), keyed by pyparsing whitespace.
+_NUMERIC_LINES = {}
+
+def _numeric_fields(line):
+    """Returns the fields of `line` as strings if they are all plain ints or
+    floats, in which case ``_parse_line`` would just convert each field.
+    Otherwise returns None, and the line should be parsed by pyparsing."""
+    
+    white = ParserElement.DEFAULT_WHITE_CHARS
+    try:
+        matcher, splitter = _NUMERIC_LINES[white]
+    except KeyError:
+        if not white:
+            return None
+        sep = '[%s]' % re.escape(white)
+        matcher = re.compile(r'%s*(?:%s(?:%s+|$))+$' % (sep, _NUMBER, sep))
+        splitter = re.compile('%s+' % sep)
+        _NUMERIC_LINES[white] = (matcher, splitter)
+    
+    line = line.rstrip('\n')
+    if matcher.match(line) is None:
+        return None
+    return splitter.split(line.strip(white))
+
+
+def _to_number(field):
+    """Converts a field from ``_numeric_fields`` to an int or float."""
+    
+    if _INTEGER.match(field):
+        return int(field)
+    return float(field.replace('D', 'E'))
+
+
+def _to_floats(fields):
+    """Converts fields from ``_numeric_fields`` to a float array in one
+    operation."""
+    
+    text = ' '.join(fields)
+    if 'D' in text:
+        text = text.replace('D', 'E')
+    return fromstring(text, sep=' ')
+
+
 class InputFileGenerator(object):
     """Utility to generate an input file from a template.
     Substitution of values is supported. Data is located with
-    a simple API."""
+    a simple API.
+    
+    When the same file is generated repeatedly with only the values
+    changing, pass placeholders from ``slot()`` to the transfer methods
+    and then ``compile()`` the template once."""
     
     def __init__(self):
         
@@ -191,6 +290,8 @@ class InputFileGenerator(object):
         self.data = []
         self.current_row = 0
         self.anchored = False
+        
+        self._slots = []
     
     def set_template_file(self, filename):
         """Set the name of the template file to be used The template
@@ -220,8 +321,11 @@ class InputFileGenerator(object):
         delimiter: str
             A string containing characters to be used as delimiters."""
         
+        reg = re.compile('[^' + delimiter + '\n]+')
+        if self._slots:
+            self._check_delimiters(reg)
         self.delimiter = delimiter
-        self.reg = re.compile('[^' + delimiter + '\n]+')
+        self.reg = reg
         
     def mark_anchor(self, anchor, occurrence=1):
         """Marks the location of a landmark, which lets you describe data by
@@ -434,11 +538,169 @@ class InputFileGenerator(object):
         infile = open(self.output_filename, 'w')
         infile.writelines(self.data)
         infile.close()
+        
+    def slot(self, name, shape=None):
+        """Returns a placeholder to pass to a transfer method in place of
+        the value. The value is supplied to the compiled template.
+        
+        name: str
+            Name of the value.
+        
+        shape: integer or tuple (optional)
+            Size of a 1D array, or shape of a 2D array. If omitted, the
+            value is a scalar."""
+        
+        if shape is None:
+            return self._new_slot(name, None)
+        
+        if isinstance(shape, int):
+            return [self._new_slot(name, i) for i in range(shape)]
+        
+        nrows, ncols = shape
+        slots = array([[None]*ncols]*nrows, dtype=object)
+        for i in range(nrows):
+            for j in range(ncols):
+                slots[i, j] = self._new_slot(name, (i, j))
+        return slots
+    
+    def _check_delimiters(self, reg):
+        """Raises ValueError if the delimiters matched by `reg` include any
+        character used in slot markers."""
+        
+        for char in _SLOT_ALPHABET:
+            if reg.match(char) is None:
+                raise ValueError("Delimiters may not include control "
+                                 "character %r when using slots" % char)
+    
+    def _new_slot(self, name, index):
+        """Returns a new slot for element `index` of `name`."""
+        
+        if not self._slots:
+            self._check_delimiters(self.reg)
+        slot = _Slot(len(self._slots), name, index)
+        self._slots.append(slot)
+        return slot
+        
+    def compile(self):
+        """Returns a :class:`CompiledTemplate` for the current contents,
+        with the placeholders from ``slot()`` as its slots. This generator
+        should not be used to generate a file afterwards, since its data
+        contains slot markers.
+        
+        A value replacing a field counts as one field for later transfers
+        on the same line, even if its text contains a delimiter."""
+        
+        parts = _SLOT_MARKER.split(''.join(self.data))
+        literals = parts[0::3]
+        for literal in literals:
+            if '\x00' in literal:
+                raise RuntimeError("A slot marker was corrupted in the "
+                                   "template text")
+        digits = dict([(c, str(i)) for i, c in enumerate(_SLOT_DIGITS)])
+        slots = []
+        for ident, mode in zip(parts[1::3], parts[2::3]):
+            ident = int(''.join([digits[c] for c in ident]))
+            if ident >= len(self._slots):
+                raise RuntimeError("A slot marker was corrupted in the "
+                                   "template text")
+            slot = self._slots[ident]
+            slots.append((slot.name, slot.index, mode == '\x01'))
+            
+        shapes = {}
+        for slot in self._slots:
+            if slot.index is None:
+                shapes[slot.name] = None
+            elif isinstance(slot.index, int):
+                shapes[slot.name] = max(shapes.get(slot.name, 0), 
+                                        slot.index+1)
+            else:
+                nrows, ncols = shapes.get(slot.name, (0, 0))
+                shapes[slot.name] = (max(nrows, slot.index[0]+1),
+                                     max(ncols, slot.index[1]+1))
+            
+        return CompiledTemplate(literals, slots, shapes, self.output_filename)
+
+
+class CompiledTemplate(object):
+    """A template compiled by :meth:`InputFileGenerator.compile`: literal
+    text chunks separated by value slots. Generating a file only formats the
+    slot values, in the same way as the transfer methods, and writes the
+    chunks.
+    
+    literals: list(str)
+        Template text before, between, and after the slots.
+    
+    slots: list(tuple)
+        ``(name, index, as_field)`` for each slot. `index` is None for a
+        scalar. If `as_field`, the value is formatted as a replaced field,
+        otherwise with ``str()``.
+    
+    shapes: dict
+        Maps value names to None for scalars, or to the size or shape of
+        arrays.
+    
+    filename: str
+        Default name of the file to generate."""
+    
+    def __init__(self, literals, slots, shapes, filename=None):
+        
+        self.literals = literals
+        self.slots = slots
+        self.shapes = shapes
+        self.filename = filename
+        
+        self._parts = []
+        for literal in literals:
+            self._parts.append(literal)
+            self._parts.append(None)
+        self._parts.pop()
+        
+    def generate(self, values, filename=None):
+        """Generate a file from the template.
+        
+        values: dict
+            Maps value names to values. Arrays must have the size or shape
+            used when compiling, and 2D arrays must be ndarrays.
+        
+        filename: str (optional)
+            Name of the file to generate, the compiled output filename if
+            omitted."""
+        
+        for name, shape in self.shapes.items():
+            if name not in values:
+                raise KeyError("No value for template slot '%s'" % name)
+            if shape is not None:
+                value = values[name]
+                if isinstance(shape, int):
+                    size = len(value)
+                else:
+                    size = getattr(value, 'shape', None)
+                if size != shape:
+                    raise ValueError("Template slot '%s' expects shape %s,"
+                                     " got %s" % (name, shape, size))
+        
+        parts = list(self._parts)
+        for i, (name, index, as_field) in enumerate(self.slots):
+            val = values[name]
+            if index is not None:
+                val = val[index]
+            if as_field and isinstance(val, float):
+                parts[2*i+1] = _getformat(val) % val
+            else:
+                parts[2*i+1] = str(val)
+                
+        outfile = open(filename or self.filename, 'w')
+        outfile.writelines(parts)
+        outfile.close()
 
 
 @stub_if_missing_deps('numpy')
 class FileParser(object):
-    """Utility to locate and read data from a file."""
+    """Utility to locate and read data from a file.
+    
+    Files without comment characters are memory mapped rather than read into
+    memory. The rows containing an anchor are found with one pass over the
+    file the first time that anchor is used, and then looked up."""
     
     def __init__(self, end_of_line_comment_char=None, full_line_comment_char=None):
         
@@ -452,6 +714,9 @@ class FileParser(object):
         self.current_row = 0
         self.anchored = False
         
+        self._anchor_data = None
+        self._anchor_rows = {}
+        
     def set_file(self, filename):
         """Set the name of the file that will be generated.
         
@@ -460,14 +725,18 @@ class FileParser(object):
         
         self.filename = filename
         
-        inputfile = open(filename, 'r')
         if not self.end_of_line_comment_char and not self.full_line_comment_char:
-            self.data = inputfile.readlines()
-        else:
-            self.data = []
-            for line in inputfile :
-                if line[0] == self.full_line_comment_char : continue
-                self.data.append( line.split( self.end_of_line_comment_char )[0] )
+            if os.path.getsize(filename):
+                self.data = _MappedLines(filename)
+            else:
+                self.data = []
+            return
+        
+        inputfile = open(filename, 'r')
+        self.data = []
+        for line in inputfile :
+            if line[0] == self.full_line_comment_char : continue
+            self.data.append( line.split( self.end_of_line_comment_char )[0] )
         inputfile.close()
 
     def set_delimiters(self, delimiter):
@@ -502,51 +771,59 @@ class FileParser(object):
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
         
-        instance = 0
+        rows = self._find_rows(anchor)
         if occurrence > 0:
-            count = 0
-            for line in self.data[self.current_row:]:
-                
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only after the anchor.
-                if count == 0 and self.anchored:
-                    line = line.split(anchor)[-1]
-
-                if line.find(anchor) > -1:
-                    
-                    instance += 1
-                    if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
             
-                count += 1
+            # If we are marking a new anchor from an existing anchor, then
+            # the text after the anchor in its line can't hold another one.
+            start = self.current_row
+            if self.anchored:
+                start += 1
                 
-        elif occurrence < 0:
-            count = len(self.data)-1
-            for line in reversed(self.data):
+            i = searchsorted(rows, start) + occurrence - 1
+            if i < len(rows):
+                self.current_row = int(rows[i])
+                self.anchored = True
+                return
                 
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only before the anchor.
-                if count == len(self.data)-1 and self.anchored:
-                    line = line.split(anchor)[0]
-
-                if line.find(anchor) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
+        elif occurrence < 0:
             
-                count -= 1
+            # A reverse search from an existing anchor skips the last line.
+            end = len(self.data)
+            if self.anchored:
+                end -= 1
+                
+            i = searchsorted(rows, end) + occurrence
+            if i >= 0:
+                self.current_row = int(rows[i])
+                self.anchored = True
+                return
         else:
             raise ValueError("0 is not valid for an anchor occurrence.")
             
         raise RuntimeError("Could not find pattern %s in output file %s" % \
                            (anchor, self.filename))
         
+    def _find_rows(self, anchor):
+        """Returns sorted array of the rows containing `anchor`. Rows for
+        each anchor are found once per file."""
+        
+        if self.data is not self._anchor_data:
+            self._anchor_data = self.data
+            self._anchor_rows = {}
+            
+        rows = self._anchor_rows.get(anchor)
+        if rows is None:
+            if not anchor:
+                rows = arange(len(self.data))
+            elif isinstance(self.data, _MappedLines):
+                rows = self.data.find_rows(anchor)
+            else:
+                rows = array([i for i, line in enumerate(self.data)
+                                if anchor in line], dtype=int)
+            self._anchor_rows[anchor] = rows
+        return rows
+        
     def reset_anchor(self):
         """Resets anchor to the beginning of the file."""
         
@@ -599,19 +876,29 @@ class FileParser(object):
             else:
                 line = line[(field-1):(fieldend)]
             
-            # Let pyparsing figure out if this is a number, and return it
+            # Plain numbers are split and converted directly, otherwise let
+            # pyparsing figure out if this is a number, and return it
             # as a float or int as appropriate
-            data = _parse_line().parseString(line)
+            fields = _numeric_fields(line)
+            if fields is None:
+                data = _line_parser().parseString(line)
+            else:
+                data = fields
             
             # data might have been split if it contains whitespace. If so,
             # just return the whole string
             if len(data) > 1:
                 return line
-            else:
+            elif fields is None:
                 return data[0]
+            else:
+                return _to_number(data[0])
         else:
-            data = _parse_line(self.delimiter).parseString(line)
-            return data[field-1]
+            fields = _numeric_fields(line)
+            if fields is None:
+                data = _line_parser(self.delimiter).parseString(line)
+                return data[field-1]
+            return _to_number(fields[field-1])
 
     def transfer_keyvar(self, key, field, occurrence=1, rowoffset=0):
         """Searches for a key relative to the current anchor and then grabs
@@ -636,31 +923,29 @@ class FileParser(object):
             msg = "The value for occurrence must be a nonzero integer"
             raise ValueError(msg)
         
-        instance = 0
+        # Search rows from the current anchor. A reverse search counts
+        # back from the end of the file.
+        rows = self._find_rows(key)
+        first = searchsorted(rows, self.current_row)
+        nrows = len(self.data) - self.current_row
         if occurrence > 0:
-            row = 0
-            for line in self.data[self.current_row:]:
-                if line.find(key) > -1:
-                    instance += 1
-                    if instance == occurrence:
-                        break
-            
-                row += 1
+            i = first + occurrence - 1
+            if i < len(rows):
+                row = int(rows[i]) - self.current_row
+            else:
+                row = nrows
                 
         elif occurrence < 0:
-            row = -1
-            for line in reversed(self.data[self.current_row:]):
-                if line.find(key) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        break
-            
-                row -= 1
+            i = len(rows) + occurrence
+            if i >= first:
+                row = int(rows[i]) - len(self.data)
+            else:
+                row = -1 - nrows
         
         j = self.current_row + row + rowoffset
         line = self.data[j]
         
-        fields = _parse_line(self.delimiter).parseString(line.replace(key,"KeyField"))
+        fields = _line_parser(self.delimiter).parseString(line.replace(key,"KeyField"))
         
         return fields[field]
 
@@ -696,6 +981,11 @@ class FileParser(object):
             raise ValueError("fieldend is missing, currently required")
             
         lines = self.data[j1:j2]
+        
+        # Blocks of plain numbers are converted in one operation.
+        data = self._numeric_array(lines, j2-j1, fieldstart, fieldend)
+        if data is not None:
+            return data
 
         data = zeros(shape=(0, 0))
 
@@ -708,7 +998,7 @@ class FileParser(object):
                 
                 # Let pyparsing figure out if this is a number, and return it
                 # as a float or int as appropriate
-                parsed = _parse_line().parseString(line)
+                parsed = _line_parser().parseString(line)
                 
                 newdata = array(parsed[:])
                 # data might have been split if it contains whitespace. If the
@@ -719,7 +1009,7 @@ class FileParser(object):
                 data = append(data, newdata)
                 
             else:
-                parsed = _parse_line(self.delimiter).parseString(line)
+                parsed = _line_parser(self.delimiter).parseString(line)
                 if i == j2-j1-1:
                     data = append(data, array(parsed[(fieldstart-1):fieldend]))
                 else:
@@ -729,3 +1019,135 @@ class FileParser(object):
         return data
         
                 
+    
+    def transfer_2Darray(self, rowstart, fieldstart, rowend, fieldend=None):
+        """Grabs a 2D array of variables relative to the current anchor. Each
+        row of the array is on its own line, and the same fields are taken
+        from each line.
+        
+        rowstart: integer
+            Row number to start, relative to the current anchor
+        
+        fieldstart: integer
+            field number to start
+        
+        rowend: integer
+            row number to end, relative to the current anchor
+        
+        fieldend: integer (optional)
+            field number to end. If not set, then the end of each line
+            is used.
+        
+        Setting the delimiter to 'columns' is not supported."""
+        
+        if self.delimiter == "columns":
+            raise ValueError("transfer_2Darray does not support 'columns'")
+        
+        lines = self.data[self.current_row+rowstart:self.current_row+rowend+1]
+        
+        rows = []
+        for line in lines:
+            fields = _numeric_fields(line)
+            if fields is None:
+                break
+            rows.append(fields[(fieldstart-1):fieldend])
+        else:
+            if len(set([len(row) for row in rows])) <= 1:
+                ncols = len(rows[0]) if rows else 0
+                data = _to_floats([field for row in rows for field in row])
+                return data.reshape((len(rows), ncols))
+            
+        rows = []
+        for line in lines:
+            parsed = _line_parser(self.delimiter).parseString(line)
+            rows.append(list(parsed[(fieldstart-1):fieldend]))
+        if len(set([len(row) for row in rows])) > 1:
+            raise ValueError("Lines have different numbers of fields.")
+        return array(rows)
+    
+    def _numeric_array(self, lines, nrows, fieldstart, fieldend):
+        """Returns the float array for ``transfer_array`` if all the fields
+        in `lines` are plain numbers, otherwise None. `fieldend` only
+        applies to the last line if all `nrows` requested lines exist."""
+        
+        if not lines:
+            return None
+        
+        if self.delimiter == "columns":
+            fields = []
+            for line in lines:
+                line = line[(fieldstart-1):fieldend].strip()
+                newfields = _numeric_fields(line)
+                if newfields is None:
+                    return None
+                fields.extend(newfields)
+            return _to_floats(fields)
+        
+        blocks = []
+        for line in lines:
+            fields = _numeric_fields(line)
+            if fields is None:
+                return None
+            blocks.append(fields)
+        
+        if len(blocks) == nrows:
+            blocks[-1] = blocks[-1][:fieldend]
+        blocks[0] = blocks[0][(fieldstart-1):]
+        fields = []
+        for block in blocks:
+            fields.extend(block)
+        return _to_floats(fields)
+
+
+class _MappedLines(object):
+    """Read-only sequence of the lines of a memory-mapped file. Lines are
+    located by one vectorized scan for newlines and extracted on access."""
+    
+    def __init__(self, filename):
+        
+        with open(filename, 'rb') as inp:
+            self._map = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        
+        newlines = flatnonzero(frombuffer(self._map, dtype=uint8) == ord('\n'))
+        self._starts = concatenate(([0], newlines+1))
+        if self._starts[-1] == size:
+            self._starts = self._starts[:-1]
+        self._ends = concatenate((self._starts[1:], [size]))
+        
+    def __len__(self):
+        return len(self._starts)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('list index out of range')
+        return self._map[self._starts[index]:self._ends[index]]
+    
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+            
+    def __reversed__(self):
+        for i in xrange(len(self)-1, -1, -1):
+            yield self[i]
+    
+    def find_rows(self, text):
+        """Returns sorted array of the rows containing `text`."""
+        
+        hits = []
+        find = self._map.find
+        pos = find(text)
+        while pos >= 0:
+            hits.append(pos)
+            pos = find(text, pos+1)
+            
+        hits = array(hits, dtype=int)
+        rows = searchsorted(self._starts, hits, 'right') - 1
+        
+        # Drop matches that span lines.
+        rows = rows[hits + len(text) <= self._ends[rows]]
+        return unique(rows)
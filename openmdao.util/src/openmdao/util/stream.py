@@ -1,3 +1,4 @@
+import mmap
 import struct
 import sys
 import logging
@@ -12,6 +13,8 @@ _SZ_LONG = 8
 _SZ_FLOAT = 4
 _SZ_DOUBLE = 8
 
+_TEXT_BLOCK = 4096  # Values formatted per operation when writing text.
+
 from openmdao.util.decorators import stub_if_missing_deps
 
 @stub_if_missing_deps('numpy')
@@ -45,12 +48,34 @@ class Stream(object):
     recordmark_8: bool
         If True, the record length markers are 64 bits, not 32.
         Only meaningful if `unformatted`.
+
+    buffer_size: int
+        If > zero, then data is read and written in blocks of at least this
+        many bytes. Only meaningful if `binary`.
+
+    memory_map: bool
+        If True, then the file (opened for reading) is memory mapped.
+        Only meaningful if `binary`.
+
+    When buffered or memory mapped, arrays read are read-only views of the
+    buffer or map rather than copies, the file object's position does not
+    track the stream's (use :meth:`tell` and :meth:`seek`), and written data
+    is not in the file until :meth:`flush` or :meth:`close` is called.
     """
     def __init__(self, file_obj, binary=False, big_endian=False,
                  single_precision=False, integer_8=False,
-                 unformatted=False, recordmark_8=False):
+                 unformatted=False, recordmark_8=False,
+                 buffer_size=0, memory_map=False):
         self.file = file_obj
         self.binary = binary
+        self.buffer_size = 0
+        self.buffered = False  # True if buffered or memory mapped.
+        self._map = None
+        self._inbuf = ''      # Buffered input data.
+        self._inbuf_pos = 0   # File offset of `_inbuf`.
+        self._pos = 0         # Read position in `_inbuf`.
+        self._outbuf = []     # Buffered output data.
+        self._outbuf_len = 0
         if binary:
             self.big_endian = big_endian
             self.single_precision = single_precision
@@ -64,6 +89,23 @@ class Stream(object):
             else:
                 if sys.byteorder == 'big':
                     self.need_byteswap = True
+            # Byte order is explicit so data needn't be swapped in place.
+            order = '>' if big_endian else '<'
+            self._int_dtype = numpy.dtype(numpy.int64 if integer_8
+                                          else numpy.int32).newbyteorder(order)
+            self._float_dtype = numpy.dtype(numpy.float32 if single_precision
+                                            else numpy.float64).newbyteorder(order)
+            self._recordmark = struct.Struct(order + ('q' if recordmark_8
+                                                      else 'i'))
+            self.buffer_size = buffer_size
+            self.buffered = buffer_size > 0 or memory_map
+            if memory_map:
+                self._map = mmap.mmap(file_obj.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+                self._inbuf = self._map
+                self._pos = file_obj.tell()
+            elif self.buffered:
+                self._inbuf_pos = file_obj.tell()
         else:
             # Ensure sanity.
             self.big_endian = False
@@ -75,8 +117,54 @@ class Stream(object):
 
     def close(self):
         """ Close underlying file. """
+        self.flush()
+        if self._map is not None:
+            # Views may still refer to the map, it's unmapped once released.
+            self._inbuf = ''
+            self._map = None
         return self.file.close()
 
+    def flush(self):
+        """ Write any buffered output data. """
+        if self._outbuf:
+            self.file.write(''.join(self._outbuf))
+            self._outbuf = []
+            self._outbuf_len = 0
+            self.file.flush()
+
+    def tell(self):
+        """ Returns current file offset. """
+        if self._map is not None or self._inbuf:
+            return self._inbuf_pos + self._pos
+        return self.file.tell() + self._outbuf_len
+
+    def seek(self, offset):
+        """
+        Set current file offset.
+
+        offset: int
+            Offset from start of file (bytes).
+        """
+        if self._map is not None:
+            self._pos = offset
+            return
+        self.flush()
+        start = offset - self._inbuf_pos
+        if self._inbuf and 0 <= start <= len(self._inbuf):
+            self._pos = start
+        else:
+            self.file.seek(offset)
+            self._inbuf = ''
+            self._inbuf_pos = offset
+            self._pos = 0
+
+    @property
+    def _recordmark_size(self):
+        """ Size of a recordmark, zero if not `unformatted`. """
+        if not self.unformatted:
+            return 0
+        return _SZ_LONG if self.recordmark_8 else _SZ_INT
+
     def reclen_ints(self, count):
         """
         Returns record length for `count` ints.
@@ -151,13 +239,18 @@ class Stream(object):
         except TypeError:
             count = shape
 
+        dtype = numpy.int64 if self.integer_8 else numpy.int32
+        if self.buffered:
+            data = self._read_buffered(self._int_dtype, count, full_record,
+                                       self.reclen_ints(count))
+            return data.reshape(shape, order=order) if reshape else data
+
         if full_record and self.unformatted:
             reclen = self.read_recordmark()
             if reclen != self.reclen_ints(count):
                 raise RuntimeError('unexpected recordlength %d' % reclen)
 
         sep = '' if self.binary else ' '
-        dtype = numpy.int64 if self.integer_8 else numpy.int32
         data = numpy.fromfile(self.file, dtype=dtype, count=count, sep=sep)
         if self.need_byteswap:
             data.byteswap(True)
@@ -216,13 +309,18 @@ class Stream(object):
         except TypeError:
             count = shape
 
+        dtype = numpy.float32 if self.single_precision else numpy.float64
+        if self.buffered:
+            data = self._read_buffered(self._float_dtype, count, full_record,
+                                       self.reclen_floats(count))
+            return data.reshape(shape, order=order) if reshape else data
+
         if full_record and self.unformatted:
             reclen = self.read_recordmark()
             if reclen != self.reclen_floats(count):
                 raise RuntimeError('unexpected recordlength %d' % reclen)
 
         sep = '' if self.binary else ' '
-        dtype = numpy.float32 if self.single_precision else numpy.float64
         data = numpy.fromfile(self.file, dtype=dtype, count=count, sep=sep)
         if self.need_byteswap:
             data.byteswap(True)
@@ -235,13 +333,199 @@ class Stream(object):
 
         return data.reshape(shape, order=order) if reshape else data
 
+    def read_int_records(self, nrecords, shape, order='C'):
+        """
+        Returns `nrecords` unformatted records of integers, each of `shape`,
+        as a :mod:`numpy` array of shape ``(nrecords,) + shape``.
+        All recordmarks are checked in one operation.
+
+        nrecords: int
+            Number of records to read.
+
+        shape: tuple(int)
+            Dimensions of each record.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+        """
+        dtype = numpy.int64 if self.integer_8 else numpy.int32
+        return self._read_records(nrecords, shape, order, dtype,
+                                  self.reclen_ints)
+
+    def read_float_records(self, nrecords, shape, order='C'):
+        """
+        Returns `nrecords` unformatted records of floats, each of `shape`,
+        as a :mod:`numpy` array of shape ``(nrecords,) + shape``.
+        All recordmarks are checked in one operation.
+
+        nrecords: int
+            Number of records to read.
+
+        shape: tuple(int)
+            Dimensions of each record.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+        """
+        dtype = numpy.float32 if self.single_precision else numpy.float64
+        return self._read_records(nrecords, shape, order, dtype,
+                                  self.reclen_floats)
+
+    def _read_records(self, nrecords, shape, order, dtype, reclen):
+        """ Reads `nrecords` records of `shape` items of `dtype`. """
+        if not self.unformatted:
+            raise ValueError('records require unformatted data')
+
+        try:
+            shape = tuple(shape)
+        except TypeError:
+            shape = (shape,)
+        count = 1
+        for size in shape:
+            count *= size
+
+        record = self._record_dtype(dtype, count)
+        if self.buffered:
+            buf, offset, nbytes = self._fetch(record.itemsize * nrecords)
+            data = numpy.frombuffer(buf, dtype=record,
+                                    count=nbytes // record.itemsize,
+                                    offset=offset)
+        else:
+            data = numpy.fromfile(self.file, dtype=record, count=nrecords)
+        if len(data) < nrecords:
+            raise RuntimeError('read %d of %d records'
+                               % (len(data), nrecords))
+
+        expected = reclen(count)
+        bad = numpy.flatnonzero(data['head'] != expected)
+        if len(bad):
+            raise RuntimeError('unexpected recordlength %d'
+                               % data['head'][bad[0]])
+        bad = numpy.flatnonzero(data['tail'] != expected)
+        if len(bad):
+            raise RuntimeError('mismatched recordlength %d vs. %d'
+                               % (data['tail'][bad[0]], expected))
+
+        data = data['data']
+        if order == 'Fortran':
+            dims = len(shape)
+            data = data.reshape((nrecords,) + shape[::-1])
+            return data.transpose([0] + range(dims, 0, -1))
+        return data.reshape((nrecords,) + shape)
+
+    def _record_dtype(self, dtype, count):
+        """ Returns :mod:`numpy` dtype for a record of `count` items. """
+        mark = numpy.int64 if self.recordmark_8 else numpy.int32
+        record = numpy.dtype([('head', mark), ('data', dtype, (count,)),
+                              ('tail', mark)])
+        return record.newbyteorder('>' if self.big_endian else '<')
+
     def read_recordmark(self):
         """ Returns value of next recordmark. """
+        size = _SZ_LONG if self.recordmark_8 else _SZ_INT
+        if self.buffered:
+            buf, offset, nbytes = self._fetch(size)
+            return self._recordmark.unpack_from(buf, offset)[0]
         fmt = '>' if self.big_endian else '<'
         fmt += 'q' if self.recordmark_8 else 'i'
-        size = _SZ_LONG if self.recordmark_8 else _SZ_INT
         return struct.unpack(fmt, self.file.read(size))[0]
 
+    def index_records(self, count=-1):
+        """
+        Returns a list of ``(offset, length)`` for the data of the next
+        `count` records (all remaining records if negative), checking that
+        each trailing recordmark matches its leading one. The current
+        position is not changed. Only meaningful if `unformatted`.
+
+        count: int
+            Number of records to index.
+        """
+        if not self.unformatted:
+            raise ValueError('index_records requires unformatted data')
+
+        size = self._recordmark_size
+        start = self.tell()
+        offset = start
+        records = []
+        try:
+            while count < 0 or len(records) < count:
+                mark = self._peek(offset, size)
+                if len(mark) < size:
+                    if count < 0 and not mark:
+                        break
+                    raise RuntimeError('truncated recordmark at %d' % offset)
+                reclen = self._recordmark.unpack(mark)[0]
+                mark = self._peek(offset + size + reclen, size)
+                if len(mark) < size:
+                    raise RuntimeError('truncated record at %d' % offset)
+                reclen2 = self._recordmark.unpack(mark)[0]
+                if reclen2 != reclen:
+                    raise RuntimeError('mismatched recordlength %d vs. %d'
+                                       ' at %d' % (reclen2, reclen, offset))
+                records.append((offset + size, reclen))
+                offset += reclen + 2*size
+        finally:
+            self.seek(start)
+        return records
+
+    def _peek(self, offset, size):
+        """ Returns `size` bytes at `offset` (fewer at end of file). """
+        if self._map is not None:
+            return self._map[offset:offset+size]
+        start = offset - self._inbuf_pos
+        if start >= 0 and start + size <= len(self._inbuf):
+            return self._inbuf[start:start+size]
+        self.file.seek(offset)
+        return self.file.read(size)
+
+    def _fetch(self, size):
+        """
+        Returns ``(buffer, offset, nbytes)`` for the next `size` bytes,
+        refilling the input buffer as necessary. `nbytes` is less than
+        `size` at end of file.
+        """
+        avail = len(self._inbuf) - self._pos
+        if avail < size and self._map is None:
+            self.flush()
+            self._inbuf_pos += self._pos
+            self.file.seek(self._inbuf_pos + avail)
+            data = self.file.read(max(size - avail, self.buffer_size))
+            if avail:
+                self._inbuf = self._inbuf[self._pos:] + data
+            else:
+                self._inbuf = data
+            self._pos = 0
+            avail = len(self._inbuf)
+        offset = self._pos
+        nbytes = min(size, avail)
+        self._pos += nbytes
+        return (self._inbuf, offset, nbytes)
+
+    def _read_buffered(self, dtype, count, full_record, expected):
+        """
+        Returns `count` items of `dtype` as a view of the input buffer.
+        If `full_record`, the surrounding recordmarks are fetched with the
+        data and checked against `expected`.
+        """
+        size = self._recordmark_size if full_record else 0
+        buf, offset, nbytes = self._fetch(2*size + dtype.itemsize * count)
+
+        if size:
+            reclen = self._recordmark.unpack_from(buf, offset)[0]
+            if reclen != expected:
+                raise RuntimeError('unexpected recordlength %d' % reclen)
+            reclen2 = self._recordmark.unpack_from(buf,
+                                                   offset + size + reclen)[0]
+            if reclen2 != reclen:
+                raise RuntimeError('mismatched recordlength %d vs. %d'
+                                   % (reclen2, reclen))
+
+        count = min(count, (nbytes - size) // dtype.itemsize)
+        return numpy.frombuffer(buf, dtype=dtype, count=count,
+                                offset=offset + size)
+
 
     ######## Output Operations ########
 
@@ -269,7 +553,7 @@ class Stream(object):
 
             fmt = '>' if self.big_endian else '<'
             fmt += 'q' if self.integer_8 else 'i'
-            self.file.write(struct.pack(fmt, value))
+            self._write(struct.pack(fmt, value))
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(1))
@@ -312,20 +596,8 @@ class Stream(object):
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(data.size))
 
-            arr = data
-            if self.integer_8:
-                if data.itemsize != _SZ_LONG:
-                    arr = numpy.array(data, dtype=numpy.int64)
-            elif data.itemsize != _SZ_INT:
-                arr = numpy.array(data, dtype=numpy.int32)
-
-            if self.need_byteswap:
-                arr.byteswap(True)
-            try:
-                self.file.write(arr.tostring(order=order))
-            finally:
-                if self.need_byteswap:
-                    arr.byteswap(True)
+            arr = numpy.asarray(data, dtype=self._int_dtype)
+            self._write(arr.tostring(order=order))
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(data.size))
@@ -355,7 +627,7 @@ class Stream(object):
 
             fmt = '>' if self.big_endian else '<'
             fmt += 'f' if self.single_precision else 'd'
-            self.file.write(struct.pack(fmt, value))
+            self._write(struct.pack(fmt, value))
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(1))
@@ -398,26 +670,62 @@ class Stream(object):
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(data.size))
 
-            arr = data
-            if self.single_precision:
-                if data.itemsize != _SZ_FLOAT:
-                    arr = numpy.array(data, dtype=numpy.float32)
-            elif data.itemsize != _SZ_DOUBLE:
-                arr = numpy.array(data, dtype=numpy.float64)
-
-            if self.need_byteswap:
-                arr.byteswap(True)
-            try:
-                self.file.write(arr.tostring(order=order))
-            finally:
-                if self.need_byteswap:
-                    arr.byteswap(True)
+            arr = numpy.asarray(data, dtype=self._float_dtype)
+            self._write(arr.tostring(order=order))
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(data.size))
         else:
             self.write_array(data, order, fmt, sep, linecount)
 
+    def write_int_records(self, data, order='C'):
+        """
+        Writes each entry along the first axis of `data` as an unformatted
+        record of integers.
+
+        data: :class:`numpy.ndarray`
+            Integer data array, of shape ``(nrecords,) + record_shape``.
+
+        order: string
+            If 'C', each record is written in row-major order.
+            If 'Fortran', each record is written in column-major order.
+        """
+        dtype = numpy.int64 if self.integer_8 else numpy.int32
+        self._write_records(data, order, dtype, self.reclen_ints)
+
+    def write_float_records(self, data, order='C'):
+        """
+        Writes each entry along the first axis of `data` as an unformatted
+        record of floats.
+
+        data: :class:`numpy.ndarray`
+            Float data array, of shape ``(nrecords,) + record_shape``.
+
+        order: string
+            If 'C', each record is written in row-major order.
+            If 'Fortran', each record is written in column-major order.
+        """
+        dtype = numpy.float32 if self.single_precision else numpy.float64
+        self._write_records(data, order, dtype, self.reclen_floats)
+
+    def _write_records(self, data, order, dtype, reclen):
+        """ Writes records of `dtype` items with one write. """
+        if not self.unformatted:
+            raise ValueError('records require unformatted data')
+
+        data = numpy.asarray(data)
+        nrecords = data.shape[0]
+        count = data[0].size if nrecords else 0
+        if order == 'Fortran':
+            dims = len(data.shape) - 1
+            data = data.transpose([0] + range(dims, 0, -1))
+
+        records = numpy.empty(nrecords, dtype=self._record_dtype(dtype, count))
+        records['head'] = reclen(count)
+        records['data'] = data.reshape((nrecords, count))
+        records['tail'] = reclen(count)
+        self._write(records.tostring())
+
     def write_array(self, data, order='C', fmt='%s', sep=' ', linecount=0):
         """
         Writes array as text.
@@ -438,42 +746,45 @@ class Stream(object):
         linecount: int
             If > zero, then at most `linecount` values are written per line.
         """
-        shape = data.shape
-        indices = [0 for i in shape]
-        _item = data.item
-        _write = self.file.write
-
         if order == 'C':
             # Row-major order.
-            sequence = range(len(shape))
-            sequence.reverse()
+            values = numpy.ravel(data, order='C').tolist()
         elif order == 'Fortran':
             # Column-major order.
-            sequence = range(len(shape))
+            values = numpy.ravel(data, order='F').tolist()
         else:
             raise ValueError("order must be 'C' or 'Fortran'")
 
-        count = 0
-        while True:
-            _write(fmt % _item(*indices))
-            count += 1
-            if linecount > 0:
-                if count >= linecount:
-                    _write('\n')
-                    count = 0
-            if count:
-                _write(sep)
-
-            for i in sequence:
-                indices[i] += 1
-                if indices[i] >= shape[i]:
-                    indices[i] = 0
+        # Format a block of values (or lines) per operation.
+        _write = self.file.write
+        total = len(values)
+        if linecount > 0:
+            lines = total // linecount
+            nlines = max(_TEXT_BLOCK // linecount, 1)
+            line_fmt = sep.join([fmt] * linecount) + '\n'
+            block = nlines * linecount
+            block_fmt = line_fmt * nlines
+            start = 0
+            end = lines * linecount
+            while start < end:
+                stop = min(start + block, end)
+                if stop - start == block:
+                    _write(block_fmt % tuple(values[start:stop]))
                 else:
-                    break
-            else:
-                break
-
-        if count:
+                    _write(line_fmt * ((stop - start) // linecount)
+                           % tuple(values[start:stop]))
+                start = stop
+            values = values[end:]
+
+        if values:
+            item_fmt = fmt + sep
+            block_fmt = item_fmt * _TEXT_BLOCK
+            for start in range(0, len(values), _TEXT_BLOCK):
+                chunk = values[start:start+_TEXT_BLOCK]
+                if len(chunk) == _TEXT_BLOCK:
+                    _write(block_fmt % tuple(chunk))
+                else:
+                    _write(item_fmt * len(chunk) % tuple(chunk))
             _write('\n')
 
     def write_recordmark(self, length):
@@ -483,7 +794,15 @@ class Stream(object):
         length: int
             Length of record (bytes).
         """
-        fmt = '>' if self.big_endian else '<'
-        fmt += 'q' if self.recordmark_8 else 'i'
-        self.file.write(struct.pack(fmt, length))
+        self._write(self._recordmark.pack(length))
+
+    def _write(self, data):
+        """ Write binary `data`, buffering if `buffer_size` > zero. """
+        if self.buffer_size > 0:
+            self._outbuf.append(data)
+            self._outbuf_len += len(data)
+            if self._outbuf_len >= self.buffer_size:
+                self.flush()
+        else:
+            self.file.write(data)
 
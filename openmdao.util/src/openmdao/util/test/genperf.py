@@ -0,0 +1,104 @@
+"""
+InputFileGenerator per-case generation time, transferring every value into
+the template versus generating from a compiled template.
+
+usage: python genperf.py [ncases [nvars [arraysize]]]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from numpy import arange
+
+from openmdao.util.filewrap import InputFileGenerator
+
+
+def write_template(filename, nvars, arraysize):
+    """ Write a deck with `nvars` named scalars and one wrapped array. """
+    with open(filename, 'w') as out:
+        out.write('Generated deck\n')
+        for i in range(nvars):
+            out.write('  VAR%d = 0.0  ! scalar input %d\n' % (i, i))
+            out.write('  FLAG%d = 1 2 3\n' % i)
+        out.write('ARRAY\n')
+        for i in range(0, arraysize, 10):
+            out.write(' '.join(['0.0'] * min(10, arraysize-i)) + '\n')
+        out.write('END\n')
+
+
+def transfer(gen, nvars, arraysize, scalars, vector):
+    """ Apply one case's values via the transfer methods. """
+    for i in range(nvars):
+        gen.reset_anchor()
+        gen.mark_anchor('VAR%d =' % i)
+        gen.transfer_var(scalars[i], 0, 3)
+    gen.reset_anchor()
+    gen.mark_anchor('ARRAY')
+    gen.transfer_array(vector, 1, 1, (arraysize-1) % 10 + 1,
+                       (arraysize-1) // 10 + 1)
+
+
+def run_transfer(template, output, cases, nvars, arraysize):
+    """ Generate each case by re-reading and transferring into the template. """
+    start = time.time()
+    for scalars, vector in cases:
+        gen = InputFileGenerator()
+        gen.set_template_file(template)
+        gen.set_generated_file(output)
+        transfer(gen, nvars, arraysize, scalars, vector)
+        gen.generate()
+    return time.time() - start
+
+
+def run_compiled(template, output, cases, nvars, arraysize):
+    """ Compile once, then generate each case from the compiled template. """
+    start = time.time()
+    gen = InputFileGenerator()
+    gen.set_template_file(template)
+    gen.set_generated_file(output)
+    scalars = [gen.slot('x%d' % i) for i in range(nvars)]
+    transfer(gen, nvars, arraysize, scalars, gen.slot('y', arraysize))
+    compiled = gen.compile()
+    for scalars, vector in cases:
+        values = dict(('x%d' % i, val) for i, val in enumerate(scalars))
+        values['y'] = vector
+        compiled.generate(values)
+    return time.time() - start
+
+
+def main():
+    """ Compare per-case generation times. """
+    ncases = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    nvars = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    arraysize = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+
+    cases = [([0.5*i + j for j in range(nvars)], arange(arraysize) * 0.25 + i)
+             for i in range(ncases)]
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        template = os.path.join(tmpdir, 'template.inp')
+        write_template(template, nvars, arraysize)
+
+        output = os.path.join(tmpdir, 'transfer.inp')
+        transferred = run_transfer(template, output, cases, nvars, arraysize)
+        print 'transfer per case: %.2f msec' % (transferred / ncases * 1000)
+
+        output2 = os.path.join(tmpdir, 'compiled.inp')
+        compiled = run_compiled(template, output2, cases, nvars, arraysize)
+        print 'compiled per case: %.2f msec' % (compiled / ncases * 1000)
+
+        with open(output) as inp:
+            with open(output2) as inp2:
+                if inp.read() != inp2.read():
+                    print 'WARNING: generated files differ'
+        print 'speedup %.2f' % (transferred / compiled)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -190,6 +190,112 @@ class TestCase(unittest.TestCase):
     
         self.assertEqual(answer, result)
 
+    def test_compiled_template(self):
+        
+        template = "Junk\n" + \
+                   "Anchor\n" + \
+                   " A 1, 2 34, Test 1e65\n" + \
+                   " B 4 Stuff\n" + \
+                   "Anchor\n" + \
+                   " 0 0 0\n" + \
+                   " 0 0 0\n" + \
+                   " 0 0 0 0\n"
+        
+        outfile = open(self.templatename, 'w')
+        outfile.write(template)
+        outfile.close()
+        
+        def setup(gen, x, name, y, z):
+            gen.set_template_file(self.templatename)
+            gen.set_generated_file(self.filename)
+            gen.mark_anchor('Anchor')
+            gen.transfer_var(x, 1, 3)
+            gen.transfer_var(name, 2, 3)
+            gen.mark_anchor('Anchor')
+            gen.transfer_2Darray(z, 1, 2, 1, 3)
+            gen.transfer_array(y, 3, 2, 4, sep=' ')
+            gen.clearline(-4)
+        
+        gen = InputFileGenerator()
+        setup(gen, gen.slot('x'), gen.slot('name'), gen.slot('y', 5),
+              gen.slot('z', (2, 3)))
+        compiled = gen.compile()
+        
+        cases = [(3.0, 'Stuff', array([1, 2, 3, 4, 5]),
+                  array([[1, 2, 3], [4, 5, 6]])),
+                 (1.3e-37, 42, array([1.5, 2., 3.25, 4., 5.]),
+                  array([[.1, .2, .3], [.4, .5, 6.]]))]
+        for x, name, y, z in cases:
+            gen = InputFileGenerator()
+            setup(gen, x, name, y, z)
+            gen.generate()
+            with open(self.filename, 'r') as infile:
+                answer = infile.read()
+            
+            compiled.generate(dict(x=x, name=name, y=y, z=z))
+            with open(self.filename, 'r') as infile:
+                result = infile.read()
+            self.assertEqual(answer, result)
+            
+        self.assertEqual(result, "\n" + \
+                                 "Anchor\n" + \
+                                 " A 1, 1.3e-37 34, Test 1e65\n" + \
+                                 " B 4 42\n" + \
+                                 "Anchor\n" + \
+                                 " 0.1 0.2 0.3\n" + \
+                                 " 0.4 0.5 6.0\n" + \
+                                 " 0 1.5 2.0 3.25 4.0 5.0\n")
+        
+        try:
+            compiled.generate(dict(x=x, name=name, y=y[:4], z=z))
+        except ValueError, err:
+            msg = "Template slot 'y' expects shape 5, got 4"
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('ValueError expected')
+        
+        try:
+            compiled.generate(dict(x=x, y=y, z=z))
+        except KeyError, err:
+            msg = "\"No value for template slot 'name'\""
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('KeyError expected')
+        
+        # fields after a slot are counted as they would be per case
+        outfile = open(self.templatename, 'w')
+        outfile.write("Anchor\na: 1: 2: 3\n")
+        outfile.close()
+        
+        gen = InputFileGenerator()
+        gen.set_template_file(self.templatename)
+        gen.set_generated_file(self.filename)
+        gen.set_delimiters(': ')
+        gen.mark_anchor('Anchor')
+        gen.transfer_var(gen.slot('x'), 1, 2)
+        gen.transfer_var(gen.slot('y'), 1, 4)
+        gen.compile().generate(dict(x=1.5, y=7))
+        with open(self.filename, 'r') as infile:
+            self.assertEqual(infile.read(), "Anchor\na: 1.5: 2: 7\n")
+        
+        try:
+            gen.set_delimiters('\x00-\x20')
+        except ValueError, err:
+            msg = "Delimiters may not include control character '\\x00' " \
+                  "when using slots"
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('ValueError expected')
+        
+        gen.data[1] = gen.data[1][:5]
+        try:
+            gen.compile()
+        except RuntimeError, err:
+            msg = "A slot marker was corrupted in the template text"
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('RuntimeError expected')
+        
     def test_output_parse(self):
         
         data = "Junk\n" + \
@@ -392,6 +498,63 @@ class TestCase(unittest.TestCase):
             self.fail('ValueError expected')  
 
 
+    def test_output_parse_2Darray(self):
+        
+        data = "Anchor\n" + \
+               "10 20 30 40 50 60 70 80\n" + \
+               "11 21 31 41 51 61 71 81\n" + \
+               "Anchor\n" + \
+               "1.0D+01 2.0D+01 3.5e-1\n" + \
+               "-.5 +6 7.\n" + \
+               "Key a b c\n" + \
+               "Key d e f\n"
+        
+        outfile = open(self.filename, 'w')
+        outfile.write(data)
+        outfile.close()
+        
+        gen = FileParser()
+        gen.set_file(self.filename)
+        gen.set_delimiters(' ')
+        
+        gen.mark_anchor('Anchor')
+        val = gen.transfer_2Darray(1, 2, 2, 4)
+        self.assertEqual(val.shape, (2, 3))
+        self.assertEqual(val[0, 0], 20)
+        self.assertEqual(val[1, 2], 41)
+        
+        gen.mark_anchor('Anchor')
+        val = gen.transfer_2Darray(1, 1, 2)
+        self.assertEqual(val.shape, (2, 3))
+        self.assertEqual(val[0, 0], 10.0)
+        self.assertEqual(val[1, 0], -0.5)
+        self.assertEqual(val[1, 2], 7.0)
+        val = gen.transfer_array(1, 1, 2, 3)
+        self.assertEqual(list(val), [10.0, 20.0, 0.35, -0.5, 6.0, 7.0])
+        val = gen.transfer_var(1, 1)
+        self.assertEqual(val, 10.0)
+        self.assertEqual(type(val), float)
+        val = gen.transfer_var(2, 2)
+        self.assertEqual(val, 6)
+        self.assertEqual(type(val), int)
+        
+        val = gen.transfer_2Darray(3, 2, 4)
+        self.assertEqual(val[1, 2], 'f')
+        
+        gen.mark_anchor('Anchor', -1)
+        self.assertEqual(gen.transfer_line(0), 'Anchor')
+        gen.mark_anchor('Anchor', -2)
+        self.assertEqual(gen.transfer_line(1), '10 20 30 40 50 60 70 80')
+        
+        gen.set_delimiters('columns')
+        try:
+            gen.transfer_2Darray(1, 1, 2)
+        except ValueError, err:
+            msg = "transfer_2Darray does not support 'columns'"
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('ValueError expected')
+        
     def test_comment_char(self):
 
         # Check to see if the use of the comment
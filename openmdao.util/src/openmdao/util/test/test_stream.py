@@ -4,6 +4,7 @@ Test Stream functions.
 
 import logging
 import os.path
+import StringIO
 import sys
 import unittest
 
@@ -560,6 +561,138 @@ class TestCase(unittest.TestCase):
             new_data = stream.read_floats((5, 2), order='Fortran')
         numpy.testing.assert_array_equal(new_data, arr2d)
 
+    def test_buffered(self):
+        logging.debug('')
+        logging.debug('test_buffered')
+
+        # Many small unformatted records, buffered write.
+        swap_endian = sys.byteorder == 'little'
+        data = numpy.arange(0, 10, dtype=numpy.float64)
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, big_endian=swap_endian,
+                            unformatted=True, buffer_size=100)
+            for i in range(100):
+                stream.write_int(i, full_record=True)
+                stream.write_floats(data + i, full_record=True)
+            self.assertEqual(stream.tell(), 100 * (12 + 88))
+            stream.flush()
+        self.assertEqual(os.path.getsize(self.filename), 100 * (12 + 88))
+
+        for kwargs in (dict(buffer_size=100), dict(buffer_size=1<<16),
+                       dict(memory_map=True)):
+            with open(self.filename, 'rb') as inp:
+                stream = Stream(inp, binary=True, big_endian=swap_endian,
+                                unformatted=True, **kwargs)
+                records = stream.index_records()
+                self.assertEqual(len(records), 200)
+                self.assertEqual(records[:2], [(4, 4), (16, 80)])
+                self.assertEqual(stream.tell(), 0)
+
+                for i in range(100):
+                    self.assertEqual(stream.read_int(full_record=True), i)
+                    new_data = stream.read_floats((5, 2), order='Fortran',
+                                                  full_record=True)
+                    numpy.testing.assert_array_equal(new_data,
+                                 (data + i).reshape((5, 2), order='Fortran'))
+                self.assertEqual(stream.tell(), 100 * (12 + 88))
+
+                # Views are read-only, but may be written.
+                self.assertRaises(ValueError, new_data.fill, 0.)
+                stream.seek(records[1][0] - 4)
+                new_data = stream.read_floats(10, full_record=True)
+                numpy.testing.assert_array_equal(new_data, data)
+                stream.close()
+
+            out = StringIO.StringIO()
+            stream = Stream(out, binary=True, unformatted=True)
+            stream.write_floats(new_data, full_record=True)
+            self.assertEqual(out.getvalue(), '\x50\x00\x00\x00'
+                                             + data.tostring()
+                                             + '\x50\x00\x00\x00')
+
+        # Opened after a header has been read.
+        for kwargs in (dict(buffer_size=100), dict(memory_map=True)):
+            with open(self.filename, 'rb') as inp:
+                inp.read(12)
+                stream = Stream(inp, binary=True, big_endian=swap_endian,
+                                unformatted=True, **kwargs)
+                self.assertEqual(stream.tell(), 12)
+                new_data = stream.read_floats(10, full_record=True)
+                numpy.testing.assert_array_equal(new_data, data)
+                self.assertEqual(stream.read_int(full_record=True), 1)
+                stream.close()
+
+        # Bad recordmark.
+        with open(self.filename, 'r+b') as out:
+            out.seek(12 + 84)
+            out.write('\x42')
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=swap_endian,
+                            unformatted=True, buffer_size=100)
+            assert_raises(self, 'stream.index_records()',
+                          globals(), locals(), RuntimeError,
+                          'mismatched recordlength 1107296336 vs. 80 at 12')
+            self.assertEqual(stream.read_int(full_record=True), 0)
+            assert_raises(self, 'stream.read_floats(10, full_record=True)',
+                          globals(), locals(), RuntimeError,
+                          'mismatched recordlength 1107296336 vs. 80')
+
+        # Bulk records.
+        data = numpy.arange(0, 600, dtype=numpy.float64).reshape((100, 3, 2))
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, big_endian=swap_endian,
+                            unformatted=True)
+            for i in range(100):
+                stream.write_floats(data[i], order='Fortran', full_record=True)
+        with open(self.filename, 'rb') as inp:
+            expected = inp.read()
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, big_endian=swap_endian,
+                            unformatted=True)
+            stream.write_float_records(data, order='Fortran')
+        with open(self.filename, 'rb') as inp:
+            self.assertEqual(inp.read(), expected)
+
+        for kwargs in ({}, dict(buffer_size=100), dict(memory_map=True)):
+            with open(self.filename, 'rb') as inp:
+                stream = Stream(inp, binary=True, big_endian=swap_endian,
+                                unformatted=True, **kwargs)
+                new_data = stream.read_float_records(100, (3, 2),
+                                                     order='Fortran')
+                numpy.testing.assert_array_equal(new_data, data)
+                stream.close()
+
+        with open(self.filename, 'r+b') as out:
+            out.seek(10 * 56 + 52)
+            out.write('\x42')
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=swap_endian,
+                            unformatted=True)
+            assert_raises(self, 'stream.read_float_records(100, (3, 2))',
+                          globals(), locals(), RuntimeError,
+                          'mismatched recordlength 1107296304 vs. 48')
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=swap_endian,
+                            unformatted=True)
+            assert_raises(self, 'stream.read_float_records(101, (3, 2))',
+                          globals(), locals(), RuntimeError,
+                          'read 100 of 101 records')
+
+        # Text in blocks.
+        data = numpy.arange(0, 10000, dtype=numpy.float64).reshape((100, 100))
+        with open(self.filename, 'w') as out:
+            stream = Stream(out)
+            stream.write_floats(data, order='Fortran', linecount=7)
+        with open(self.filename, 'r') as inp:
+            lines = inp.readlines()
+            self.assertEqual(len(lines), 1429)
+            self.assertEqual(lines[0], '0 100 200 300 400 500 600\n')
+            self.assertEqual(lines[-1], '9699 9799 9899 9999 \n')
+        with open(self.filename, 'r') as inp:
+            stream = Stream(inp)
+            new_data = stream.read_floats((100, 100), order='Fortran')
+        numpy.testing.assert_array_equal(new_data, data)
+
     def test_misc(self):
         logging.debug('')
         logging.debug('test_misc')